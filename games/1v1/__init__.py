@@ -1,5 +1,4 @@
 import random
-import time
 
 from .create_player_fighters import create_player_fighters
 from .get_players import get_players_and_autoplay
@@ -12,7 +11,7 @@ from src.engine.battle_env import BattleEnvironment
 from src import engine
 from src import logs
 from src.utility import exception_message, collect_and_log_garbage
-from src.textio import print_color
+from src.textio import get_output
 
 __copyright__ = """
     Dueturn - A text-based two-player battle engine.
@@ -36,6 +35,7 @@ logger = logs.get_logger()
 
 
 def main():
+    logger.info('Starting Dueturn engine')
     data = {
         'randomize_moves_A': (6, 8),
         'randomize_moves_B': (6, 8),
@@ -139,18 +139,20 @@ def main():
                 battle.print_end_message(end_message)
 
             # Wait for player to start another game
-            input()
-            print()
+            output = get_output()
+            output.input()
+            output.print()
     except Exception:
         msg = exception_message(
             header='RUNTIME ERROR', log_handler=logger)
         msg += '\n\nSee the log for more details.'
 
         # Print message in red
-        print_color('{RA}{FLred}', end='')
-        print_color(msg, do_not_format=True)
-        time.sleep(2)
-        input()
+        output = get_output()
+        output.print_color('{RA}{FLred}', end='')
+        output.print_color(msg, do_not_format=True)
+        output.pause(2)
+        output.input()
 
         logger.info('Restarting game loop')
     except SystemExit:
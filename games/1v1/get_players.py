@@ -2,7 +2,7 @@ import functools
 
 from src.engine.battle_env import Autoplay
 from src.textio import (
-    ColoramaCodes, input_boolean, input_loop_if_equals, print_color
+    ColoramaCodes, get_output, input_boolean, input_loop_if_equals
 )
 
 
@@ -24,24 +24,29 @@ def get_players_and_autoplay():
     autoplay = False
 
     # Define input functions
+    output = get_output()
+
     def reset_color_method(s):
-        print(ColoramaCodes.RESET_ALL, end='')
+        if output.color:
+            output.write(ColoramaCodes.RESET_ALL, 'prompt')
         return s
     print_color_without_newline = functools.partial(
-        print_color, end='')
+        output.print_color, end='', kind='prompt')
     input_boolean_color = functools.partial(
         input_boolean,
         repeat_prompt='Answer with {true} or {false}: {FLcyan}',
         false=('no', 'n'),
         apply_methods=(str.strip, str.casefold, reset_color_method),
-        print_func=print_color_without_newline
+        print_func=print_color_without_newline,
+        input_func=output.input
     )
     input_name = functools.partial(
         input_loop_if_equals,
         repeat_prompt='Name cannot be empty: {FLcyan}',
         loop_if_equals=(''),
         apply_methods=(str.strip, str.casefold, reset_color_method),
-        print_func=print_color_without_newline
+        print_func=print_color_without_newline,
+        input_func=output.input
     )
 
     # Get player options
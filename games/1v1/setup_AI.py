@@ -1,24 +1,25 @@
 from src import logs
 from src import settings
 from src.engine import fighter_ai
-from src.textio import input_color, print_color
+from src.textio import get_output
 
 logger = logs.get_logger()
 
-cfg_engine = settings.load_config('engine')
+cfg_engine = settings.shared_config('engine')
 
 
 def get_AI(AIs):
-    print_color(f"AIs: {', '.join(AIs[1:])}")
+    output = get_output()
+    output.print_color(f"AIs: {', '.join(AIs[1:])}")
     AIs = [AI.casefold() for AI in AIs]
 
-    AI = input_color(
+    AI = output.input_color(
         'Type an AI (case-insensitive) to change it,\n'
         f'or nothing to skip. {cfg_engine.GAME_SETUP_INPUT_COLOR}'
     ).casefold()
 
     while AI not in AIs:
-        AI = input_color(
+        AI = output.input_color(
             'Unknown AI; check spelling: '
             f'{cfg_engine.GAME_SETUP_INPUT_COLOR}').casefold()
 
@@ -3,24 +3,25 @@ import random
 from src import engine
 from src import logs
 from src import settings
-from src.textio import input_color, print_color
+from src.textio import get_output
 
 logger = logs.get_logger()
 
-cfg_engine = settings.load_config('engine')
+cfg_engine = settings.shared_config('engine')
 
 
 def input_gamemode(gamemodes):
-    print_color(f"Gamemodes: {', '.join(gamemodes[1:])}")
+    output = get_output()
+    output.print_color(f"Gamemodes: {', '.join(gamemodes[1:])}")
     gamemodes = [gm.casefold() for gm in gamemodes]
 
-    gamemode = input_color(
+    gamemode = output.input_color(
         'Type a gamemode (case-insensitive) to play it,\n'
         f'or nothing to skip. {cfg_engine.GAME_SETUP_INPUT_COLOR}'
     ).casefold()
 
     while gamemode not in gamemodes:
-        gamemode = input_color(
+        gamemode = output.input_color(
             'Unknown gamemode; check spelling: '
             f'{cfg_engine.GAME_SETUP_INPUT_COLOR}').casefold()
 
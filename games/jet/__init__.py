@@ -10,10 +10,10 @@ from src import engine
 from src import logs
 from src import sequencer
 from src.textio import (
-    ColoramaCodes, cr, format_color, input_color, print_color,
+    ColoramaCodes, cr, format_color, get_output, input_color,
 
     input_choice_typewriter, input_loop_if_equals,
-    input_number_typewriter, print_sleep_multiline, print_typewriter,
+    input_number_typewriter, print_sleep_multiline,
 
     SLEEP_CHAR_DELAY_NORMAL, SLEEP_CHAR_DELAY_SPECIFICS
 )
@@ -61,19 +61,28 @@ player_inventory = [
 
 
 def reset_color_method(s):
-    print(ColoramaCodes.RESET_ALL, end='')
+    output = get_output()
+    if output.color:
+        output.write(ColoramaCodes.RESET_ALL, 'prompt')
     return s
 
 
-# Get username with custom colour printing
-# (copied from
-#  src.engine.battle_env.BattleEnvironment.get_players_and_autoplay)
-input_name = functools.partial(
-    input_loop_if_equals,
-    loop_if_equals=(''),
-    apply_methods=(str.strip, str.casefold, reset_color_method),
-    print_func=functools.partial(print_color, end='')
-)
+def input_name(prompt):
+    """Get the username with custom colour printing.
+
+    Copied from `games.1v1.get_players.get_players_and_autoplay`.
+
+    """
+    output = get_output()
+    return input_loop_if_equals(
+        prompt,
+        loop_if_equals=(''),
+        apply_methods=(str.strip, str.casefold, reset_color_method),
+        print_func=functools.partial(
+            output.print_color, end='', kind='prompt'),
+        input_func=output.input
+    )
+
 
 player = engine.Fighter(
     name='Player',
@@ -101,14 +110,15 @@ def scene_1():
     player.name = player_name
     player_evading.name = player_name
 
-    print_typewriter(
+    output = get_output()
+    output.print_typewriter(
         'You are flying a jet armed with four Sidewinders and four AMRAAMs.',
         '',
         sleep_char=SLEEP_CHAR_DELAY_NORMAL,
         sleep_char_specifics=SLEEP_CHAR_DELAY_SPECIFICS,
         sleep_line=0.5
     )
-    print_typewriter(
+    output.print_typewriter(
         'Contact! A SU-35 is intercepting you!',
         sleep_char=SLEEP_CHAR_DELAY_NORMAL,
         sleep_char_specifics=SLEEP_CHAR_DELAY_SPECIFICS,
@@ -164,6 +174,7 @@ def scene_2():
 
 
 def main():
+    logger.info('Starting Dueturn engine')
     try:
         sequencer.begin_sequence(scene_1)
     except Exception:
@@ -172,5 +183,6 @@ def main():
         msg += '\n\nSee the log for more details.'
 
         # Print message in red
-        print_color('{RA}{FLred}', end='')
-        print_color(msg, do_not_format=True)
+        output = get_output()
+        output.print_color('{RA}{FLred}', end='')
+        output.print_color(msg, do_not_format=True)
@@ -1,14 +1,13 @@
-import time
-
 from . import ai
 from . import moves
 from . import stats
 from src import engine
 from src import settings
+from src.engine import battle_env
 from src.engine.battle_env import Autoplay
-from src.textio import (print_color, print_typewriter, SLEEP_CHAR_DELAY_NORMAL)
+from src.textio import get_output, SLEEP_CHAR_DELAY_NORMAL
 
-cfg_engine = settings.load_config('engine')
+cfg_engine = settings.shared_config('engine')
 
 
 def missile_evasion(evader, missile, side='left'):
@@ -87,34 +86,35 @@ def missile_evasion(evader, missile, side='left'):
 
             if missile_fighter.di == 0:
                 # Detonation
-                sleep = (cfg_engine.GAME_AUTOPLAY_AI_DELAY
-                         / cfg_engine.GAME_DISPLAY_SPEED)
+                sleep = battle_env.get_derived().ai_delay
 
-                print_color('\nThe missile makes its last adjustments!',
-                            end='\n\n\n')
+                output = get_output()
+                output.print_color(
+                    '\nThe missile makes its last adjustments!',
+                    end='\n\n\n')
 
-                time.sleep(sleep)
+                output.pause(sleep)
 
-                print(battle.fightChartTwo(
+                output.print(battle.fightChartTwo(
                     a, b,
                     statLogA=results['statLogA'],
                     statLogB=results['statLogB'],
                     tabs=cfg_engine.GAME_DISPLAY_USE_TABS,
                     color_mode=cfg_engine.GAME_DISPLAY_STATS_COLOR_MODE
-                ), end='\n\n\n')
+                ), end='\n\n\n', kind='chart')
 
                 value = -int(
                     base_damage
                     * (1 - max(0, missile_fighter.er / blast_radius))
                 )
                 if value < 0:
-                    print_typewriter(
+                    output.print_typewriter(
                         '... Hit!',
                         sleep_char=SLEEP_CHAR_DELAY_NORMAL,
                         sleep_char_specifics={'.': 0.5}
                     )
                 else:
-                    print_typewriter(
+                    output.print_typewriter(
                         '... Miss!',
                         sleep_char=SLEEP_CHAR_DELAY_NORMAL,
                         sleep_char_specifics={'.': 0.5}
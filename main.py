@@ -3,6 +3,7 @@ import functools
 from src import engine
 from src import sequencer
 from src import settings
+from src import textio
 
 __copyright__ = """
     Dueturn - A text-based two-player battle engine.
@@ -48,6 +49,7 @@ def select_game():
 
 
 def main():
+    textio.colorio_setup()
     settings.setup_configs()
 
     while True:
@@ -25,26 +25,95 @@
 #SOFTWARE.
 
 
+import concurrent.futures
+
+
 class World:
     def __init__(self):
         self.planners = []
         self.plans = []
+        self.plan_costs = []
 
     def add_planner(self, planner):
         self.planners.append(planner)
 
     def calculate(self):
         self.plans = []
+        self.plan_costs = []
 
         for planner in self.planners:
-            self.plans.append(planner.calculate())
+            _plan = planner.calculate()
+
+            self.plans.append(_plan)
+            self.plan_costs.append(plan_cost(_plan))
+
+    def calculate_batch(self, start_states, workers=None, executor=None):
+        """Calculate every planner against every start state in one call.
+
+        Each start state only needs the keys it changes; keys a planner
+        does not know about are ignored, so one state can be shared by
+        planners with different keys.
+
+        Args:
+            start_states (Iterable[dict]): One start state per agent.
+            workers (Optional[int]): If given, plan on a process pool
+                with this many workers.
+            executor (Optional[concurrent.futures.Executor]):
+                An existing pool to plan on. Takes precedence over workers.
+
+        Returns:
+            List[List[Tuple[int, list]]]: For each start state, the
+                (cost, plan) pairs of every planner that found a plan,
+                ranked from lowest to highest cost.
+
+        """
+        _start_states = list(start_states)
+        _planners = []
+        _states = []
+
+        for start_state in _start_states:
+            for planner in self.planners:
+                _planners.append(planner)
+                _states.append(planner.merge_start_state(start_state))
+
+        if executor is not None:
+            _results = executor.map(calculate_planner, _planners, _states)
+        elif workers is not None:
+            _chunksize = max(1, len(_planners) // (workers * 4))
+
+            with concurrent.futures.ProcessPoolExecutor(workers) as _pool:
+                _results = list(_pool.map(calculate_planner, _planners,
+                                          _states, chunksize=_chunksize))
+        else:
+            _results = map(calculate_planner, _planners, _states)
+
+        _results = iter(zip(_planners, _states, _results))
+        _batch = []
+
+        for _ in _start_states:
+            _plans = []
+            _costs = []
+
+            for _ in self.planners:
+                _planner, _state, _plan = next(_results)
+
+                # An empty plan means the goal cannot be reached,
+                # unless the start state already meets it
+                if not _plan and not conditions_are_met(
+                        _state, _planner.goal_state):
+                    continue
+
+                _plans.append(_plan)
+                _costs.append(plan_cost(_plan))
+
+            _batch.append(rank_plans(_plans, _costs))
+
+        return _batch
 
     def get_plan(self, debug=False):
         _plans = {}
 
-        for plan in self.plans:
-            _plan_cost = sum([action['g'] for action in plan])
-
+        for plan, _plan_cost in zip(self.plans, self.plan_costs):
             if _plan_cost in _plans:
                 _plans[_plan_cost].append(plan)
             else:
@@ -100,8 +169,21 @@ class Planner:
     def set_action_list(self, action_list):
         self.action_list = action_list
 
-    def calculate(self):
-        return astar(self.start_state,
+    def merge_start_state(self, start_state):
+        """Return the start state updated with the known keys of another."""
+        _new_state = self.start_state.copy()
+
+        for key in start_state:
+            if key in _new_state:
+                _new_state[key] = start_state[key]
+
+        return _new_state
+
+    def calculate(self, start_state=None):
+        if start_state is None:
+            start_state = self.start_state
+
+        return astar(start_state,
                      self.goal_state,
                      {c: self.action_list.conditions[c].copy() for c in self.action_list.conditions},
                      {r: self.action_list.reactions[r].copy() for r in self.action_list.reactions},
@@ -142,6 +224,21 @@ class Action_List:
         self.weights[key] = value
 
 
+def calculate_planner(planner, start_state=None):
+    """Module-level wrapper of Planner.calculate for worker pools."""
+    return planner.calculate(start_state)
+
+def plan_cost(plan):
+    """Return the score used to rank a plan."""
+    if not plan:
+        return 0
+
+    return sum([action['g'] for action in plan])
+
+def rank_plans(plans, costs):
+    """Return (cost, plan) pairs sorted by their precomputed costs."""
+    return sorted(zip(costs, plans), key=lambda pair: pair[0])
+
 def distance_to_state(state_1, state_2):
     _scored_keys = set()
     _score = 0
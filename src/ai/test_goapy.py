@@ -0,0 +1,98 @@
+import concurrent.futures
+
+import goapy
+
+
+def make_world():
+    world = goapy.World()
+
+    food_brain = goapy.Planner('is_hungry', 'has_food')
+    food_actions = goapy.Action_List()
+    food_actions.add_condition('find_food', has_food=False)
+    food_actions.add_reaction('find_food', has_food=True)
+    food_actions.add_condition('eat_food', has_food=True)
+    food_actions.add_reaction('eat_food', is_hungry=False)
+    food_actions.set_weight('find_food', 20)
+    food_actions.set_weight('eat_food', 10)
+    food_brain.set_action_list(food_actions)
+    food_brain.set_start_state(has_food=False, is_hungry=True)
+    food_brain.set_goal_state(is_hungry=False)
+
+    heal_brain = goapy.Planner('is_hurt', 'has_bandage')
+    heal_actions = goapy.Action_List()
+    heal_actions.add_condition('find_bandage', has_bandage=False)
+    heal_actions.add_reaction('find_bandage', has_bandage=True)
+    heal_actions.add_condition('apply_bandage', has_bandage=True)
+    heal_actions.add_reaction('apply_bandage', is_hurt=False)
+    heal_actions.set_weight('find_bandage', 15)
+    heal_brain.set_action_list(heal_actions)
+    heal_brain.set_start_state(has_bandage=False, is_hurt=True)
+    heal_brain.set_goal_state(is_hurt=False)
+
+    world.add_planner(food_brain)
+    world.add_planner(heal_brain)
+
+    return world
+
+
+def plan_names(plan):
+    return [action['name'] for action in plan]
+
+
+def test_calculate_batch_matches_calculate():
+    world = make_world()
+    world.calculate()
+
+    batch = world.calculate_batch([{}])
+
+    assert len(batch) == 1
+    assert [plan for _, plan in batch[0]][:1] == world.get_plan()[:1]
+    costs = [cost for cost, _ in batch[0]]
+    assert costs == sorted(costs)
+
+
+def test_calculate_batch_start_states():
+    world = make_world()
+
+    batch = world.calculate_batch([
+        {},
+        {'has_food': True, 'has_bandage': True},
+    ])
+
+    assert plan_names(batch[0][0][1]) == ['find_bandage', 'apply_bandage']
+    assert plan_names(batch[1][0][1]) == ['apply_bandage']
+    assert plan_names(batch[1][1][1]) == ['eat_food']
+
+
+def test_calculate_batch_executor():
+    world = make_world()
+    states = [{}, {'has_food': True}, {'is_hurt': False}]
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        threaded = world.calculate_batch(states, executor=executor)
+    serial = world.calculate_batch(states)
+
+    assert [[plan_names(p) for _, p in ranked] for ranked in threaded] \
+        == [[plan_names(p) for _, p in ranked] for ranked in serial]
+
+
+def test_calculate_batch_skips_unreachable_goals():
+    world = make_world()
+
+    stuck_brain = goapy.Planner('is_lost', 'has_map')
+    stuck_actions = goapy.Action_List()
+    stuck_actions.add_condition('read_map', has_map=True)
+    stuck_actions.add_reaction('read_map', is_lost=False)
+    stuck_brain.set_action_list(stuck_actions)
+    stuck_brain.set_start_state(has_map=False, is_lost=True)
+    stuck_brain.set_goal_state(is_lost=False)
+    world.planners = [world.planners[0], stuck_brain]
+
+    batch = world.calculate_batch([{}, {'is_lost': False}])
+
+    # The stuck planner is dropped instead of ranking first at no cost
+    assert [plan_names(p) for _, p in batch[0]] \
+        == [['find_food', 'eat_food']]
+    # but kept when its goal is already met
+    assert [plan_names(p) for _, p in batch[1]] \
+        == [[], ['find_food', 'eat_food']]
@@ -43,24 +43,8 @@ of the move() code.
 # Union: Use when something could be one of a few types
 #     int_or_str: Union[int, str]
 
-from . import util
-from . import json_handler
-from .battle_env import BattleEnvironment
-from .booldetailed import BoolDetailed
-from .bound import Bound
-from .data import fighter_stats
-from .fighter import Fighter
-from .item import Item
-from .move import Move
-from .movetype import MoveType
-from .skill import Skill
-from .stat import Stat, StatInfo
-from .status_effect import StatusEffect
-from src import logs
-from src.textio import (
-    ColoramaCodes, cr, format_color, input_color, print_color,
-    input_boolean
-)
+import importlib
+import importlib.util
 
 __copyright__ = """
     Dueturn - A text-based two-player battle engine.
@@ -80,118 +64,183 @@ __copyright__ = """
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+# Submodules and their attributes are only imported when first used,
+# so tools needing one class do not pay for setting up the whole engine
+_LAZY_MODULES = {
+    'fighter_stats': '.data.fighter_stats'
+}
+_LAZY_ATTRIBUTES = {
+    'BattleEnvironment': '.battle_env',
+    'BoolDetailed': '.booldetailed',
+    'Bound': '.bound',
+    'Fighter': '.fighter',
+    'Item': '.item',
+    'Move': '.move',
+    'MoveType': '.movetype',
+    'Skill': '.skill',
+    'Stat': '.stat',
+    'StatInfo': '.stat',
+    'StatusEffect': '.status_effect',
+    'ColoramaCodes': 'src.textio',
+    'cr': 'src.textio',
+    'format_color': 'src.textio',
+    'input_color': 'src.textio',
+    'print_color': 'src.textio',
+    'input_boolean': 'src.textio',
+    'CaptureSink': 'src.textio',
+    'JSONSink': 'src.textio',
+    'NullSink': 'src.textio',
+    'OutputSink': 'src.textio',
+    'PlainSink': 'src.textio',
+    'TerminalSink': 'src.textio',
+    'get_output': 'src.textio',
+    'redirect_output': 'src.textio',
+    'set_output': 'src.textio'
+}
+
 __all__ = [
-    util, fighter_stats, json_handler,
-    BattleEnvironment, BoolDetailed, Bound, Fighter, Item, Move,
-    MoveType, Skill, Stat, StatInfo, StatusEffect,
-    ColoramaCodes, cr, format_color, input_color, print_color,
-    input_boolean
+    'util', 'fighter_stats', 'json_handler',
+    'BattleEnvironment', 'BoolDetailed', 'Bound', 'Fighter', 'Item', 'Move',
+    'MoveType', 'Skill', 'Stat', 'StatInfo', 'StatusEffect',
+    'ColoramaCodes', 'cr', 'format_color', 'input_color', 'print_color',
+    'input_boolean',
+    'CaptureSink', 'JSONSink', 'NullSink', 'OutputSink', 'PlainSink',
+    'TerminalSink', 'get_output', 'redirect_output', 'set_output',
+    'moveTemplate', 'noneMove'
 ]
 
-# Set up logger
-logger = logs.get_logger()
-logger.info('Starting Dueturn engine')
-
-moveTemplate = [
-    Move({
-        'name': '',
-        'movetypes': ([MoveType('Physical')],),
-        'description': '',
-        'skillRequired': ([],),
-        'itemRequired': ([
-            {
-                'name': '',
-                'count': 0
-            },
-            ],),
-        'moveMessage': """\
+def __getattr__(name):
+    if name in ('moveTemplate', 'noneMove'):
+        value = _build_templates()[name]
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    elif name in _LAZY_MODULES:
+        value = importlib.import_module(_LAZY_MODULES[name], __name__)
+    elif not name.startswith('_') \
+            and importlib.util.find_spec(f'.{name}', __name__) is not None:
+        # Any other submodule, such as util or json_handler
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def _build_templates():
+    """Create the move templates."""
+    from .bound import Bound
+    from .move import Move
+    from .movetype import MoveType
+    from .status_effect import StatusEffect
+
+    moveTemplate = [
+        Move({
+            'name': '',
+            'movetypes': ([MoveType('Physical')],),
+            'description': '',
+            'skillRequired': ([],),
+            'itemRequired': ([
+                {
+                    'name': '',
+                    'count': 0
+                },
+                ],),
+            'moveMessage': """\
 {sender} attacks {target} for {-hpValue} damage, costed {-stCost}""",
 
-        'hpValue': Bound(-0, -0),
-        'stValue': Bound(-0, -0),
-        'mpValue': Bound(-0, -0),
-        'hpCost': Bound(-0, -0),
-        'stCost': Bound(-0, -0),
-        'mpCost': Bound(-0, -0),
-
-        'effects': [
-            StatusEffect({
-                'name': '',
-                'description': '',
-
-                'target': 'target',
-                'chances': ((0, 'uncountered'),),
-                'duration': 0,
-
-                'receiveMessage': '{self}',
-                'applyMessage': '{self} {-hpValue} {hp.ext_full}',
-                'wearoffMessage': '{self}',
-
-                'hpValue': Bound(-0, -0),
-                'stValue': Bound(-0, -0),
-                'mpValue': Bound(-0, -0),
-                'noMove': '{self} cannot move',
-                'noCounter': '{self} cannot counter',
-            }),
-        ],
-
-        'speed': 0,
-        'fastMessage': """\
+            'hpValue': Bound(-0, -0),
+            'stValue': Bound(-0, -0),
+            'mpValue': Bound(-0, -0),
+            'hpCost': Bound(-0, -0),
+            'stCost': Bound(-0, -0),
+            'mpCost': Bound(-0, -0),
+
+            'effects': [
+                StatusEffect({
+                    'name': '',
+                    'description': '',
+
+                    'target': 'target',
+                    'chances': ((0, 'uncountered'),),
+                    'duration': 0,
+
+                    'receiveMessage': '{self}',
+                    'applyMessage': '{self} {-hpValue} {hp.ext_full}',
+                    'wearoffMessage': '{self}',
+
+                    'hpValue': Bound(-0, -0),
+                    'stValue': Bound(-0, -0),
+                    'mpValue': Bound(-0, -0),
+                    'noMove': '{self} cannot move',
+                    'noCounter': '{self} cannot counter',
+                }),
+            ],
+
+            'speed': 0,
+            'fastMessage': """\
 {move:hp neg}""",
 
-        'blockChance': 0,
-        'blockHPValue': Bound(-0, -0),
-        'blockSTValue': Bound(-0, -0),
-        'blockMPValue': Bound(-0, -0),
-        'blockFailHPValue': Bound(-0, -0),
-        'blockFailSTValue': Bound(-0, -0),
-        'blockFailMPValue': Bound(-0, -0),
-        'blockMessage': """\
+            'blockChance': 0,
+            'blockHPValue': Bound(-0, -0),
+            'blockSTValue': Bound(-0, -0),
+            'blockMPValue': Bound(-0, -0),
+            'blockFailHPValue': Bound(-0, -0),
+            'blockFailSTValue': Bound(-0, -0),
+            'blockFailMPValue': Bound(-0, -0),
+            'blockMessage': """\
 {-hpValue}""",
-        'blockFailMessage': """\
+            'blockFailMessage': """\
 {-hpValue}""",
 
-        'evadeChance': 0,
-        'evadeHPValue': 0,
-        'evadeSTValue': 0,
-        'evadeMPValue': 0,
-        'evadeFailHPValue': Bound(-0, -0),
-        'evadeFailSTValue': Bound(-0, -0),
-        'evadeFailMPValue': Bound(-0, -0),
-        'evadeMessage': """\
+            'evadeChance': 0,
+            'evadeHPValue': 0,
+            'evadeSTValue': 0,
+            'evadeMPValue': 0,
+            'evadeFailHPValue': Bound(-0, -0),
+            'evadeFailSTValue': Bound(-0, -0),
+            'evadeFailMPValue': Bound(-0, -0),
+            'evadeMessage': """\
 {-hpValue}""",
-        'evadeFailMessage': """\
+            'evadeFailMessage': """\
 {-hpValue}""",
 
-        'criticalChance': 0,
-        'criticalHPValue': Bound(-0, -0),
-        'criticalSTValue': Bound(-0, -0),
-        'criticalMPValue': Bound(-0, -0),
-        'blockFailCriticalHPValue': Bound(-0, -0),
-        'blockFailCriticalSTValue': Bound(-0, -0),
-        'blockFailCriticalMPValue': Bound(-0, -0),
-        'evadeFailCriticalHPValue': Bound(-0, -0),
-        'evadeFailCriticalSTValue': Bound(-0, -0),
-        'evadeFailCriticalMPValue': Bound(-0, -0),
-        'criticalMessage': """\
+            'criticalChance': 0,
+            'criticalHPValue': Bound(-0, -0),
+            'criticalSTValue': Bound(-0, -0),
+            'criticalMPValue': Bound(-0, -0),
+            'blockFailCriticalHPValue': Bound(-0, -0),
+            'blockFailCriticalSTValue': Bound(-0, -0),
+            'blockFailCriticalMPValue': Bound(-0, -0),
+            'evadeFailCriticalHPValue': Bound(-0, -0),
+            'evadeFailCriticalSTValue': Bound(-0, -0),
+            'evadeFailCriticalMPValue': Bound(-0, -0),
+            'criticalMessage': """\
 {-hpValue}""",
-        'fastCriticalMessage': """\
+            'fastCriticalMessage': """\
 {-hpValue}""",
-        'blockFailCriticalMessage': """\
+            'blockFailCriticalMessage': """\
 {-hpValue}""",
-        'evadeFailCriticalMessage': """\
+            'evadeFailCriticalMessage': """\
 {-hpValue}""",
 
-        'failureChance': 0,
-        'failureHPValue': Bound(-0, -0),
-        'failureSTValue': Bound(-0, -0),
-        'failureMPValue': Bound(-0, -0),
-        'failureMessage': """\
+            'failureChance': 0,
+            'failureHPValue': Bound(-0, -0),
+            'failureSTValue': Bound(-0, -0),
+            'failureMPValue': Bound(-0, -0),
+            'failureMessage': """\
 {-hpValue}""",
-        }
-    ),
-]
-noneMove = Move({
-    'name': 'None',
-    'description': 'Do nothing.'
-})
+            }
+        ),
+    ]
+    noneMove = Move({
+        'name': 'None',
+        'description': 'Do nothing.'
+    })
+
+    return {'moveTemplate': moveTemplate, 'noneMove': noneMove}
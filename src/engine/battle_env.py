@@ -1,5 +1,5 @@
 import enum
-import time
+import types
 
 from . import fighter_ai
 from . import util
@@ -11,19 +11,43 @@ from .skill import Skill
 from src import logs
 from src import settings
 from src.textio import (
-    ColoramaCodes, cr, format_color, input_color, print_color,
+    ColoramaCodes, cr, format_color, get_output, input_color,
     input_boolean, input_loop_if_equals
 )
 from src.utility import dict_copy, list_copy, plural
 
 logger = logs.get_logger()
 
-cfg_engine = settings.load_config('engine')
+cfg_engine = settings.shared_config('engine')
 
-# Convert text color placeholders in config into color codes
-cfg_engine.GAME_SETUP_INPUT_COLOR = format_color(
-    cfg_engine.GAME_SETUP_INPUT_COLOR
-)
+derived = None
+# Values derived from the engine config, computed once per change;
+# read them with `get_derived` so the config is loaded first
+
+
+@cfg_engine.subscribe
+def _derive_settings(cfg):
+    global derived
+    derived = types.SimpleNamespace(
+        normal_delay=cfg.GAME_AUTOPLAY_NORMAL_DELAY / cfg.GAME_DISPLAY_SPEED,
+        ai_delay=cfg.GAME_AUTOPLAY_AI_DELAY / cfg.GAME_DISPLAY_SPEED
+    )
+
+
+def get_derived():
+    """Return the values derived from the engine config.
+
+    The config is loaded on first use, and afterwards checked for changes
+    at most once every `SharedConfig.CHECK_INTERVAL` seconds.
+
+    Returns:
+        types.SimpleNamespace
+
+    """
+    # Reading the snapshot reloads the config when a check is due,
+    # which updates `derived` through _derive_settings
+    cfg_engine.snapshot
+    return derived
 
 
 class Autoplay(enum.Enum):
@@ -382,35 +406,36 @@ class BattleEnvironment:
             None: Returned when return_end_message is False.
 
         """
+        output = get_output()
+        # Names and stats do not change mid-battle
+        layouts = {}
+
         def fight_chart(
                 *, topMessage, color_mode=None):
             if color_mode is None:
-                color_mode = cfg_engine.GAME_DISPLAY_STATS_COLOR_MODE
+                color_mode = cfg_engine.GAME_DISPLAY_STATS_COLOR_MODE \
+                    if output.color else 0
             return self.fightChartTwo(
                 a, b, statLogA, statLogB,
                 statsToShow=self.stats_to_show,
                 topMessage=topMessage, tabs=cfg_engine.GAME_DISPLAY_USE_TABS,
-                color_mode=color_mode)
+                color_mode=color_mode, layouts=layouts)
 
         def autoplay_pause():
+            # Emit everything written since the last pause in one write
+            output.flush()
             if autoplay == Autoplay.INSTANT:
-                print()
+                output.print()
             elif autoplay == Autoplay.SLEEP:
                 if a.is_player or b.is_player:
                     # If there is one/two players, pause AUTOPLAY seconds
-                    util.pause(
-                        cfg_engine.GAME_AUTOPLAY_NORMAL_DELAY
-                        / cfg_engine.GAME_DISPLAY_SPEED
-                    )
+                    util.pause(get_derived().normal_delay)
                 else:
                     # If two AIs are fighting, pause FIGHT_AI seconds
-                    util.pause(
-                        cfg_engine.GAME_AUTOPLAY_AI_DELAY
-                        / cfg_engine.GAME_DISPLAY_SPEED
-                    )
-                print()
+                    util.pause(get_derived().ai_delay)
+                output.print()
             elif autoplay == Autoplay.INPUT:
-                input()
+                output.pause()
             else:
                 raise TypeError(
                     'expected autoplay argument to be an Autoplay enum '
@@ -427,15 +452,9 @@ class BattleEnvironment:
                 return 0
             elif autoplay == Autoplay.SLEEP:
                 if a.is_player or b.is_player:
-                    return (
-                        cfg_engine.GAME_AUTOPLAY_NORMAL_DELAY
-                        / cfg_engine.GAME_DISPLAY_SPEED
-                    )
+                    return get_derived().normal_delay
                 else:
-                    return (
-                        cfg_engine.GAME_AUTOPLAY_AI_DELAY
-                        / cfg_engine.GAME_DISPLAY_SPEED
-                    )
+                    return get_derived().ai_delay
             elif autoplay == Autoplay.INPUT:
                 return None
             else:
@@ -465,7 +484,7 @@ class BattleEnvironment:
                 a.print_status_effect_messages(effects_messages_values,
                                              get_status_effects_print_delay())
                 if autoplay:
-                    print()
+                    output.print()
             elif turn > 1:
                 # Only triggers after first turn so battle starts immediately
                 autoplay_pause()
@@ -474,13 +493,14 @@ class BattleEnvironment:
                 return False
 
             # Print a chart of both fighters' stats
-            print(fight_chart(topMessage='<--'))
+            if output.formats:
+                output.print(fight_chart(topMessage='<--'), kind='chart')
 
             autoplay_pause()
             if effects_messages_durations:
                 a.print_status_effect_messages(effects_messages_durations,
                                              get_status_effects_print_delay())
-                print()
+                output.print()
 
             if cfg_engine.GAME_DISPLAY_SHOW_STAT_DIFFERENCE:
                 # Show damage difference
@@ -488,8 +508,8 @@ class BattleEnvironment:
                 statLogB = self.battle_stats_log(b)
 
             # Print user moves if enabled
-            if cfg_engine.GAME_DISPLAY_PRINT_MOVES:
-                print_color(a.string_moves())
+            if cfg_engine.GAME_DISPLAY_PRINT_MOVES and output.formats:
+                output.print_color(a.string_moves(), kind='moves')
 
             # Fighter attacks
             move_result = a.move(b, do_not_send=stop_after_move)
@@ -514,25 +534,26 @@ class BattleEnvironment:
                 b.print_status_effect_messages(effects_messages_values,
                                              get_status_effects_print_delay())
                 if autoplay:
-                    print()
+                    output.print()
 
             if is_dead(a) or is_dead(b):
                 return False
 
-            print(fight_chart(topMessage='-->'))
+            if output.formats:
+                output.print(fight_chart(topMessage='-->'), kind='chart')
 
             autoplay_pause()
             if effects_messages_durations:
                 b.print_status_effect_messages(effects_messages_durations,
                                              get_status_effects_print_delay())
-                print()
+                output.print()
 
             if cfg_engine.GAME_DISPLAY_SHOW_STAT_DIFFERENCE:
                 statLogA = self.battle_stats_log(a)
                 statLogB = self.battle_stats_log(b)
 
-            if cfg_engine.GAME_DISPLAY_PRINT_MOVES:
-                print_color(b.string_moves())
+            if cfg_engine.GAME_DISPLAY_PRINT_MOVES and output.formats:
+                output.print_color(b.string_moves(), kind='moves')
 
             move_result = b.move(a, do_not_send=stop_after_move)
 
@@ -576,9 +597,10 @@ class BattleEnvironment:
                     # or stop_after_move is True and fighter B has moved
                     break
 
-        print()
-        if not is_dead(a) and not is_dead(b):
-            game_loop()
+        with output.frame():
+            output.print()
+            if not is_dead(a) and not is_dead(b):
+                game_loop()
 
         if not is_dead(a) and not is_dead(b) and stop_after_move:
             # Return results of move since `stop_after_move` is True
@@ -607,7 +629,6 @@ class BattleEnvironment:
             # No winner; don't show any stat change
             statLogA = statLogB = None
 
-        fightChart = fight_chart(topMessage='END')
         fightChart_nocolor = fight_chart(
             topMessage='END', color_mode=0)
 
@@ -618,9 +639,14 @@ class BattleEnvironment:
         )
 
         # add green color to the top message and print it
-        autoplay_pause()
-        print_color(fightChart.replace('END', '{FLgree}END{RA}'))
-        print()
+        with output.frame():
+            autoplay_pause()
+            if output.formats:
+                fightChart = fight_chart(topMessage='END')
+                output.print_color(
+                    fightChart.replace('END', '{FLgree}END{RA}'),
+                    kind='chart')
+            output.print()
 
         if return_end_message:
             end_message = []
@@ -651,15 +677,11 @@ class BattleEnvironment:
 
     @staticmethod
     def print_end_message(end_message):
+        output = get_output()
         speed = cfg_engine.GAME_DISPLAY_SPEED
-        time.sleep(0.75 / speed)
-        print_color(end_message[0])
-        time.sleep(0.5 / speed)
-        print_color(end_message[1])
-        time.sleep(0.25 / speed)
-        print_color(end_message[2])
-        time.sleep(0.8 / speed)
-        print_color(end_message[3])
+        for delay, message in zip((0.75, 0.5, 0.25, 0.8), end_message):
+            output.pause(delay / speed)
+            output.print_color(message, kind='end')
 
     @staticmethod
     def fightChartStat(
@@ -702,7 +724,38 @@ class BattleEnvironment:
         return f'{color_name}{msg[0]}' + f'{color_stat}{msg[1]}' + r, no_code
 
     @classmethod
-    def fightChartOne(cls, fighter, statLog=None, statsToShow=None, color=0):
+    def fightChartLayout(cls, fighter, statsToShow=None, color=0,
+                         layouts=None):
+        """Return the layout of a fighter's column in a fight chart.
+
+        Args:
+            fighter (Fighter): The fighter to lay out.
+            statsToShow (Optional[Iterable[str]]): See `fightChartOne`.
+            color (int): See `fightChartOne`.
+            layouts (Optional[dict]): A cache of layouts to reuse.
+                Names and stat sets do not change mid-battle, so a battle
+                can pass the same dictionary to every chart it renders.
+                The cache holds on to every fighter it has laid out,
+                so it should not outlive the battle.
+
+        Returns:
+            FightChartLayout
+
+        """
+        if layouts is None:
+            return FightChartLayout(cls, fighter, statsToShow, color)
+
+        key = (fighter, fighter.name,
+               None if statsToShow is None else tuple(statsToShow), color)
+        layout = layouts.get(key)
+        if layout is None:
+            layout = layouts[key] = FightChartLayout(
+                cls, fighter, statsToShow, color)
+        return layout
+
+    @classmethod
+    def fightChartOne(cls, fighter, statLog=None, statsToShow=None, color=0,
+                      layouts=None):
         """Return a multi-line message showing a fighter's stats.
 
         Args:
@@ -717,107 +770,125 @@ class BattleEnvironment:
                 0 - Do not use any ANSI color codes.
                 1 - Use the stat colors on the values.
                 2 - Use the stat colors on the entire line.
+            layouts (Optional[dict]): See `fightChartLayout`.
 
         """
-        if color < 0 or color > 2:
-            raise ValueError('Unknown color mode')
-
-        color_number_only = True if color == 1 else False
-
-        message = str(fighter)
-        no_codes = [fighter.name_decolored]
-
-        def chart_stat(*args, **kwargs):
-            nonlocal fighter, message
-            chart_stat, no_code = cls.fightChartStat(
-                statInfo.ext_short.upper(),
-                getattr(fighter, stat), *args,
-                color=colorString,
-                color_number_only=color_number_only,
-                **kwargs
-            )
-            message += '\n' + chart_stat
-            no_codes.append(no_code)
-
-        def showing_stat(statInfo):
-            if statsToShow is not None:
-                return statInfo.int_short in statsToShow
-            return True
-
-        if statLog is None:
-            for stat, statInfo in fighter.stats.items():
-                if showing_stat(statInfo):
-                    colorString = statInfo.color_fore if color > 0 else ''
-                    chart_stat()
-        else:
-            recentStatLog = statLog[-1]
-            for stat, statInfo in fighter.stats.items():
-                if showing_stat(statInfo):
-                    preStat = recentStatLog.get(stat)
-                    colorString = statInfo.color_fore if color > 0 else ''
-                    chart_stat(preStat)
-
-        return message, no_codes
+        lines, no_codes = cls.fightChartLayout(
+            fighter, statsToShow, color, layouts).render(statLog)
+        return '\n'.join(lines), no_codes
 
     @classmethod
     def fightChartTwo(
             cls, a, b,
             statLogA=None, statLogB=None, *,
             statsToShow=None, topMessage=None, tabs=False,
-            color_mode=0):
+            color_mode=0, layouts=None):
         """Return a multi-line message for two fighters showing their stats."""
-        a, a_nocodes = cls.fightChartOne(
-            a, statLogA, statsToShow=statsToShow, color=color_mode)
-        a = a.split('\n')
-        b, b_nocodes = cls.fightChartOne(
-            b, statLogB, statsToShow=statsToShow, color=color_mode)
-        b = b.split('\n')
-
-        lengthA = len(max(a_nocodes, key=len))
-        lengthB = len(max(b_nocodes, key=len))
-
-        # Leading whitespaces to center-align all stats on first fighter but
-        # keeping each stat aligned with each other
-        leadingA = ' ' * (
-            (len(a_nocodes[0]) - len(max(a_nocodes[1:], key=len))) // 2)
-        lengthA_with_lead = lengthA - len(leadingA)
-        leadingB = ' ' * (
-            (len(b_nocodes[0]) - len(max(b_nocodes[1:], key=len))) // 2)
-        lengthB_with_lead = lengthB - len(leadingB)
+        a = cls.fightChartLayout(
+            a, statsToShow, color_mode, layouts).render(statLogA)
+        b = cls.fightChartLayout(
+            b, statsToShow, color_mode, layouts).render(statLogB)
+
+        # Only show the stats that both fighters have
+        rows = min(len(a[0]), len(b[0]))
+        columns = [(lines[:rows], no_codes[:rows])
+                   for lines, no_codes in (a, b)]
+        lengthA = max(len(line) for line in a[1])
+
+        topMessageLength = lengthA * 2 + cfg_engine.GAME_DISPLAY_STAT_GAP
+
+        return cls._fightChartColumns(
+            columns, topMessage, topMessageLength, tabs)
+
+    @classmethod
+    def fightChartMany(
+            cls, fighters, statLogs=None, *,
+            statsToShow=None, topMessage=None, tabs=False,
+            color_mode=0, layouts=None):
+        """Return a multi-line message showing the stats of any number
+        of fighters side by side, such as for team battles.
+        Two fighters are shown the same as by `fightChartTwo`.
+
+        Args:
+            fighters (Sequence[Fighter]): The fighters to show.
+            statLogs (Optional[Sequence[Optional[List[dict]]]]):
+                A statLog for each fighter to show change in each stat.
+            statsToShow
+            topMessage
+            tabs
+            color_mode
+            layouts: See `fightChartTwo`.
+
+        """
+        if statLogs is None:
+            statLogs = [None] * len(fighters)
+        if len(fighters) == 2:
+            # Two fighters are laid out the same as in one on one battles
+            return cls.fightChartTwo(
+                *fighters, *statLogs, statsToShow=statsToShow,
+                topMessage=topMessage, tabs=tabs,
+                color_mode=color_mode, layouts=layouts)
+        columns = [
+            cls.fightChartLayout(
+                fighter, statsToShow, color_mode, layouts).render(statLog)
+            for fighter, statLog in zip(fighters, statLogs)
+        ]
+        width = sum(max(len(line) for line in no_codes)
+                    for _, no_codes in columns) \
+            + cfg_engine.GAME_DISPLAY_STAT_GAP * (len(columns) - 1)
+
+        return cls._fightChartColumns(columns, topMessage, width, tabs)
+
+    @staticmethod
+    def _fightChartColumns(columns, topMessage, topMessageLength, tabs):
+        """Join the columns of fighters' stats into a chart.
+
+        Args:
+            columns (List[Tuple[List[str], List[str]]]):
+                The lines of each fighter with and without ANSI codes,
+                the first line being the fighter's name.
+            topMessage (Optional[str]): A message to center above.
+            topMessageLength (int): The width to center topMessage in.
+            tabs (bool): Replace spaces with tabs.
+
+        """
+        gap = ' ' * cfg_engine.GAME_DISPLAY_STAT_GAP
+
+        widths = []
+        for lines, no_codes in columns:
+            length = max(len(line) for line in no_codes)
+            # Leading whitespaces to center-align all stats on a fighter but
+            # keeping each stat aligned with each other
+            leading = max(
+                (len(no_codes[0])
+                 - max((len(line) for line in no_codes[1:]), default=0))
+                // 2, 0)
+            widths.append((length, leading))
 
         message_list = []
 
         # If there is a top message, print it center-aligned
         if topMessage is not None:
-            topMessageLength = lengthA * 2 + cfg_engine.GAME_DISPLAY_STAT_GAP
             message_list.append(f'{topMessage:^{topMessageLength}}'.rstrip())
 
-        # For each line in both states
-        for line_num, lines in enumerate(zip(a, b, a_nocodes, b_nocodes)):
-            a_line, b_line, a_line_nocode, b_line_nocode = lines
-
-            # Center-align first line (names) only
-            msg_align = '^' if line_num == 0 else ''
-
-            if msg_align:
-                # Skip first line, leadingA-center-aligning is for the stats
-                msgA = f'{a_line_nocode:{msg_align}{lengthA}}' \
-                       f"{' ' * cfg_engine.GAME_DISPLAY_STAT_GAP}"
-            else:
-                msgA = f'{leadingA}' \
-                       f'{a_line_nocode:{lengthA_with_lead}}' \
-                       f"{' ' * cfg_engine.GAME_DISPLAY_STAT_GAP}"
-            # Replace the line_nocode with the actual ANSI-coded string
-            msgA = msgA.replace(a_line_nocode, a_line, 1)
-
-            if msg_align:
-                msgB = f'{b_line_nocode:{msg_align}{lengthB}}'
-            else:
-                msgB = f'{leadingB}' \
-                       f'{b_line_nocode:{lengthB_with_lead}}'
-            msgB = msgB.replace(b_line_nocode, b_line, 1)
-
-            message_list.append(msgA + msgB)
+        rows = max(len(lines) for lines, _ in columns)
+        for line_num in range(rows):
+            cells = []
+            for (lines, no_codes), (length, leading) in zip(columns, widths):
+                if line_num < len(lines):
+                    line, no_code = lines[line_num], no_codes[line_num]
+                else:
+                    line = no_code = ''
+                if line_num == 0:
+                    # Center-align first line (names) only
+                    pad = length - len(no_code)
+                    left = pad // 2
+                    right = pad - left
+                else:
+                    left = leading
+                    right = length - leading - len(no_code)
+                cells.append(f"{' ' * left}{line}{' ' * right}")
+            message_list.append(gap.join(cells))
 
         # Add indent to all lines and strip trailing whitespace
         message = []
@@ -831,3 +902,68 @@ class BattleEnvironment:
                 ' ' * cfg_engine.GAME_DISPLAY_TAB_LENGTH, '\t')
 
         return message
+
+
+class FightChartLayout:
+    """The parts of a fighter's column in a fight chart that stay the same
+    during a battle.
+
+    The fighter's name, the stats shown and their colored labels are
+    prepared once, and the line of each stat is only formatted again
+    when its value changes. Only the latest line of each stat is kept.
+
+    Args:
+        env (Type[BattleEnvironment]): The class formatting stat lines.
+        fighter (Fighter): The fighter to lay out.
+        statsToShow (Optional[Iterable[str]]): The stats to show.
+            If None, shows all stats.
+        color (int): The color mode. See `BattleEnvironment.fightChartOne`.
+
+    """
+
+    def __init__(self, env, fighter, statsToShow=None, color=0):
+        if color < 0 or color > 2:
+            raise ValueError('Unknown color mode')
+
+        self.env = env
+        self.fighter = fighter
+        self.name = str(fighter)
+        self.name_nocode = fighter.name_decolored
+        self.color_number_only = color == 1
+        self.stats = [
+            (stat, statInfo.ext_short.upper(),
+             statInfo.color_fore if color > 0 else '')
+            for stat, statInfo in fighter.stats.items()
+            if statsToShow is None or statInfo.int_short in statsToShow
+        ]
+        self.cells = {}
+
+    def render(self, statLog=None):
+        """Return the lines of the column with and without ANSI codes.
+
+        Args:
+            statLog: An optional statLog to show change in each stat.
+
+        Returns:
+            Tuple[List[str], List[str]]
+
+        """
+        recentStatLog = statLog[-1] if statLog is not None else {}
+        lines = [self.name]
+        no_codes = [self.name_nocode]
+        for stat, label, colorString in self.stats:
+            value = getattr(self.fighter, stat)
+            preStat = recentStatLog.get(stat)
+            cached = self.cells.get(stat)
+            if cached is not None and cached[:2] == (value, preStat):
+                cell = cached[2]
+            else:
+                cell = self.env.fightChartStat(
+                    label, value, preStat,
+                    color=colorString,
+                    color_number_only=self.color_number_only
+                )
+                self.cells[stat] = (value, preStat, cell)
+            lines.append(cell[0])
+            no_codes.append(cell[1])
+        return lines, no_codes
@@ -11,18 +11,30 @@ from .move import Move
 from src import logs
 from src import settings
 from src.textio import (  # Color I/O
-    ColoramaCodes, cr, format_color, input_color, print_color
+    ColoramaCodes, cr, format_color, get_output, input_color
 )
 from src.utility import custom_divide, plural
 
 logger = logs.get_logger()
 
 # Load settings
-cfg_engine = settings.load_config('engine')
+cfg_engine = settings.shared_config('engine')
 
-INDENT = '\t' if cfg_engine.GAME_DISPLAY_USE_TABS \
-    else ' ' * cfg_engine.GAME_DISPLAY_TAB_LENGTH
-# The standard indentation to use for printing based on game settings.
+
+def _make_indent(cfg):
+    return '\t' if cfg['GAME_DISPLAY_USE_TABS'] \
+        else ' ' * cfg['GAME_DISPLAY_TAB_LENGTH']
+
+
+INDENT = _make_indent(settings.DEFAULT_ENGINE)
+# The standard indentation to use for printing based on game settings;
+# updated when the engine config is loaded
+
+
+@cfg_engine.subscribe
+def _update_indent(cfg):
+    global INDENT
+    INDENT = _make_indent(cfg)
 
 
 class Fighter:
@@ -1388,7 +1400,7 @@ detailedFail - If True, return BoolDetailed when failing a search."""
                              f"{self.name_decolored}'s moves")
 
         if move['name'] == 'None':
-            print_color(f'{self} did not move.')
+            get_output().print_color(f'{self} did not move.')
             send_move(move)
             # Return used move and an empty dict showing no stats were used
             return {
@@ -1401,8 +1413,8 @@ detailedFail - If True, return BoolDetailed when failing a search."""
         if not self.available_skills_in_move(move):
             logger.debug(f'{self.name_decolored} failed to move; '
                          'lack of skills')
-            print_color(f'{self} tried using {move} but did not'
-                        ' have the needed skills.')
+            get_output().print_color(f'{self} tried using {move} but did not'
+                                     ' have the needed skills.')
             if not self.is_player:
                 self.AI.analyse_move_receive(
                     target, move, self, info=('senderFail', 'missingSkills'))
@@ -1411,8 +1423,8 @@ detailedFail - If True, return BoolDetailed when failing a search."""
         if not itemRequirements:
             logger.debug(f'{self.name_decolored} failed to move;'
                          ' lack of items')
-            print_color(f'{self} tried using {move} but did not'
-                        ' have the needed items.')
+            get_output().print_color(f'{self} tried using {move} but did not'
+                                     ' have the needed items.')
             if not self.is_player:
                 self.AI.analyse_move_receive(
                     target, move, self, info=('senderFail', 'missingItems'))
@@ -1438,7 +1450,7 @@ detailedFail - If True, return BoolDetailed when failing a search."""
         items_used_str = self.use_item_requirements(
             itemRequirements, return_string=self.is_player)
         if isinstance(items_used_str, str):
-            print_color(items_used_str, end='\n\n')
+            get_output().print_color(items_used_str, end='\n\n')
 
         # Finished, send move
         send_move(move, costs)
@@ -1680,7 +1692,11 @@ detailedFail - If True, return BoolDetailed when failing a search."""
         """Obtains a counter from the player.
 Note: No counter shell has been created so the placeholder interface code
 below is being used."""
-        print_color(f'{INDENT}\
+        # Reading the snapshot reloads the engine config when a check
+        # is due, which keeps INDENT up to date
+        cfg_engine.snapshot
+        output = get_output()
+        output.print_color(f'{INDENT}\
 {sender} is using {move}, but {self} is able to use a counter!')
 
         countersMessage = self.string_counters()
@@ -1692,7 +1708,7 @@ below is being used."""
 
         while True:
             # TODO: Create shell in separate file to use here
-            user_input = input(prompt).lower().strip()
+            user_input = output.input(prompt).lower().strip()
 
             if user_input == '':
                 prompt = (
@@ -1737,10 +1753,12 @@ below is being used."""
 
         # Get user interaction and use the changes in `namespace`
         # to know which move to use next
-        interface.FighterBattleMainShell(
-            self, target, namespace, cmdqueue
-        ).cmdloop()
-        print()
+        output = get_output()
+        with output.unbuffered():
+            interface.FighterBattleMainShell(
+                self, target, namespace, cmdqueue
+            ).cmdloop()
+        output.print()
 
         self.interface_shell_dict['moveCMD'] = namespace['newMoveCMD']
 
@@ -1753,6 +1771,10 @@ below is being used."""
         that message is used. Otherwise, uses a generic message.
 
         """
+        output = get_output()
+        if not output.formats:
+            return
+
         stat_obj = self.stats[stat]
         namespace = {
             'self': self,
@@ -1770,7 +1792,7 @@ below is being used."""
             message = ('{self} tried using {move} but the {ext_full} cost '
                        'was {-cost}.')
 
-        print_color(message, namespace=namespace)
+        output.print_color(message, namespace=namespace)
 
     def print_move(self, sender, move, values=None, costs=None,
                    message='moveMessage', **kwargs):
@@ -1800,6 +1822,10 @@ below is being used."""
             **kwargs: Keyword arguments to pass into `print_color`.
 
         """
+        output = get_output()
+        if not output.formats:
+            return
+
         namespace = {'sender': sender, 'target': self, 'move': move}
 
         for stat, stat_obj in self.stats.items():
@@ -1816,7 +1842,8 @@ below is being used."""
             else:
                 namespace[cost] = 0
 
-        print_color(move[message], namespace=namespace, **kwargs)
+        output.print_color(move[message], namespace=namespace, kind='move',
+                           **kwargs)
 
     def print_status_effect(self, effect, values=None, message='applyMessage',
                             **kwargs):
@@ -1836,7 +1863,8 @@ below is being used."""
                 0 for each {stat}Value.
             **kwargs: Keyword arguments to pass into `print_color`.
         """
-        if message in effect:
+        output = get_output()
+        if output.formats and message in effect:
             namespace = {'self': self, 'effect': effect}
             for stat, stat_obj in self.stats.items():
                 namespace[stat] = stat_obj
@@ -1847,7 +1875,8 @@ below is being used."""
                 else:
                     namespace[value] = 0
 
-            print_color(effect[message], namespace=namespace, **kwargs)
+            output.print_color(effect[message], namespace=namespace,
+                               kind='status_effect', **kwargs)
 
     def print_status_effect_messages(self, messages, print_delay=0):
         for effect, message, values in messages:
@@ -7,29 +7,51 @@ from .move import Move
 from src import logs
 from src import settings
 from src.textio import (
-    ColoramaCodes, cr, format_color, input_color, print_color
+    ColoramaCodes, cr, format_color, get_output, input_color
 )
 
 logger = logs.get_logger()
 
-# Conditional import
-try:
-    if platform.system() == 'Windows':
-        # For Windows, do this instead of just import readline;
-        # it screws with colours on prompting
-        import pyreadline as readline
-    else:
-        import readline
-except ModuleNotFoundError:
-    readline = None
-    if platform.system() == 'Windows':
-        logger.info('Missing readline module, auto-completion not available; '
-                    'install "pyreadline" module to resolve')
-    else:
-        logger.info('Missing readline module, auto-completion not available')
-
-cfg_engine = settings.load_config('engine')
-cfg_interface = settings.load_config('interface')
+# Set by `load_readline` the first time a shell is created
+readline = None
+_readline_loaded = False
+
+
+def load_readline():
+    """Import readline for auto-completion in the shells if available.
+
+    The import is done on first use since it is slow and only needed
+    when a player is prompted.
+
+    Returns:
+        Optional[module]: The readline module, or None if missing.
+
+    """
+    global readline, _readline_loaded
+    if _readline_loaded:
+        return readline
+    _readline_loaded = True
+
+    try:
+        if platform.system() == 'Windows':
+            # For Windows, do this instead of just import readline;
+            # it screws with colours on prompting
+            import pyreadline as readline
+        else:
+            import readline
+    except ModuleNotFoundError:
+        readline = None
+        if platform.system() == 'Windows':
+            logger.info('Missing readline module, auto-completion not '
+                        'available; install "pyreadline" module to resolve')
+        else:
+            logger.info('Missing readline module, '
+                        'auto-completion not available')
+    return readline
+
+
+cfg_engine = settings.shared_config('engine')
+cfg_interface = settings.shared_config('interface')
 
 
 class FighterBattleShell:
@@ -69,7 +91,9 @@ class FighterBattleShell:
                 See `cmd.Cmd` and `readline` for more details.
 
         """
+        load_readline()
         super().__init__(completekey, stdin, stdout)
+        self.output = get_output()
         self.fighter = fighter
         self.opponent = opponent
         self.namespace = namespace
@@ -87,7 +111,7 @@ Usage: ?[cmd/topic]"""
     # ----- Command Handlers -----
     def default(self, line):
         """Called when a command prefix is not recognized."""
-        print_color('{Fyello}Unknown command')
+        self.output.print_color('{Fyello}Unknown command')
 
     def emptyline(self):
         """Called when an empty line is entered.
@@ -182,7 +206,7 @@ Usage: move [future commands]"""
             # Special first time interaction for showing help message
             # without kicking back into Main Interface on second opening
             namespace = dict()
-            print(
+            self.output.print(
                 format_color(f'Your player is {self.fighter.name}' + '{RA}!'),
                 'Below will be a list of commands you can type to use.',
                 'To start, type "list" to show what moves you have.',
@@ -223,29 +247,29 @@ Usage: move [future commands]"""
     def do_item(self, arg):
         """Go into the Item Interface or run commands from it and return.
 Usage: item [future commands]"""
-        print('This feature is currently unavailable.\n')
+        self.output.print('This feature is currently unavailable.\n')
 
     def do_stats(self, arg):
         """View your current stats.
 Usage: stats [future commands]"""
-        print_color(
+        self.output.print_color(
             self.fighter.battle_env.fightChartOne(
                 self.fighter, color=cfg_engine.GAME_DISPLAY_STATS_COLOR_MODE
             )[0]
         )
-        print()
+        self.output.print()
 
         self.updateCmdqueue(arg)
 
     def do_display(self, arg):
         """Display the current battle.
 Usage: display [future commands]"""
-        print_color(self.fighter.battle_env.fightChartTwo(
+        self.output.print_color(self.fighter.battle_env.fightChartTwo(
             self.fighter, self.opponent,
             topMessage='<--', tabs=cfg_engine.GAME_DISPLAY_USE_TABS,
             color_mode=cfg_engine.GAME_DISPLAY_STATS_COLOR_MODE)
         )
-        print()
+        self.output.print()
 
         self.updateCmdqueue(arg)
 
@@ -290,11 +314,11 @@ Usage: back [future commands]"""
         """List your current moves.
 Usage: list [future commands]"""
         # Should be the same as in the Move shell
-        print_color(self.fighter.string_moves(
+        self.output.print_color(self.fighter.string_moves(
             ignore_skills=True,
             ignore_items=True)
         )
-        print()
+        self.output.print()
 
         self.updateCmdqueue(arg)
 
@@ -330,7 +354,7 @@ class FighterBattleMoveShell(
                                 + moveFind.parse_unsatisfactories(
                                     unsatisfactories)
                 if 'returnTo' in self.namespace:
-                    print_color(reasonMessage)
+                    self.output.print_color(reasonMessage)
                     self.namespace['shell_result'] = False
                     return self.exit()
                 else:
@@ -350,7 +374,7 @@ class FighterBattleMoveShell(
         elif moveFind is None:
             # Search failed (detailedFail=False)
             if 'returnTo' in self.namespace:
-                print_color('Did not find move')
+                self.output.print_color('Did not find move')
                 self.namespace['shell_result'] = False
                 return self.exit()
             else:
@@ -361,7 +385,7 @@ class FighterBattleMoveShell(
                 moveCount = int(moveFind.description.split()[1])
                 message = f'Found {moveCount:,} different moves'
                 if 'returnTo' in self.namespace:
-                    print_color(message)
+                    self.output.print_color(message)
                     self.namespace['shell_result'] = False
                     return self.exit()
                 else:
@@ -369,7 +393,7 @@ class FighterBattleMoveShell(
             elif moveFind.name == 'NoResults':
                 message = 'Did not find move'
                 if 'returnTo' in self.namespace:
-                    print_color(message)
+                    self.output.print_color(message)
                     self.namespace['shell_result'] = False
                     return self.exit()
                 else:
@@ -396,7 +420,7 @@ Usage: info [future commands]"""
 
     # ----- Help Topic Commands -----
     def help_move(self):
-        print_color("""
+        self.output.print_color("""
 Type the move you want to use.
 Use "list" to display your available moves.
 """)
@@ -444,8 +468,9 @@ class FighterBattleMoveInfoShell(
         if not isinstance(moveFind, (type(None), BoolDetailed)):
             namespace = fighter_stats.ALL_STAT_INFOS.copy()
             namespace['move'] = moveFind
-            print_color(moveFind['description'], namespace=namespace)
-            print()
+            self.output.print_color(moveFind['description'],
+                                    namespace=namespace)
+            self.output.print()
             return
 
         # Else request for a move again
@@ -453,7 +478,7 @@ class FighterBattleMoveInfoShell(
             # Search failed (detailedFail=False)
             message = 'Did not find move'
             if 'returnTo' in self.namespace:
-                print_color(message)
+                self.output.print_color(message)
                 return
             else:
                 self.prompt = message + ', type again: '
@@ -463,14 +488,14 @@ class FighterBattleMoveInfoShell(
                 moveCount = int(moveFind.description.split()[1])
                 message = f'Found {moveCount:,} different moves'
                 if 'returnTo' in self.namespace:
-                    print_color(message)
+                    self.output.print_color(message)
                     return
                 else:
                     self.prompt = message + ', type again: '
             elif moveFind.name == 'NoResults':
                 message = 'Did not find move'
                 if 'returnTo' in self.namespace:
-                    print_color(message)
+                    self.output.print_color(message)
                     return
                 else:
                     self.prompt = message + ', type again: '
@@ -0,0 +1,59 @@
+import pytest
+
+from src.engine import BattleEnvironment, Fighter
+from src.engine.battle_env import cfg_engine
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'topMessage': '<--', 'color_mode': 1},
+    {'statsToShow': ['hp'], 'color_mode': 2},
+    {'topMessage': 'END', 'tabs': True},
+])
+def test_fight_chart_many_matches_two(kwargs):
+    a = Fighter('{Fgreen}Alice{RA}')
+    b = Fighter('Bob the Brave')
+    b.hp -= 30
+    statLogs = [None, [{'hp': b.hp + 30}]]
+    layouts = {}
+    for _ in range(2):
+        assert BattleEnvironment.fightChartMany(
+            [a, b], statLogs, layouts=layouts, **kwargs
+        ) == BattleEnvironment.fightChartTwo(a, b, *statLogs, **kwargs)
+
+
+def test_fight_chart_many_layout():
+    a, b, c = Fighter('Al'), Fighter('Bob'), Fighter('Carol the Great')
+    b.hp -= 10
+    chart = BattleEnvironment.fightChartMany(
+        [a, b, c], [None, [{'hp': 100}], None],
+        statsToShow=['hp', 'mp'], topMessage='Turn 1')
+
+    shift = ' ' * cfg_engine.GAME_DISPLAY_STATS_SHIFT
+    gap = ' ' * cfg_engine.GAME_DISPLAY_STAT_GAP
+    # Names are centered and stats are aligned within each column
+    lines = [
+        f"{'Turn 1':^{7 + 12 + 15 + len(gap) * 2}}",
+        '  Al   ' + gap + '    Bob     ' + gap + 'Carol the Great',
+        'HP: 100' + gap + 'HP: 100 - 10' + gap + '    HP: 100',
+        'MP: 100' + gap + 'MP: 100     ' + gap + '    MP: 100',
+    ]
+    assert chart == '\n'.join((shift + line).rstrip() for line in lines)
+
+
+def test_fight_chart_layouts_are_reused():
+    fighter = Fighter('Al')
+    layouts = {}
+    layout = BattleEnvironment.fightChartLayout(fighter, layouts=layouts)
+    assert BattleEnvironment.fightChartLayout(
+        fighter, layouts=layouts) is layout
+    # Another fighter with the same name gets its own layout
+    assert BattleEnvironment.fightChartLayout(
+        Fighter('Al'), layouts=layouts) is not layout
+
+    # Only the latest line of each stat is kept
+    for hp in range(90, 100):
+        fighter.hp = hp
+        lines, _ = layout.render()
+        assert lines[1] == f'HP: {hp}'
+    assert len(layout.cells) == len(layout.stats)
@@ -1,4 +1,4 @@
-import time
+from src.textio import get_output
 
 
 def num(x):
@@ -30,12 +30,8 @@ def pause(sleep=None, printNewline=0):
             if 2, then it is printed after the call.
             For no newline, set to 0.
 
+    The pause is delegated to the current output sink, so sinks
+    that do not show text to a user return immediately.
+
     """
-    if sleep is None:
-        input()
-    else:
-        if printNewline == 1:
-            print()
-        time.sleep(sleep)
-        if printNewline == 2:
-            print()
+    get_output().pause(sleep, printNewline)
@@ -1,32 +1,194 @@
+"""Provides the logger used throughout Dueturn.
+
+Records are put on a queue and written to the log files by a background
+thread, so logging never blocks on disk I/O. The thread is started
+with the first record and stopped when the program exits.
+
+The previous run's logs are rotated instead of being overwritten,
+and a log is also rotated once it grows past `MAX_BYTES`.
+Set DUETURN_LOG_COMPRESS=1 to compress the rotated logs with gzip.
+
+Worker processes, such as those of a ProcessPoolExecutor, write to
+their own files which include the process ID in the name.
+
+"""
+import atexit
+import gzip
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+
+LOG_FILE = 'dueturn.log'
+DEBUG_LOG_FILE = 'dueturn_debug.log'
+# The size at which a log is rotated and the number of old logs kept
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+# Compress rotated logs into .gz archives
+COMPRESS = os.environ.get('DUETURN_LOG_COMPRESS', '0') not in ('', '0')
 
 logger = None
+listener = None
+_queue = None
+_lock = threading.Lock()
+
+
+class RotatingLogHandler(logging.handlers.RotatingFileHandler):
+    """A RotatingFileHandler that also rotates an existing log before
+    writing its first record, keeping the logs of previous runs.
+
+    The file is not opened until the first record.
+
+    Args:
+        filename (str): The file to write to.
+        max_bytes (int): The size at which the file is rotated.
+            If 0, the file is only rotated before its first record.
+        backup_count (int): The number of rotated files to keep.
+        compress (bool): Compress rotated files with gzip.
+
+    """
+
+    def __init__(self, filename, max_bytes=MAX_BYTES,
+                 backup_count=BACKUP_COUNT, compress=COMPRESS):
+        super().__init__(filename, mode='a', maxBytes=max_bytes,
+                         backupCount=backup_count, delay=True)
+        self.started = False
+        if compress:
+            self.namer = _gzip_namer
+            self.rotator = _gzip_rotator
+
+    def shouldRollover(self, record):
+        if not self.started:
+            self.started = True
+            try:
+                if os.path.getsize(self.baseFilename) > 0:
+                    return True
+            except OSError:
+                pass
+        return super().shouldRollover(record)
+
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def log_filename(filename):
+    """Return the log file name to use in the current process.
+
+    Worker processes include their process ID in the name,
+    for example dueturn-1234.log.
+
+    """
+    from multiprocessing import parent_process
+
+    if parent_process() is None:
+        return filename
+    root, ext = os.path.splitext(filename)
+    return f'{root}-{os.getpid()}{ext}'
+
+
+def _create_file_handlers():
+    formatter = logging.Formatter(
+        '%(name)s: %(asctime)s - %(levelname)s - '
+        '%(funcName)s - Line %(lineno)d:\n'
+        '    %(message)s'
+    )
+
+    fh = RotatingLogHandler(log_filename(LOG_FILE))
+    fh.setLevel(logging.INFO)
+    fh.setFormatter(formatter)
+
+    fhDebug = RotatingLogHandler(log_filename(DEBUG_LOG_FILE))
+    fhDebug.setLevel(logging.DEBUG)
+    fhDebug.setFormatter(formatter)
+
+    return fh, fhDebug
+
+
+class _ListenerQueueHandler(logging.handlers.QueueHandler):
+    """A QueueHandler that starts the listener with the first record."""
+
+    def enqueue(self, record):
+        if listener is None:
+            start_listener()
+        super().enqueue(record)
+
+
+def start_listener():
+    """Start the thread writing the queued records to the log files.
+
+    This is done automatically when the first record is logged.
+
+    """
+    from multiprocessing import parent_process, util
+
+    global listener
+    with _lock:
+        if listener is not None:
+            return
+        listener = logging.handlers.QueueListener(
+            _queue, *_create_file_handlers(), respect_handler_level=True)
+        listener.start()
+
+        if parent_process() is not None:
+            # Worker processes exit without running atexit callbacks
+            util.Finalize(None, stop_listener, exitpriority=0)
+
+
+def stop_listener():
+    """Write the remaining queued records and stop the listener thread.
+
+    The listener is started again if more records are logged.
+
+    """
+    global listener
+    with _lock:
+        if listener is None:
+            return
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        listener = None
+
+
+def _reset_after_fork():
+    """Give a forked child its own queue and listener since
+    the parent's thread does not exist in the child."""
+    global listener, _queue, _lock
+    _lock = threading.Lock()
+    listener = None
+    _queue = queue.SimpleQueue()
+    if logger is not None:
+        for handler in logger.handlers:
+            if isinstance(handler, _ListenerQueueHandler):
+                handler.queue = _queue
 
 
 def get_logger():
     """Create or return the current logger."""
-    global logger
+    global logger, _queue
 
     if logger is None:
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.DEBUG)
 
-        formatter = logging.Formatter(
-            '%(name)s: %(asctime)s - %(levelname)s - '
-            '%(funcName)s - Line %(lineno)d:\n'
-            '    %(message)s'
-        )
+        _queue = queue.SimpleQueue()
+        qh = _ListenerQueueHandler(_queue)
+        qh.setLevel(logging.DEBUG)
 
-        fh = logging.FileHandler('dueturn.log', mode='w')
-        fh.setLevel(logging.INFO)
-        fh.setFormatter(formatter)
+        logger.addHandler(qh)
 
-        fhDebug = logging.FileHandler(
-            'dueturn_debug.log', mode='w')
-        fhDebug.setLevel(logging.DEBUG)
-        fhDebug.setFormatter(formatter)
+    return logger
 
-        logger.addHandler(fh)
-        logger.addHandler(fhDebug)
 
-    return logger
+atexit.register(stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
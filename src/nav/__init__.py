@@ -1,5 +1,6 @@
 from . import gridmap
 from . import pathfinding
+from . import chunks
 
 __copyright__ = """
     Dueturn - A text-based two-player battle engine.
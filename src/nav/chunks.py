@@ -0,0 +1,323 @@
+"""Provides an unbounded map generated in chunks from a seed."""
+import collections
+import mmap
+import random
+
+from .gridmap import (
+    CARDINALS, MASK_VECTORS, CompactGridMap, _render_window,
+    cardinal_to_vector, reverse_cardinal
+)
+
+__all__ = [
+    'ChunkedWorld',
+    'generate_maze_chunk'
+]
+
+
+def generate_maze_chunk(chunk, rng):
+    """Fill a chunk with Cells connected as a maze.
+
+    Every Cell is reachable from every other Cell in the chunk,
+    using only north, east, south and west paths.
+
+    Args:
+        chunk (CompactGridMap): The empty chunk to fill.
+        rng (random.Random): The seeded random number generator.
+
+    """
+    y_size, x_size = len(chunk), len(chunk[0])
+    for y in range(y_size):
+        for x in range(x_size):
+            chunk.create_cell(y, x)
+
+    directions = ('N', 'E', 'S', 'W')
+    visited = bytearray(y_size * x_size)
+    start = rng.randrange(y_size), rng.randrange(x_size)
+    visited[start[0] * x_size + start[1]] = 1
+    stack = [start]
+
+    # Randomized depth-first search
+    while stack:
+        y, x = stack[-1]
+        options = []
+        for d in directions:
+            vy, vx = cardinal_to_vector(d)
+            ny, nx = y + vy, x + vx
+            if 0 <= ny < y_size and 0 <= nx < x_size \
+                    and not visited[ny * x_size + nx]:
+                options.append((d, ny, nx))
+
+        if not options:
+            stack.pop()
+            continue
+
+        d, ny, nx = rng.choice(options)
+        chunk.connect_cell(y, x, d)
+        visited[ny * x_size + nx] = 1
+        stack.append((ny, nx))
+
+
+class _ChunkSpill:
+    """A memory-mapped file storing the path masks of evicted chunks.
+
+    Every chunk takes one fixed-size record: its path masks followed
+    by the bits marking which squares are Cells.
+
+    """
+
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, path, record_size):
+        self.record_size = record_size
+        self.slots = {}
+        self.file = open(path, 'w+b')
+        self.capacity = 0
+        self.mmap = None
+        self._grow(self.INITIAL_CAPACITY)
+
+    def _grow(self, capacity):
+        self.file.truncate(capacity * self.record_size)
+        if self.mmap is not None:
+            self.mmap.close()
+        self.mmap = mmap.mmap(self.file.fileno(),
+                              capacity * self.record_size)
+        self.capacity = capacity
+
+    def close(self):
+        self.mmap.close()
+        self.file.close()
+
+    def load(self, key):
+        """Return the record of a chunk, or None if it was never stored."""
+        slot = self.slots.get(key)
+        if slot is None:
+            return None
+        start = slot * self.record_size
+        return self.mmap[start:start + self.record_size]
+
+    def store(self, key, record):
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= self.capacity:
+                self._grow(self.capacity * 2)
+            self.slots[key] = slot
+        start = slot * self.record_size
+        self.mmap[start:start + self.record_size] = record
+
+
+class ChunkedWorld:
+    """An unbounded map made of chunks generated on demand.
+
+    Each chunk is a CompactGridMap generated deterministically from the
+    world's seed and the chunk's coordinates, so the same seed always
+    creates the same world no matter the order chunks are visited in.
+    The paths crossing each border between two chunks are chosen from
+    the seed and the border itself, so both chunks always agree on them.
+
+    Only the most recently used chunks are kept in memory. When more than
+    `max_chunks` are loaded, the least recently used chunk is evicted.
+    If a spill file is given, evicted chunks are written to it and loaded
+    back from it, preserving changes made after generation; otherwise
+    they are generated again. Objects cannot be written to the spill file,
+    so the objects of an evicted chunk are set aside in `evicted_objects`
+    and put back when the chunk is loaded again. Cells of evicted chunks
+    are stale and should not be kept.
+
+    Coordinates are global and may be negative.
+
+    Args:
+        seed (Union[int, str]): The seed of the world.
+        chunk_size (int): The height and width of each chunk in squares.
+        max_chunks (int): The number of chunks to keep in memory.
+        spill_path (Optional[str]): A file to spill evicted chunks to.
+        doors (int): The maximum number of paths across each border.
+        generator (Optional[Callable[[CompactGridMap, random.Random],
+                                     None]]):
+            A function filling an empty chunk with Cells and paths.
+            Defaults to `generate_maze_chunk`.
+
+    """
+
+    def __init__(self, seed, chunk_size=16, max_chunks=64,
+                 spill_path=None, doors=2, generator=None):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.doors = doors
+        self.generator = generate_maze_chunk if generator is None \
+            else generator
+        self.chunks = collections.OrderedDict()
+        self.evicted_objects = {}
+        self.spill = None
+        if spill_path is not None:
+            squares = chunk_size * chunk_size
+            self.spill = _ChunkSpill(spill_path,
+                                     squares + (squares + 7) // 8)
+
+    def close(self):
+        """Close the spill file if there is one."""
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def _rng(self, *key):
+        # Seeding with a string is deterministic between runs,
+        # unlike seeding with the hash of a tuple
+        return random.Random(':'.join(str(k) for k in (self.seed,) + key))
+
+    def locate(self, y, x):
+        """Return the chunk coordinates and local coordinates of a square."""
+        cy, ly = divmod(y, self.chunk_size)
+        cx, lx = divmod(x, self.chunk_size)
+        return cy, cx, ly, lx
+
+    def border_doors(self, cy, cx, side):
+        """Return the positions along a chunk's border crossed by paths.
+
+        Args:
+            cy
+            cx (int): The coordinates of the chunk.
+            side (str): 'N', 'E', 'S' or 'W'.
+
+        Returns:
+            List[int]: The local columns of northern and southern doors,
+                or the local rows of eastern and western doors.
+
+        """
+        # Each border is owned by the chunk north or west of it
+        if side == 'N':
+            cy, side = cy - 1, 'S'
+        elif side == 'W':
+            cx, side = cx - 1, 'E'
+        rng = self._rng('door', side, cy, cx)
+        count = rng.randint(1, self.doors)
+        return rng.sample(range(self.chunk_size), count)
+
+    def generate_chunk(self, cy, cx):
+        """Generate a chunk from the seed without caching it."""
+        size = self.chunk_size
+        chunk = CompactGridMap(size, size)
+        self.generator(chunk, self._rng('chunk', cy, cx))
+
+        # Add the paths leaving the chunk
+        last = size - 1
+        for side in CARDINALS[::2]:
+            for i in self.border_doors(cy, cx, side):
+                y, x = {'N': (0, i), 'E': (i, last),
+                        'S': (last, i), 'W': (i, 0)}[side]
+                chunk.add_path(y, x, side)
+
+        return chunk
+
+    def _load(self, cy, cx):
+        """Load a chunk from the spill file or generate it."""
+        record = None
+        if self.spill is not None:
+            record = self.spill.load((cy, cx))
+        if record is None:
+            chunk = self.generate_chunk(cy, cx)
+        else:
+            size = self.chunk_size
+            chunk = CompactGridMap(size, size)
+            squares = size * size
+            chunk.masks[:] = record[:squares]
+            chunk.exists[:] = record[squares:]
+
+        objects = self.evicted_objects.pop((cy, cx), None)
+        if objects is not None:
+            for (ly, lx), cell_objects in objects.items():
+                chunk.get_cell(ly, lx).objects.update(cell_objects)
+        return chunk
+
+    def _evict(self):
+        """Evict least recently used chunks until within max_chunks."""
+        while len(self.chunks) > self.max_chunks:
+            key, chunk = self.chunks.popitem(last=False)
+            if chunk.cells:
+                self.evicted_objects[key] = {
+                    position: dict(cell.objects)
+                    for position, cell in chunk.cells.items()
+                }
+            if self.spill is not None:
+                self.spill.store(key, bytes(chunk.masks + chunk.exists))
+
+    def get_chunk(self, cy, cx):
+        """Return a chunk, loading it if needed."""
+        key = (cy, cx)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        chunk = self._load(cy, cx)
+        self.chunks[key] = chunk
+        self._evict()
+        return chunk
+
+    def get_cell(self, y, x):
+        """Return the Cell of a square, or None if the square is empty."""
+        cy, cx, ly, lx = self.locate(y, x)
+        return self.get_chunk(cy, cx).get_cell(ly, lx)
+
+    def get_mask(self, y, x):
+        """Return the path mask of a square, or None if it is not a Cell."""
+        cy, cx, ly, lx = self.locate(y, x)
+        return self.get_chunk(cy, cx).get_mask(ly, lx)
+
+    def get_mask_row(self, y, start, stop):
+        """Return the path masks of the squares in a row from start to stop."""
+        size = self.chunk_size
+        cy, ly = divmod(y, size)
+        row = []
+        x = start
+        while x < stop:
+            cx, lx = divmod(x, size)
+            lstop = min(size, lx + stop - x)
+            row.extend(self.get_chunk(cy, cx).get_mask_row(ly, lx, lstop))
+            x += lstop - lx
+        return row
+
+    def get_neighbours(self, y, x):
+        """Return the coordinates that a Cell has paths to."""
+        mask = self.get_mask(y, x)
+        if mask is None:
+            return []
+        return [(y + vy, x + vx) for vy, vx in MASK_VECTORS[mask]]
+
+    def connect_cell(self, y, x, path):
+        """Connect two Cells with a path, even across chunks.
+
+        `path` must be a cardinal direction.
+
+        """
+        vy, vx = cardinal_to_vector(path)
+        end_y, end_x = y + vy, x + vx
+        if self.get_mask(y, x) is None or self.get_mask(end_y, end_x) is None:
+            raise ValueError(f'cannot connect {y}, {x} and {end_y}, {end_x}')
+
+        for (py, px), p in (((y, x), path),
+                            ((end_y, end_x), reverse_cardinal(path))):
+            cy, cx, ly, lx = self.locate(py, px)
+            self.get_chunk(cy, cx).add_path(ly, lx, p)
+
+    def render_viewport(self, y, x, height, width, markers=None,
+                        compact=False):
+        """Render a window of the world centred on a square, line by line.
+
+        See `GridMap.render_viewport`. Only the chunks overlapping
+        the window are loaded.
+
+        """
+        if markers is None:
+            markers = {}
+        y_start, x_start = y - height // 2, x - width // 2
+        return _render_window(
+            self.get_mask_row, y_start, y_start + height,
+            x_start, x_start + width, markers, compact)
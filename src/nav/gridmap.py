@@ -1,4 +1,50 @@
+import array
+import json
+import mmap
 import random
+import struct
+
+# Cardinal directions in clockwise order, each represented by one bit
+# of a square's path mask
+CARDINALS = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+PATH_N, PATH_NE, PATH_E, PATH_SE, PATH_S, PATH_SW, PATH_W, PATH_NW = (
+    1 << i for i in range(8))
+
+# Precomputed lookup tables for converting between directions
+_CARDINAL_VECTORS = {
+    'N': (-1, 0), 'NE': (-1, 1), 'E': (0, 1), 'SE': (1, 1),
+    'S': (1, 0), 'SW': (1, -1), 'W': (0, -1), 'NW': (-1, -1)
+}
+for _c, _v in list(_CARDINAL_VECTORS.items()):
+    # Include the commutative and lowercase spellings
+    for _spelling in {_c, _c[::-1]}:
+        _CARDINAL_VECTORS[_spelling] = _v
+        _CARDINAL_VECTORS[_spelling.lower()] = _v
+_VECTOR_CARDINALS = {v: c for c, v in _CARDINAL_VECTORS.items()
+                     if c in CARDINALS}
+_VECTOR_CARDINALS[0, 0] = ''
+CARDINAL_BITS = {c: 1 << CARDINALS.index(_VECTOR_CARDINALS[v])
+                 for c, v in _CARDINAL_VECTORS.items()}
+BIT_VECTORS = tuple((1 << i, _CARDINAL_VECTORS[c])
+                    for i, c in enumerate(CARDINALS))
+# The opposite bit of each bit, e.g. PATH_N -> PATH_S
+REVERSE_BITS = {1 << i: 1 << (i + 4) % 8 for i in range(8)}
+# The cardinals and vectors of every possible path mask
+MASK_CARDINALS = tuple(
+    tuple(c for i, c in enumerate(CARDINALS) if mask & 1 << i)
+    for mask in range(256)
+)
+MASK_VECTORS = tuple(
+    tuple(_CARDINAL_VECTORS[c] for c in cardinals)
+    for cardinals in MASK_CARDINALS
+)
+del _c, _v, _spelling
+
+# The header of maps saved with GridMap.to_binary: a magic number,
+# the format version, and the height and width of the map
+BINARY_MAGIC = b'DTGM'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHxxII')
 
 
 class Cell:
@@ -41,54 +87,34 @@ class Cell:
             copy (bool): If True, does not delete key from self.
 
         """
-        if key in self.objects:
-            # Get other cell
-            other = self.parent_map[other_y][other_x]
-
-            if isinstance(other, Cell):
-                if key not in other.objects:
-                    # Transfer object
-                    obj = self.objects[key]
-                    if not copy:
-                        del self.objects[key]
-                    other.objects[key] = obj
-                else:
-                    raise KeyError(
-                        f'{key!r} already exists in {other_y}, {other_x}')
-            else:
-                raise IndexError(f'{other_y}, {other_x} is not a Cell')
-        else:
-            raise KeyError(f'{key!r} does not exist in {self.y}, {self.x}')
+        try:
+            obj = self.objects[key]
+        except KeyError:
+            raise KeyError(
+                f'{key!r} does not exist in {self.y}, {self.x}') from None
+
+        # Get the other cell's objects; squares without a Cell have none
+        try:
+            other_objects = self.parent_map[other_y][other_x].objects
+        except AttributeError:
+            raise IndexError(f'{other_y}, {other_x} is not a Cell') from None
+        if key in other_objects:
+            raise KeyError(f'{key!r} already exists in {other_y}, {other_x}')
+
+        # Transfer object
+        if not copy:
+            del self.objects[key]
+        other_objects[key] = obj
+        self.parent_map.object_moved(
+            key, self.y, self.x, other_y, other_x, copy)
 
     def move_object_direction(self, key, direction, *, copy=False):
         """Move an object to another cell referred by a vector or cardinal."""
-        # Copy code from `move_object` to avoid double-checking
-        # the key and cell
-        if key in self.objects:
-            # Calculate other coordinates
-            if isinstance(direction, str):
-                vy, vx = cardinal_to_vector(direction)
-            else:
-                vy, vx = direction
-            other_y, other_x = self.y + vy, self.x + vx
-
-            # Get other cell
-            other = self.parent_map[other_y][other_x]
-
-            if isinstance(other, Cell):
-                if key not in other.objects:
-                    # Transfer object
-                    obj = self.objects[key]
-                    if not copy:
-                        del self.objects[key]
-                    other.objects[key] = obj
-                else:
-                    raise KeyError(
-                        f'{key!r} already exists in {other_y}, {other_x}')
-            else:
-                raise IndexError(f'{other_y}, {other_x} is not a Cell')
+        if isinstance(direction, str):
+            vy, vx = cardinal_to_vector(direction)
         else:
-            raise KeyError(f'{key!r} does not exist in {self.y}, {self.x}')
+            vy, vx = direction
+        self.move_object(key, self.y + vy, self.x + vx, copy=copy)
 
     def sync_paths(self, sync_broken_neighbours=False):
         """Create corresponding paths to cells connected to this cell.
@@ -132,6 +158,9 @@ class Cell:
                         else:
                             # Neighbour missing path
                             neighbour.paths.append(connected_path_other)
+                            self.parent_map.path_added(
+                                neighbour.y, neighbour.x,
+                                connected_path_other)
                             if sync_broken_neighbours:
                                 # Sync neighbour's paths as well
                                 neighbour.sync_paths(
@@ -139,13 +168,56 @@ class Cell:
                     elif neighbour_connected:
                         # Self missing path
                         self.paths.append(connected_path_self)
+                        self.parent_map.path_added(
+                            self.y, self.x, connected_path_self)
+
+
+class GridMapListener:
+    """The base class of the objects in `GridMap.listeners`.
+
+    Every method does nothing, so subclasses only override
+    the changes they need to know about.
+
+    """
+
+    def square_changed(self, y, x):
+        """Called after a Cell or its paths changed."""
+
+    def object_moved(self, key, y, x, other_y, other_x, copy):
+        """Called after an object was moved or copied to another Cell."""
+
+    def object_placed(self, key, y, x):
+        """Called after `GridMap.place_object` placed an object."""
+
+    def object_removed(self, key, y, x):
+        """Called after `GridMap.remove_object` removed an object."""
 
 
 class GridMap:
-    """A 2D map."""
+    """A 2D map.
+
+    Attributes:
+        version (int): A counter incremented every time a cell or path
+            is added through the map's methods. Caches built from the map
+            can compare against it to know when they are outdated.
+        listeners (List[GridMapListener]): Objects notified of changes
+            to the map, such as GridMapRenderer and ObjectIndex.
+        navmesh (Optional[NavMesh]): The cached navigation graph returned
+            by `get_navmesh`. It is patched as cells and paths are added.
+            If cells or paths are modified directly, call
+            `invalidate_navmesh` to discard it.
+        components (Optional[ConnectedComponents]): The cached connected
+            components returned by `get_components`, kept up to date
+            the same way as `navmesh`.
+
+    """
 
     def __init__(self, y_size, x_size):
         self.grid = [[None] * x_size for _ in range(y_size)]
+        self.version = 0
+        self.navmesh = None
+        self.components = None
+        self.listeners = []
 
     def __getitem__(self, index):
         return self.grid[index]
@@ -171,23 +243,279 @@ class GridMap:
         end_y, end_x = y + vy, x + vx
         if self.verify_path(y, x, cardinal):
             # Valid path; connect both
-            start = self[y][x]
-            end = self[end_y][end_x]
-            cardinal_reverse = reverse_cardinal(cardinal)
-            if cardinal not in start.paths:
-                start.paths.append(cardinal)
-            if cardinal_reverse not in end.paths:
-                end.paths.append(cardinal_reverse)
+            self.add_path(y, x, cardinal)
+            self.add_path(end_y, end_x, reverse_cardinal(cardinal))
         else:
             raise ValueError('cannot connect {y}, {x} and {end_y}, {end_x}')
 
+    def add_path(self, y, x, path):
+        """Add a cardinal path to a Cell without connecting the other end.
+
+        Use `connect_cell` to connect both Cells.
+
+        """
+        cell = self[y][x]
+        if path not in cell.paths:
+            cell.paths.append(path)
+            self.path_added(y, x, path)
+
     def create_cell(self, y, x, *args, **kwargs):
         """Create a cell at a given position."""
         self[y][x] = Cell(self, y, x, *args, **kwargs)
+        self.cell_added(y, x)
+
+    def cell_added(self, y, x):
+        """Record that a cell was created at y, x.
+
+        Patches the cell into the cached navigation graph
+        and connected components.
+
+        """
+        self.version += 1
+        if self.navmesh is not None:
+            self.navmesh.set_node((y, x), self.get_neighbours(y, x))
+            self.navmesh.version = self.version
+        if self.components is not None:
+            self.components.add_cell(y, x)
+            for n_y, n_x in self.get_neighbours(y, x):
+                self.components.add_path(y, x, n_y, n_x)
+        self.square_changed(y, x)
 
     @classmethod
     def from_json(cls, file):
-        """Load a map from json."""
+        """Load a map from json written by `to_json`.
+
+        Args:
+            file: A text file to read from.
+
+        Returns:
+            GridMap
+
+        """
+        data = json.load(file)
+        y_size, x_size = data['size']
+        gridmap = cls(y_size, x_size)
+        for cell in data['cells']:
+            gridmap.create_cell(cell['y'], cell['x'],
+                                paths=cell.get('paths', []),
+                                objects=dict(cell.get('objects', {})))
+        return gridmap
+
+    def to_json(self, file, indent=None):
+        """Save the map as json.
+
+        The map is stored as its size and a list of Cells, each with
+        its coordinates, paths and objects, so it can be edited by hand.
+        Objects must be serializable to json.
+
+        Args:
+            file: A text file to write to.
+            indent (Optional[int]): The indentation passed to `json.dump`.
+
+        """
+        cells = []
+        for cell, y, x in self.get_all_squares(Cells_only=True):
+            data = {'y': y, 'x': x,
+                    'paths': list(MASK_CARDINALS[self.get_mask(y, x)])}
+            if cell.objects:
+                data['objects'] = dict(cell.objects)
+            cells.append(data)
+        json.dump({'size': [len(self), len(self[0])], 'cells': cells},
+                  file, indent=indent)
+
+    @classmethod
+    def from_binary(cls, path):
+        """Load a map saved by `to_binary`.
+
+        Args:
+            path (Union[str, os.PathLike]): The file to read from.
+
+        Returns:
+            GridMap
+
+        """
+        with open(path, 'rb') as f:
+            y_size, x_size = _read_binary_header(f.read(BINARY_HEADER.size))
+            size = y_size * x_size
+            masks = f.read(size)
+            exists = f.read((size + 7) // 8)
+            objects = _decode_objects(f.read())
+
+        gridmap = cls(y_size, x_size)
+        for index, mask in enumerate(masks):
+            if exists[index >> 3] & 1 << (index & 7):
+                y, x = divmod(index, x_size)
+                gridmap.create_cell(y, x, paths=MASK_CARDINALS[mask],
+                                    objects=objects.get((y, x)))
+        return gridmap
+
+    def to_binary(self, file):
+        """Save the map in a compact binary format.
+
+        The file starts with a header holding the size of the map,
+        followed by the path mask of every square, one bit per square
+        marking which squares are Cells, and finally a json table of
+        the objects in each Cell.
+
+        Args:
+            file: A binary file to write to.
+
+        """
+        y_size, x_size = len(self), len(self[0])
+        size = y_size * x_size
+        masks = bytearray(size)
+        exists = bytearray((size + 7) // 8)
+        for y in range(y_size):
+            offset = y * x_size
+            for x, mask in enumerate(self.get_mask_row(y), offset):
+                if mask is not None:
+                    masks[x] = mask
+                    exists[x >> 3] |= 1 << (x & 7)
+
+        objects = {(y, x): cell.objects for cell, y, x
+                   in self.get_all_squares(Cells_only=True) if cell.objects}
+        _write_binary(file, y_size, x_size, masks, exists, objects)
+
+    def get_mask(self, y, x):
+        """Return the path mask of a square, or None if it is not a Cell.
+
+        Each bit of the mask is one of the PATH_* directions.
+
+        """
+        cell = self.grid[y][x]
+        if not isinstance(cell, Cell):
+            return None
+        mask = 0
+        for p in cell.paths:
+            mask |= cardinal_to_bit(p)
+        return mask
+
+    def get_mask_row(self, y, start=0, stop=None):
+        """Return the path masks of the squares in a row.
+
+        Args:
+            y (int): The row to get.
+            start
+            stop (Optional[int]): The range of columns to get.
+                By default, the entire row is returned.
+
+        """
+        if stop is None:
+            stop = len(self.grid[y])
+        return [self.get_mask(y, x) for x in range(start, stop)]
+
+    def get_neighbours(self, y, x):
+        """Return the coordinates that a Cell has paths to."""
+        neighbours = []
+        for p in self[y][x].paths:
+            vy, vx = cardinal_to_vector(p)
+            neighbours.append((y + vy, x + vx))
+        return neighbours
+
+    def get_all_neighbours(self):
+        """Return an iterator of every Cell's coordinates along with
+        the coordinates it has paths to."""
+        for y, row in enumerate(self.grid):
+            for x, cell in enumerate(row):
+                if isinstance(cell, Cell):
+                    yield (y, x), self.get_neighbours(y, x)
+
+    def get_navmesh(self):
+        """Return the navigation graph of the map, building it if needed.
+
+        The graph is cached and kept up to date when cells and paths
+        are added, so repeated searches do not rebuild it.
+
+        """
+        navmesh = self.navmesh
+        if navmesh is None or navmesh.version != self.version:
+            # Imported here since pathfinding depends on this module
+            from .pathfinding import NavMesh
+            navmesh = NavMesh.from_gridmap(self)
+            navmesh.version = self.version
+            self.navmesh = navmesh
+        return navmesh
+
+    def get_components(self):
+        """Return the connected components of the map, labelling
+        them if needed.
+
+        Like the navigation graph, the labels are cached and patched
+        when cells and paths are added.
+
+        """
+        if self.components is None:
+            self.components = ConnectedComponents(self)
+        return self.components
+
+    def invalidate_navmesh(self):
+        """Discard the cached navigation graph and connected components."""
+        self.version += 1
+        self.navmesh = None
+        self.components = None
+
+    def path_added(self, y, x, path):
+        """Record that a path was added to the cell at y, x.
+
+        Called by the map and its cells whenever they append to a
+        cell's paths, patching the edge into the cached navigation graph
+        and connected components.
+
+        """
+        self.version += 1
+        if self.navmesh is not None or self.components is not None:
+            vy, vx = cardinal_to_vector(path)
+        if self.navmesh is not None:
+            self.navmesh.add_edge((y, x), (y + vy, x + vx))
+            self.navmesh.version = self.version
+        if self.components is not None:
+            self.components.add_path(y, x, y + vy, x + vx)
+        self.square_changed(y, x)
+
+    def object_moved(self, key, y, x, other_y, other_x, copy=False):
+        """Record that an object was moved between two Cells.
+
+        Called by `Cell.move_object` and `Cell.move_object_direction`.
+
+        """
+        # Negative coordinates index from the other end of the map
+        if other_y < 0:
+            other_y += len(self)
+        if other_x < 0:
+            other_x += len(self[0])
+        for listener in self.listeners:
+            listener.object_moved(key, y, x, other_y, other_x, copy)
+
+    def square_changed(self, y, x):
+        """Notify listeners that a Cell or its paths changed."""
+        for listener in self.listeners:
+            listener.square_changed(y, x)
+
+    def place_object(self, y, x, key, obj):
+        """Place an object inside a Cell and notify listeners.
+
+        Objects placed by assigning to `Cell.objects` directly are not
+        seen by listeners such as ObjectIndex.
+
+        """
+        cell = self[y][x]
+        if not isinstance(cell, Cell):
+            raise IndexError(f'{y}, {x} is not a Cell')
+        if key in cell.objects:
+            raise KeyError(f'{key!r} already exists in {y}, {x}')
+        cell.objects[key] = obj
+        for listener in self.listeners:
+            listener.object_placed(key, cell.y, cell.x)
+
+    def remove_object(self, y, x, key):
+        """Remove an object from a Cell, notify listeners and return it."""
+        cell = self[y][x]
+        if not isinstance(cell, Cell) or key not in cell.objects:
+            raise KeyError(f'{key!r} does not exist in {y}, {x}')
+        obj = cell.objects.pop(key)
+        for listener in self.listeners:
+            listener.object_removed(key, cell.y, cell.x)
+        return obj
 
     def get_all_squares(self, *, Cells_only=False):
         """Return an iterator of all squares in the map with their coordinates.
@@ -246,87 +574,29 @@ class GridMap:
 
         # Create render
         lines = []
+        masks_below = self.get_mask_row(0)
         # ry, rx = render y/x
         for ry in range(size_y):
             y_part = ry % 4
             y_grid = ry // 4
-            line = []
             if y_part == 0:
                 # Top
-                for cell in self[y_grid]:
-                    line.append('--- ' if isinstance(cell, Cell) else '    ')
+                masks = masks_below
+                if y_grid + 1 < y:
+                    masks_below = self.get_mask_row(y_grid + 1)
+                else:
+                    masks_below = None
+                line = _render_edge_line(masks)
             elif y_part == 1:
                 # Middle
-                for x_grid, cell in enumerate(self[y_grid]):
-                    if isinstance(cell, Cell):
-                        line.append('|')
-                        marker = markers.get((y_grid, x_grid), ' ')
-                        if len(marker) <= 1:
-                            line.append(marker)
-                        else:
-                            raise ValueError(
-                                f'marker {marker} for pos {y}, {x} '
-                                'must be a single char')
-                        if x_grid + 1 >= len(self[y_grid]):
-                            # Right of the map; no eastern paths
-                            line.append('|')
-                        else:
-                            cell_E = self[y_grid][x_grid + 1]
-                            if (
-                                    'E' in cell.paths
-                                    or isinstance(cell_E, Cell)
-                                    and 'W' in cell_E.paths
-                                    ):
-                                line.append('|-')
-                            else:
-                                line.append('| ')
-                    else:
-                        line.append('    ')
+                line = _render_middle_line(masks, markers, y_grid)
             elif y_part == 2:
                 # Bottom
-                for cell in self[y_grid]:
-                    line.append('--- ' if isinstance(cell, Cell) else '    ')
+                line = _render_edge_line(masks)
             elif y_part == 3:
                 # Bottom gap
-                # Check if not bottom of map
-                if y_grid + 1 < len(self):
-                    for x_grid, cell in enumerate(self[y_grid]):
-                        if isinstance(cell, Cell):
-                            # Southern path
-                            line.append(' | ' if 'S' in cell.paths else '   ')
-                            if x_grid + 1 >= len(self[y_grid]):
-                                # Right of the map; no diagonals
-                                line.append(' ')
-                                break
-                            else:
-                                # Southeastern paths
-                                # Consider paths of surrounding cells
-                                cell_S = self[y_grid + 1][x_grid]
-                                cell_SE = self[y_grid + 1][x_grid + 1]
-                                cell_E = self[y_grid][x_grid + 1]
-                                back_slash = (
-                                    'SE' in cell.paths
-                                    or isinstance(cell_SE, Cell)
-                                    and 'NW' in cell_SE.paths
-                                )
-                                forward_slash = (
-                                    isinstance(cell_S, Cell)
-                                    and 'NE' in cell_S.paths
-                                    or isinstance(cell_E, Cell)
-                                    and 'SW' in cell_E.paths
-                                )
-                                if forward_slash and back_slash:
-                                    line.append('X')
-                                elif forward_slash:
-                                    line.append('/')
-                                elif back_slash:
-                                    line.append('\\')
-                                else:
-                                    line.append(' ')
-                        else:
-                            line.append('    ')
+                line = _render_gap_line(masks, masks_below)
 
-            line = ''.join(line)
             lines.append(line)
 
         return '\n'.join(lines)
@@ -351,80 +621,65 @@ class GridMap:
 
         # Create render
         lines = []
+        masks_below = self.get_mask_row(0)
         # ry, rx = render y/x
         for ry in range(size_y):
             y_part = ry % 2
             y_grid = ry // 2
-            line = []
             if y_part == 0:
                 # Cell
-                for x_grid, cell in enumerate(self[y_grid]):
-                    if isinstance(cell, Cell):  # □▪▫
-                        marker = markers.get((y_grid, x_grid), '▫')
-                        if len(marker) <= 1:
-                            line.append(marker)
-                        else:
-                            raise ValueError(
-                                f'marker {marker} for pos {y}, {x} '
-                                'must be a single char')
-                        # Check for right path if not at edge of map
-                        if x_grid + 1 < len(self[y_grid]):
-                            cell_E = self[y_grid][x_grid + 1]
-                            if (
-                                    'E' in cell.paths
-                                    or isinstance(cell_E, Cell)
-                                    and 'W' in cell_E.paths
-                                    ):
-                                line.append('-')
-                            else:
-                                line.append(' ')
-                    else:
-                        line.append('  ')
+                masks = masks_below
+                if y_grid + 1 < y:
+                    masks_below = self.get_mask_row(y_grid + 1)
+                else:
+                    masks_below = None
+                line = _render_compact_cell_line(masks, markers, y_grid)
             elif y_part == 1:
                 # Bottom gap
-                # Check if not bottom of map
-                if y_grid + 1 < len(self):
-                    for x_grid, cell in enumerate(self[y_grid]):
-                        if isinstance(cell, Cell):
-                            # Southern path
-                            line.append('|' if 'S' in cell.paths else ' ')
-                            if x_grid + 1 >= len(self[y_grid]):
-                                # Right of the map; no diagonals
-                                line.append(' ')
-                                break
-                            else:
-                                # Southeastern paths
-                                # Consider paths of surrounding cells
-                                cell_S = self[y_grid + 1][x_grid]
-                                cell_SE = self[y_grid + 1][x_grid + 1]
-                                cell_E = self[y_grid][x_grid + 1]
-                                back_slash = (
-                                    'SE' in cell.paths
-                                    or isinstance(cell_SE, Cell)
-                                    and 'NW' in cell_SE.paths
-                                )
-                                forward_slash = (
-                                    isinstance(cell_S, Cell)
-                                    and 'NE' in cell_S.paths
-                                    or isinstance(cell_E, Cell)
-                                    and 'SW' in cell_E.paths
-                                )
-                                if forward_slash and back_slash:
-                                    line.append('X')
-                                elif forward_slash:
-                                    line.append('/')
-                                elif back_slash:
-                                    line.append('\\')
-                                else:
-                                    line.append(' ')
-                        else:
-                            line.append('  ')
+                line = _render_compact_gap_line(masks, masks_below)
 
-            line = ''.join(line)
             lines.append(line)
 
         return '\n'.join(lines)
 
+    def render_viewport(self, y, x, height, width, markers=None,
+                        compact=False):
+        """Render a window of the map centred on a square, line by line.
+
+        The window is moved inwards to stay inside the map, and shrunk
+        if the map is smaller than it. Each line is the same as the
+        corresponding part of a full render, so paths leaving the window
+        are still drawn on its edges. Only the squares inside the window
+        and one square to the right and below it are read, making the cost
+        independent of the size of the map.
+
+        Args:
+            y
+            x (int): The square to centre the window on.
+            height
+            width (int): The size of the window in squares. Each square
+                takes 4 lines by 4 characters, or 2 by 2 when compact.
+            markers (Optional[Dict[Tuple[int, int], str]]):
+                An optional list of markers to place on the grid.
+                The string must be one character.
+            compact (bool): Render in the style of `render_compact`.
+
+        Yields:
+            str
+
+        """
+        if markers is None:
+            markers = {}
+
+        size_y, size_x = len(self), len(self[0])
+        height, width = min(height, size_y), min(width, size_x)
+        y_start = min(max(y - height // 2, 0), size_y - height)
+        x_start = min(max(x - width // 2, 0), size_x - width)
+
+        return _render_window(
+            self.get_mask_row, y_start, y_start + height,
+            x_start, x_start + width, markers, compact, size_y, size_x)
+
     def verify_path(self, y, x, path, raise_out_of_bounds=True):
         """Check if a path connects two Cells."""
         if not isinstance(self[y][x], Cell):
@@ -442,6 +697,923 @@ class GridMap:
         return isinstance(other, Cell)
 
 
+class CompactCell(Cell):
+    """A view of a square inside a CompactGridMap.
+
+    The paths are read from the map's path mask and cannot be appended
+    to directly; use the map's `connect_cell` or `add_path` instead.
+
+    Views are created when a square is accessed, and only kept by the map
+    while the square holds objects. Avoid holding onto views of empty
+    squares, since objects added to them are not seen by other views
+    created in the meantime.
+
+    """
+
+    def __init__(self, parent_map, y, x):
+        self.y = y
+        self.x = x
+        self.parent_map = parent_map
+        self.objects = _CellObjects(self)
+
+    @property
+    def paths(self):
+        return list(MASK_CARDINALS[self.parent_map.get_mask(self.y, self.x)])
+
+    def sync_paths(self, sync_broken_neighbours=False):
+        """Paths in a CompactGridMap are always kept in sync."""
+
+
+class _CellObjects(dict):
+    """The objects of a CompactCell.
+
+    Registers the cell in its map once it holds an object,
+    and unregisters it once it becomes empty.
+
+    """
+
+    __slots__ = ('cell',)
+
+    def __init__(self, cell):
+        super().__init__()
+        self.cell = cell
+
+    def _sync(self):
+        cell = self.cell
+        cells = cell.parent_map.cells
+        if self:
+            cells[cell.y, cell.x] = cell
+        else:
+            cells.pop((cell.y, cell.x), None)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._sync()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._sync()
+
+    def clear(self):
+        super().clear()
+        self._sync()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._sync()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._sync()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._sync()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._sync()
+
+
+class _CompactRow:
+    """A row of a CompactGridMap, indexed like a row of GridMap.grid."""
+
+    __slots__ = ('parent_map', 'y')
+
+    def __init__(self, parent_map, y):
+        self.parent_map = parent_map
+        self.y = y
+
+    def __getitem__(self, x):
+        parent_map = self.parent_map
+        if x < 0:
+            x += parent_map.x_size
+        if not 0 <= x < parent_map.x_size:
+            raise IndexError('row index out of range')
+        return parent_map.get_cell(self.y, x)
+
+    def __iter__(self):
+        for x in range(self.parent_map.x_size):
+            yield self.parent_map.get_cell(self.y, x)
+
+    def __len__(self):
+        return self.parent_map.x_size
+
+
+class CompactGridMap(GridMap):
+    """A 2D map storing each square's paths as one byte.
+
+    Provides the same interface as GridMap, but instead of a grid of
+    Cells, the paths of every square are stored as a bitmask of PATH_*
+    directions in a bytearray, along with one bit per square marking
+    which squares are Cells. Cell objects are only kept for squares
+    holding objects, in the `cells` dictionary; other squares return
+    a new CompactCell view when accessed.
+
+    A 1000 by 1000 map takes about 1.1 MB.
+
+    Args:
+        y_size
+        x_size (int): The size of the map.
+        masks
+        exists (Optional[Buffer]): Writable buffers to store the path
+            masks and Cell bits in, such as a memory map.
+            By default, new bytearrays are created.
+
+    """
+
+    def __init__(self, y_size, x_size, *, masks=None, exists=None):
+        self.y_size = y_size
+        self.x_size = x_size
+        self.masks = bytearray(y_size * x_size) if masks is None else masks
+        self.exists = (bytearray((y_size * x_size + 7) // 8)
+                       if exists is None else exists)
+        self.cells = {}
+        self.version = 0
+        self.navmesh = None
+        self.components = None
+        self.listeners = []
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.y_size
+        if not 0 <= index < self.y_size:
+            raise IndexError('map index out of range')
+        return _CompactRow(self, index)
+
+    def __len__(self):
+        return self.y_size
+
+    @property
+    def grid(self):
+        """A list of rows that can be indexed like GridMap.grid."""
+        return [self[y] for y in range(self.y_size)]
+
+    @classmethod
+    def from_gridmap(cls, gridmap):
+        """Create a CompactGridMap with the same Cells as a GridMap."""
+        compact = cls(len(gridmap), len(gridmap[0]))
+        for cell, y, x in gridmap.get_all_squares(Cells_only=True):
+            compact.create_cell(y, x, paths=cell.paths,
+                                objects=dict(cell.objects))
+        return compact
+
+    @classmethod
+    def from_binary(cls, path):
+        """Load a map saved by `to_binary` through a memory map.
+
+        Only the object table is read; the path masks stay in the file
+        and are paged in as they are accessed, so large maps open
+        instantly and their pages are shared between processes.
+        The map is mapped copy-on-write, so changes to it are
+        not written back to the file.
+
+        Args:
+            path (Union[str, os.PathLike]): The file to read from.
+
+        Returns:
+            CompactGridMap
+
+        """
+        with open(path, 'rb') as f:
+            y_size, x_size = _read_binary_header(f.read(BINARY_HEADER.size))
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        size = y_size * x_size
+        masks_start = BINARY_HEADER.size
+        exists_start = masks_start + size
+        objects_start = exists_start + (size + 7) // 8
+        if len(data) < objects_start:
+            raise ValueError('binary map is truncated')
+
+        view = memoryview(data)
+        compact = cls(y_size, x_size,
+                      masks=view[masks_start:exists_start],
+                      exists=view[exists_start:objects_start])
+        for (y, x), objects in _decode_objects(data[objects_start:]).items():
+            CompactCell(compact, y, x).objects.update(objects)
+        return compact
+
+    def to_binary(self, file):
+        _write_binary(file, self.y_size, self.x_size,
+                      self.masks, self.exists,
+                      {key: cell.objects for key, cell in self.cells.items()})
+
+    def _in_bounds(self, y, x):
+        return 0 <= y < self.y_size and 0 <= x < self.x_size
+
+    def has_cell(self, y, x):
+        """Return True if the square at y, x is a Cell."""
+        index = y * self.x_size + x
+        return bool(self.exists[index >> 3] & 1 << (index & 7))
+
+    def get_cell(self, y, x):
+        """Return the Cell at y, x, or None if the square is empty."""
+        cell = self.cells.get((y, x))
+        if cell is not None:
+            return cell
+        if self.has_cell(y, x):
+            return CompactCell(self, y, x)
+        return None
+
+    def get_mask(self, y, x):
+        if not self.has_cell(y, x):
+            return None
+        return self.masks[y * self.x_size + x]
+
+    def get_mask_row(self, y, start=0, stop=None):
+        if stop is None:
+            stop = self.x_size
+        offset = y * self.x_size
+        masks = self.masks[offset + start:offset + stop]
+        exists = self.exists
+        row = []
+        for x, mask in enumerate(masks, offset + start):
+            row.append(mask if exists[x >> 3] & 1 << (x & 7) else None)
+        return row
+
+    def get_neighbours(self, y, x):
+        return [(y + vy, x + vx)
+                for vy, vx in MASK_VECTORS[self.masks[y * self.x_size + x]]]
+
+    def get_all_neighbours(self):
+        x_size = self.x_size
+        masks = self.masks
+        for i, byte in enumerate(self.exists):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & 1 << bit:
+                    index = i * 8 + bit
+                    y, x = divmod(index, x_size)
+                    yield (y, x), [(y + vy, x + vx)
+                                   for vy, vx in MASK_VECTORS[masks[index]]]
+
+    def add_path(self, y, x, path):
+        bit = cardinal_to_bit(path)
+        index = y * self.x_size + x
+        if not self.masks[index] & bit:
+            self.masks[index] |= bit
+            self.path_added(y, x, path)
+
+    def create_cell(self, y, x, *, paths=None, objects=None):
+        """Create a cell at a given position.
+
+        Like Cell.sync_paths, paths are connected on both ends
+        with neighbouring Cells.
+
+        """
+        if y < 0:
+            y += self.y_size
+        if x < 0:
+            x += self.x_size
+        if not self._in_bounds(y, x):
+            raise IndexError('map index out of range')
+
+        mask = 0
+        if paths is not None:
+            for p in paths:
+                mask |= cardinal_to_bit(p)
+
+        index = y * self.x_size + x
+        self.exists[index >> 3] |= 1 << (index & 7)
+        self.masks[index] = mask
+        self.cells.pop((y, x), None)
+
+        # Sync paths with neighbouring cells
+        for bit, (vy, vx) in BIT_VECTORS:
+            ny, nx = y + vy, x + vx
+            if not self._in_bounds(ny, nx) or not self.has_cell(ny, nx):
+                continue
+            reverse = REVERSE_BITS[bit]
+            n_index = ny * self.x_size + nx
+            if mask & bit:
+                if not self.masks[n_index] & reverse:
+                    # Neighbour missing path
+                    self.masks[n_index] |= reverse
+                    self.path_added(ny, nx, vector_to_cardinal(-vy, -vx))
+            elif self.masks[n_index] & reverse:
+                # Self missing path
+                mask |= bit
+        self.masks[index] = mask
+
+        if objects:
+            CompactCell(self, y, x).objects.update(objects)
+
+        self.cell_added(y, x)
+
+    def verify_path(self, y, x, path, raise_out_of_bounds=True):
+        """Check if a path connects two Cells."""
+        if not self._in_bounds(y, x) or not self.has_cell(y, x):
+            return False
+
+        vy, vx = cardinal_to_vector(path)
+
+        if not self._in_bounds(y + vy, x + vx):
+            if raise_out_of_bounds:
+                raise ValueError(f'path {path!r} not valid for pos {y}, {x}')
+            else:
+                return False
+        return self.has_cell(y + vy, x + vx)
+
+
+class ConnectedComponents:
+    """Label the groups of Cells connected to each other by paths.
+
+    A union-find over every square of the map, where Cells joined by
+    a path in either direction share a component. Checking whether two
+    Cells are connected takes almost constant time, and the labels are
+    patched as cells and paths are added.
+
+    Paths can be one way, so Cells in one component are not always
+    reachable from each other, but Cells in different components
+    never are. Cells and paths are never removed from a component,
+    so call `GridMap.invalidate_navmesh` after replacing Cells.
+
+    Args:
+        gridmap (GridMap): The map to label.
+
+    """
+
+    NOT_A_CELL = -1
+
+    def __init__(self, gridmap):
+        self.y_size = len(gridmap)
+        self.x_size = len(gridmap[0])
+        size = self.y_size * self.x_size
+        self.parents = array.array('i', [self.NOT_A_CELL]) * size
+        self.sizes = array.array('i', [0]) * size
+
+        squares = list(gridmap.get_all_neighbours())
+        for (y, x), _ in squares:
+            self.add_cell(y, x)
+        for (y, x), neighbours in squares:
+            for n_y, n_x in neighbours:
+                self.add_path(y, x, n_y, n_x)
+
+    def _index(self, y, x):
+        if not (0 <= y < self.y_size and 0 <= x < self.x_size):
+            return None
+        index = y * self.x_size + x
+        if self.parents[index] == self.NOT_A_CELL:
+            return None
+        return index
+
+    def _find(self, index):
+        parents = self.parents
+        while parents[index] != index:
+            # Path halving
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    def add_cell(self, y, x):
+        """Give a new Cell its own component."""
+        # Negative coordinates index from the other end of the map
+        if y < 0:
+            y += self.y_size
+        if x < 0:
+            x += self.x_size
+        index = y * self.x_size + x
+        if self.parents[index] == self.NOT_A_CELL:
+            self.parents[index] = index
+            self.sizes[index] = 1
+
+    def add_path(self, y, x, other_y, other_x):
+        """Join the components of two Cells connected by a path.
+
+        Nothing happens if either square is not a Cell.
+
+        """
+        a, b = self._index(y, x), self._index(other_y, other_x)
+        if a is None or b is None:
+            return
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        # Union by size
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+        self.parents[b] = a
+        self.sizes[a] += self.sizes[b]
+
+    def component(self, y, x):
+        """Return the label of a Cell's component, or None if the
+        square is not a Cell."""
+        index = self._index(y, x)
+        if index is None:
+            return None
+        return self._find(index)
+
+    def connected(self, a, b):
+        """Return True if two Cells are in the same component.
+
+        Args:
+            a
+            b (Tuple[int, int]): The coordinates of the Cells.
+
+        """
+        label = self.component(*a)
+        return label is not None and label == self.component(*b)
+
+    def regions(self):
+        """Return the coordinates of the Cells in each component,
+        largest first."""
+        regions = {}
+        for index, parent in enumerate(self.parents):
+            if parent != self.NOT_A_CELL:
+                regions.setdefault(self._find(index), []).append(
+                    divmod(index, self.x_size))
+        return sorted(regions.values(), key=len, reverse=True)
+
+
+class GridMapRenderer(GridMapListener):
+    """Render a GridMap incrementally.
+
+    The rendered lines of each row of the map are cached, and only rows
+    touched by new cells, paths, moved objects or marker changes
+    are rendered again.
+
+    The renderer listens to its map until `close` is called.
+
+    Args:
+        gridmap (GridMap): The map to render.
+        compact (bool): Render in the style of `GridMap.render_compact`.
+        markers (Optional[Dict[Tuple[int, int], str]]):
+            Markers to place on the grid. Use `set_marker` and
+            `remove_marker` to change them afterwards.
+        object_markers (Optional[Dict[str, str]]):
+            Markers to place on Cells holding objects with the given keys.
+            The markers follow objects moved with `Cell.move_object`
+            and `Cell.move_object_direction`.
+
+    """
+
+    def __init__(self, gridmap, compact=False, markers=None,
+                 object_markers=None):
+        self.gridmap = gridmap
+        self.compact = compact
+        self.markers = {} if markers is None else dict(markers)
+        self.object_markers = ({} if object_markers is None
+                               else dict(object_markers))
+        self.rows = [None] * len(gridmap)
+        self.dirty = set(range(len(gridmap)))
+
+        if self.object_markers:
+            for cell, y, x in gridmap.get_all_squares(Cells_only=True):
+                for key in cell.objects:
+                    marker = self.object_markers.get(key)
+                    if marker is not None:
+                        self.markers[y, x] = marker
+
+        gridmap.listeners.append(self)
+
+    def close(self):
+        """Stop listening to changes in the map."""
+        self.gridmap.listeners.remove(self)
+
+    def mark_dirty(self, y):
+        """Mark a row of the map to be rendered again."""
+        if y < 0:
+            y += len(self.rows)
+        self.dirty.add(y)
+
+    def set_marker(self, y, x, marker):
+        """Place a single character marker on a square."""
+        _check_marker(marker, y, x)
+        if self.markers.get((y, x)) != marker:
+            self.markers[y, x] = marker
+            self.mark_dirty(y)
+
+    def remove_marker(self, y, x):
+        """Remove the marker on a square if there is one."""
+        if self.markers.pop((y, x), None) is not None:
+            self.mark_dirty(y)
+
+    def square_changed(self, y, x):
+        self.mark_dirty(y)
+        # The row above draws the southern and diagonal paths into this row
+        if y != 0 and y != -len(self.rows):
+            self.mark_dirty(y - 1)
+
+    def object_moved(self, key, y, x, other_y, other_x, copy):
+        marker = self.object_markers.get(key)
+        if marker is None:
+            return
+        if not copy and self.markers.get((y, x)) == marker:
+            self.remove_marker(y, x)
+        self.set_marker(other_y, other_x, marker)
+
+    def object_placed(self, key, y, x):
+        marker = self.object_markers.get(key)
+        if marker is not None:
+            self.set_marker(y, x, marker)
+
+    def object_removed(self, key, y, x):
+        marker = self.object_markers.get(key)
+        if marker is not None and self.markers.get((y, x)) == marker:
+            self.remove_marker(y, x)
+
+    def update(self):
+        """Render every dirty row.
+
+        Returns:
+            List[int]: The rows of the map that were rendered.
+
+        """
+        rendered = sorted(self.dirty)
+        self.dirty.clear()
+        last = len(self.rows) - 1
+        get_mask_row = self.gridmap.get_mask_row
+
+        masks_below = None
+        for y in rendered:
+            if masks_below is not None and masks_below_y == y:
+                masks = masks_below
+            else:
+                masks = get_mask_row(y)
+            if y < last:
+                masks_below = get_mask_row(y + 1)
+                masks_below_y = y + 1
+            else:
+                masks_below = None
+
+            if self.compact:
+                lines = [_render_compact_cell_line(masks, self.markers, y)]
+                if masks_below is not None:
+                    lines.append(
+                        _render_compact_gap_line(masks, masks_below))
+            else:
+                edge = _render_edge_line(masks)
+                lines = [edge, _render_middle_line(masks, self.markers, y),
+                         edge]
+                if masks_below is not None:
+                    lines.append(_render_gap_line(masks, masks_below))
+            self.rows[y] = lines
+
+        return rendered
+
+    def lines(self):
+        """Return every rendered line, rendering dirty rows first."""
+        self.update()
+        return [line for row in self.rows for line in row]
+
+    def render(self):
+        """Return the rendered map as a string."""
+        return '\n'.join(self.lines())
+
+
+class ObjectIndex(GridMapListener):
+    """Track where every object in a GridMap is.
+
+    Finding an object's Cell takes constant time, and objects near
+    a square are found by only checking the buckets of squares around
+    it instead of the whole map.
+
+    The index listens to its map until `close` is called. It is kept up
+    to date by `Cell.move_object`, `Cell.move_object_direction`,
+    `GridMap.place_object`, `GridMap.remove_object` and `create_cell`.
+    Objects added to or removed from `Cell.objects` directly are
+    not seen until the square's Cell or paths change.
+
+    Args:
+        gridmap (GridMap): The map to index.
+        bucket_size (int): The height and width of the squares of the
+            map grouped into each bucket for range queries.
+
+    Attributes:
+        locations (Dict[str, Set[Tuple[int, int]]]):
+            The squares holding each key. Usually one square,
+            unless the object was copied.
+        types (Dict[type, Set[str]]): The keys of the objects of each type.
+
+    """
+
+    def __init__(self, gridmap, bucket_size=8):
+        self.gridmap = gridmap
+        self.bucket_size = bucket_size
+        self.locations = {}
+        self.types = {}
+        self.key_types = {}
+        self.buckets = {}
+
+        for cell, y, x in gridmap.get_all_squares(Cells_only=True):
+            for key in cell.objects:
+                self._add(key, y, x)
+
+        gridmap.listeners.append(self)
+
+    def close(self):
+        """Stop listening to changes in the map."""
+        self.gridmap.listeners.remove(self)
+
+    def __contains__(self, key):
+        return key in self.locations
+
+    def __len__(self):
+        return len(self.locations)
+
+    def _add(self, key, y, x):
+        locations = self.locations.get(key)
+        if locations is None:
+            obj = self.gridmap[y][x].objects[key]
+            self.locations[key] = locations = set()
+            self.key_types[key] = type(obj)
+            self.types.setdefault(type(obj), set()).add(key)
+        locations.add((y, x))
+
+        bucket = (y // self.bucket_size, x // self.bucket_size)
+        self.buckets.setdefault(bucket, set()).add((key, y, x))
+
+    def _remove(self, key, y, x):
+        locations = self.locations.get(key)
+        if locations is None or (y, x) not in locations:
+            return
+        locations.remove((y, x))
+        if not locations:
+            del self.locations[key]
+            obj_type = self.key_types.pop(key)
+            keys = self.types[obj_type]
+            keys.remove(key)
+            if not keys:
+                del self.types[obj_type]
+
+        bucket_key = (y // self.bucket_size, x // self.bucket_size)
+        bucket = self.buckets[bucket_key]
+        bucket.remove((key, y, x))
+        if not bucket:
+            del self.buckets[bucket_key]
+
+    def locate(self, key):
+        """Return the coordinates of the Cell holding an object,
+        or None if it is not on the map."""
+        locations = self.locations.get(key)
+        if not locations:
+            return None
+        return next(iter(locations))
+
+    def of_type(self, obj_type):
+        """Return the keys of every object of a given type."""
+        return set(self.types.get(obj_type, ()))
+
+    def within(self, y, x, radius):
+        """Return the objects within a number of steps of a square.
+
+        Steps are counted like `chebyshev_distance`, where diagonal
+        steps cost the same as cardinal steps, and ignore paths.
+
+        Returns:
+            List[Tuple[str, int, int]]: The key and coordinates of each
+                object, sorted by coordinates.
+
+        """
+        size = self.bucket_size
+        found = []
+        for by in range((y - radius) // size, (y + radius) // size + 1):
+            for bx in range((x - radius) // size, (x + radius) // size + 1):
+                for key, oy, ox in self.buckets.get((by, bx), ()):
+                    if abs(oy - y) <= radius and abs(ox - x) <= radius:
+                        found.append((key, oy, ox))
+        found.sort(key=lambda item: (item[1], item[2], item[0]))
+        return found
+
+    def square_changed(self, y, x):
+        # Cells replaced by create_cell may have lost or gained objects
+        cell = self.gridmap[y][x]
+        objects = cell.objects if isinstance(cell, Cell) else {}
+        bucket = self.buckets.get(
+            (y // self.bucket_size, x // self.bucket_size), ())
+        for key, oy, ox in list(bucket):
+            if oy == y and ox == x and key not in objects:
+                self._remove(key, y, x)
+        for key in objects:
+            if (y, x) not in self.locations.get(key, ()):
+                self._add(key, y, x)
+
+    def _move(self, key, y, x, other_y, other_x):
+        locations = self.locations.get(key)
+        if locations is None or (y, x) not in locations:
+            self._add(key, other_y, other_x)
+            return
+        # The key keeps its type, so only its square and bucket change
+        locations.remove((y, x))
+        locations.add((other_y, other_x))
+
+        size = self.bucket_size
+        old_key = (y // size, x // size)
+        new_key = (other_y // size, other_x // size)
+        bucket = self.buckets[old_key]
+        bucket.remove((key, y, x))
+        if new_key != old_key:
+            if not bucket:
+                del self.buckets[old_key]
+            bucket = self.buckets.setdefault(new_key, set())
+        bucket.add((key, other_y, other_x))
+
+    def object_moved(self, key, y, x, other_y, other_x, copy):
+        if copy:
+            self._add(key, other_y, other_x)
+        else:
+            self._move(key, y, x, other_y, other_x)
+
+    def object_placed(self, key, y, x):
+        self._add(key, y, x)
+
+    def object_removed(self, key, y, x):
+        self._remove(key, y, x)
+
+
+def _read_binary_header(header):
+    """Return the size of a map from the header of a binary map file."""
+    if len(header) < BINARY_HEADER.size:
+        raise ValueError('file is too short to be a binary map')
+    magic, version, y_size, x_size = BINARY_HEADER.unpack(header)
+    if magic != BINARY_MAGIC:
+        raise ValueError('file is not a binary map')
+    if version != BINARY_VERSION:
+        raise ValueError(f'unsupported binary map version {version}')
+    return y_size, x_size
+
+
+def _write_binary(file, y_size, x_size, masks, exists, objects):
+    """Write a binary map file. See `GridMap.to_binary`."""
+    file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION,
+                                  y_size, x_size))
+    file.write(masks)
+    file.write(exists)
+    table = [[y, x, dict(obj)] for (y, x), obj in sorted(objects.items())]
+    file.write(json.dumps(table).encode())
+
+
+def _decode_objects(data):
+    """Return the objects of each Cell from the table of a binary map."""
+    if not data:
+        return {}
+    return {(y, x): obj for y, x, obj in json.loads(data)}
+
+
+def _check_marker(marker, y, x):
+    if len(marker) > 1:
+        raise ValueError(
+            f'marker {marker} for pos {y}, {x} must be a single char')
+    return marker
+
+
+def _diagonals(masks, masks_below, x):
+    """Return the character drawn between a square and the squares
+    south, southeast and east of it."""
+    mask_S = masks_below[x] or 0
+    mask_SE = masks_below[x + 1] or 0
+    mask_E = masks[x + 1] or 0
+    back_slash = masks[x] & PATH_SE or mask_SE & PATH_NW
+    forward_slash = mask_S & PATH_NE or mask_E & PATH_SW
+    if forward_slash and back_slash:
+        return 'X'
+    elif forward_slash:
+        return '/'
+    elif back_slash:
+        return '\\'
+    return ' '
+
+
+def _render_edge_line(masks):
+    """Render the top or bottom border of a row of squares."""
+    return ''.join(['    ' if mask is None else '--- ' for mask in masks])
+
+
+def _render_middle_line(masks, markers, y, x_offset=0):
+    """Render the middle of a row of squares with their eastern paths.
+
+    `x_offset` is the column of the first mask, used to find markers.
+
+    """
+    line = []
+    last = len(masks) - 1
+    for x, mask in enumerate(masks):
+        if mask is None:
+            line.append('    ')
+            continue
+        line.append('|')
+        x_marker = x + x_offset
+        line.append(_check_marker(
+            markers.get((y, x_marker), ' '), y, x_marker))
+        if x >= last:
+            # Right of the map; no eastern paths
+            line.append('|')
+        elif mask & PATH_E or (masks[x + 1] or 0) & PATH_W:
+            line.append('|-')
+        else:
+            line.append('| ')
+    return ''.join(line)
+
+
+def _render_gap_line(masks, masks_below):
+    """Render the southern and diagonal paths below a row of squares."""
+    if masks_below is None:
+        # Bottom of the map
+        return ''
+    line = []
+    last = len(masks) - 1
+    for x, mask in enumerate(masks):
+        if mask is None:
+            line.append('    ')
+            continue
+        # Southern path
+        line.append(' | ' if mask & PATH_S else '   ')
+        if x >= last:
+            # Right of the map; no diagonals
+            line.append(' ')
+            break
+        line.append(_diagonals(masks, masks_below, x))
+    return ''.join(line)
+
+
+def _render_compact_cell_line(masks, markers, y, x_offset=0):
+    """Render a row of squares in compact style.
+
+    `x_offset` is the column of the first mask, used to find markers.
+
+    """
+    line = []
+    last = len(masks) - 1
+    for x, mask in enumerate(masks):
+        if mask is None:
+            line.append('  ')
+            continue
+        x_marker = x + x_offset
+        line.append(_check_marker(
+            markers.get((y, x_marker), '▫'), y, x_marker))
+        # Check for right path if not at edge of map
+        if x < last:
+            if mask & PATH_E or (masks[x + 1] or 0) & PATH_W:
+                line.append('-')
+            else:
+                line.append(' ')
+    return ''.join(line)
+
+
+def _render_compact_gap_line(masks, masks_below):
+    """Render the paths below a row of squares in compact style."""
+    if masks_below is None:
+        # Bottom of the map
+        return ''
+    line = []
+    last = len(masks) - 1
+    for x, mask in enumerate(masks):
+        if mask is None:
+            line.append('  ')
+            continue
+        # Southern path
+        line.append('|' if mask & PATH_S else ' ')
+        if x >= last:
+            # Right of the map; no diagonals
+            line.append(' ')
+            break
+        line.append(_diagonals(masks, masks_below, x))
+    return ''.join(line)
+
+
+def _render_window(get_mask_row, y_start, y_stop, x_start, x_stop,
+                   markers, compact, size_y=None, size_x=None):
+    """Yield the lines of a rectangle of squares.
+
+    Each line is the same as the corresponding part of a full render.
+    `size_y` and `size_x` are the size of the map, or None if unbounded.
+
+    """
+    # Include the column to the right for its western and
+    # diagonal paths, then cut it out of each line
+    x_read = x_stop + 1 if size_x is None else min(x_stop + 1, size_x)
+    line_size = (x_stop - x_start) * (2 if compact else 4)
+
+    masks_below = get_mask_row(y_start, x_start, x_read)
+    for y_grid in range(y_start, y_stop):
+        masks = masks_below
+        if size_y is None or y_grid + 1 < size_y:
+            masks_below = get_mask_row(y_grid + 1, x_start, x_read)
+        else:
+            masks_below = None
+
+        if compact:
+            lines = [_render_compact_cell_line(
+                masks, markers, y_grid, x_start)]
+            if masks_below is not None:
+                lines.append(_render_compact_gap_line(masks, masks_below))
+        else:
+            edge = _render_edge_line(masks)
+            lines = [edge,
+                     _render_middle_line(masks, markers, y_grid, x_start),
+                     edge]
+            if masks_below is not None:
+                lines.append(_render_gap_line(masks, masks_below))
+
+        for line in lines:
+            yield line[:line_size]
+
+
 def cardinal_to_vector(direction):
     """Return a vector for a given cardinal direction.
 
@@ -460,6 +1632,10 @@ def cardinal_to_vector(direction):
 
     """
     if isinstance(direction, str):
+        vector = _CARDINAL_VECTORS.get(direction)
+        if vector is not None:
+            return list(vector)
+        # Not a known spelling; parse it to find out what is wrong
         if 1 <= len(direction) <= 2:
             direction = direction.upper()
             vector = [0, 0]
@@ -496,18 +1672,40 @@ def cardinal_to_vector(direction):
         raise TypeError(f'expected type str, received {type(direction)}')
 
 
-def generate_spelunky_map(y_size, x_size, only_pathed_cells=False):
+def cardinal_to_bit(direction):
+    """Return the path mask bit for a given cardinal direction."""
+    bit = CARDINAL_BITS.get(direction)
+    if bit is None:
+        # Let cardinal_to_vector raise the appropriate error
+        vy, vx = cardinal_to_vector(direction)
+        bit = CARDINAL_BITS[_VECTOR_CARDINALS[vy, vx]]
+    return bit
+
+
+def generate_spelunky_map(y_size, x_size, only_pathed_cells=False,
+                          map_class=None, rng=None):
     """Create a GridMap with spelunky-style paths.
 
+    Args:
+        map_class (Optional[Type[GridMap]]): The class of map to create,
+            such as CompactGridMap. Defaults to GridMap.
+        rng (Optional[random.Random]): The random number generator to use,
+            allowing maps to be generated from a seed.
+            Defaults to the `random` module.
+
     Returns:
         Tuple[GridMap, Tuple[int, int], Tuple[int, int]]:
             The level along with the start and end coordinates.
 
     """
-    level = GridMap(y_size, x_size)
+    if map_class is None:
+        map_class = GridMap
+    if rng is None:
+        rng = random
+    level = map_class(y_size, x_size)
 
     # Select starting point on the top
-    x_start = random.randint(0, x_size - 1)
+    x_start = rng.randint(0, x_size - 1)
     # Starting coordinates
     y = 0
     x = x_start
@@ -535,12 +1733,12 @@ def generate_spelunky_map(y_size, x_size, only_pathed_cells=False):
         if cardinal == 'S':
             # Previous direction was south; no backtracking to deal with
             # because north is not an option
-            cardinal = random.choice(directions)
+            cardinal = rng.choice(directions)
             backtrack_cardinal = reverse_cardinal(cardinal)
         else:
             # Pick a random direction that doesn't go back on itself
             cardinals = list(directions)
-            random.shuffle(cardinals)
+            rng.shuffle(cardinals)
             for cardinal in cardinals:
                 if cardinal != backtrack_cardinal:
                     break
@@ -587,6 +1785,10 @@ def reverse_cardinal(direction):
 
 def vector_to_cardinal(y, x):
     """Return a cardinal direction for a given vector."""
+    cardinal = _VECTOR_CARDINALS.get((y, x))
+    if cardinal is not None:
+        return cardinal
+
     cardinal = []
     if not -1 <= y <= 1:
         raise ValueError(f'y ({y}) must be between -1 and 1')
@@ -633,11 +1835,12 @@ def main():
                     29, 118, markers={start: 'S', end: 'E'}))
             except RuntimeError:
                 print('Failed render: too big to fit in border')
+            regions = level.get_components().regions()
+            if len(regions) > 1:
+                print(f'{len(regions) - 1} region(s) cut off from the path')
             input()
 
     def moving_objects(y_size, x_size):
-        from math import inf as infinity
-
         # Create level and fill with cells
         level = GridMap(y_size, x_size)
         for _, y, x in level.get_all_squares():
@@ -649,17 +1852,7 @@ def main():
             return [int(n) for n in s.split(',')]
 
         def render():
-            markers = {}
-
-            # Find objects
-            for obj in letters:
-                for cell, y, x in level.get_all_squares(Cells_only=True):
-                    if obj in cell.objects:
-                        markers[y, x] = obj
-                        break
-
-            print(level.render_compact(
-                infinity, infinity, markers), end='\n\n')
+            print(renderer.render(), end='\n\n')
 
         # Create objects on corners of map
         y_size -= 1
@@ -669,6 +1862,12 @@ def main():
         level[y_size][0].objects[letters[2]] = True
         level[y_size][x_size].objects[letters[3]] = True
 
+        # Only rows with moved objects are rendered again
+        renderer = GridMapRenderer(
+            level, compact=True,
+            object_markers={obj: obj for obj in letters}
+        )
+
         print('Move objects on the map')
         print('Command examples:')
         print('move A 1,1')
@@ -1,5 +1,8 @@
+import array
 import collections
+import concurrent.futures
 import heapq
+import math
 
 from .gridmap import *
 
@@ -45,6 +48,7 @@ class NavMesh(collections.UserDict):
     """A graph structure.
 
     To access the real dictionary, use the "data" attribute.
+    Nodes can also be looked up by their key through the "nodes" attribute.
 
     Example Initialization:
     Graph(
@@ -59,47 +63,81 @@ class NavMesh(collections.UserDict):
     """
 
     def __init__(self, *nodes_and_keys):
+        # Maps each key to its node so lookups by key do not have to
+        # search through every node
+        self.nodes = {}
+        # Values derived from the whole graph, cleared on any change
+        self._derived = {}
+        # The GridMap version this graph was built from, if any
+        self.version = None
         super().__init__()
         for node, keys in nodes_and_keys:
-            self.data[node] = keys
+            self[node] = keys
 
     @classmethod
     def from_gridmap(cls, gridmap):
-        grid = gridmap.grid
-        nodes_and_keys = []
-
-        for y in range(len(grid)):
-            for x in range(len(grid[0])):
-                cell = grid[y][x]
-                if isinstance(cell, Cell):
-                    node = Node((y, x), 1)
-                    neighbours = []
-                    for p in cell.paths:
-                        # Convert each path into their referenced coordinates
-                        vy, vx = cardinal_to_vector(p)
-                        py, px = y + vy, x + vx
-                        neighbours.append((py, px))
-
-                    nodes_and_keys.append((node, neighbours))
-
-        return cls(*nodes_and_keys)
-
-    # def __contains__(self, key):
-    #     if isinstance(key, Node):
-    #         return key.key in {n.key for n in self}
-    #     return key in self.data
+        return cls(*[(Node(key, 1), neighbours)
+                     for key, neighbours in gridmap.get_all_neighbours()])
+
+    def __contains__(self, key):
+        if isinstance(key, Node):
+            return key in self.data
+        return key in self.nodes
 
     def __getitem__(self, key):
         if isinstance(key, Node):
             return self.data[key]
-        # Search through the nodes by their key
-        keys = [(k.key, v) for k, v in self.items()]
-        return keys[[name for name, _ in keys].index(key)][1]
+        return self.data[self.nodes[key]]
+
+    def __setitem__(self, node, keys):
+        # Replace any node with an equal key so both dicts stay in sync
+        old = self.nodes.get(node.key)
+        if old is not None:
+            del self.data[old]
+        self.nodes[node.key] = node
+        self.data[node] = keys
+        self._derived.clear()
+
+    def __delitem__(self, key):
+        if isinstance(key, Node):
+            key = key.key
+        node = self.nodes.pop(key)
+        del self.data[node]
+        self._derived.clear()
+
+    def add_edge(self, a, b):
+        """Connect the node with key `a` to the key `b`.
+
+        Nothing happens if `a` is not yet in the graph.
+
+        """
+        node = self.nodes.get(a)
+        if node is None:
+            return
+        keys = self.data[node]
+        if b not in keys:
+            keys.append(b)
+            self._derived.clear()
+
+    def set_node(self, key, keys, cost=1):
+        """Add or replace a node by its key along with its neighbours."""
+        self[Node(key, cost)] = keys
+
+    def min_cost(self):
+        """Return the smallest cost of a node, used to scale heuristics."""
+        cost = self._derived.get('min_cost')
+        if cost is None:
+            cost = min((node.cost for node in self.nodes.values()),
+                       default=0)
+            self._derived['min_cost'] = cost
+        return cost
 
     def get_node(self, key):
         """Find a node by using its key."""
-        keys = [(k.key, k) for k in self]
-        return keys[[name for name, _ in keys].index(key)][1]
+        try:
+            return self.nodes[key]
+        except KeyError:
+            raise ValueError(f'{key!r} is not in graph') from None
 
     def adjacent(self, x, y):
         """Return True if x is adjacent (connected) to y."""
@@ -113,7 +151,33 @@ class NavMesh(collections.UserDict):
 
     def neighbors(self, node):
         """Return all neighbours of a node."""
-        return [self.get_node(key) for key in self[node]]
+        return [self.nodes[key] for key in self[node]]
+
+    def neighbor_keys(self, key):
+        """Return the keys of all neighbours of a node or key."""
+        return self[key]
+
+    def reverse(self):
+        """Return a graph sharing the same nodes with every edge reversed.
+
+        The result is cached until this graph changes,
+        so it must not be modified.
+
+        """
+        reverse = self._derived.get('reverse')
+        if reverse is not None:
+            return reverse
+
+        incoming = {key: [] for key in self.nodes}
+        for node, keys in self.items():
+            for key in keys:
+                if key in incoming:
+                    incoming[key].append(node.key)
+
+        reverse = self.__class__(*[(node, incoming[node.key])
+                                   for node in self.nodes.values()])
+        self._derived['reverse'] = reverse
+        return reverse
 
     def vector_path(a, b):
         """Return the vector for two Nodes/keys."""
@@ -136,129 +200,1366 @@ class PriorityQueue:
     When the first values of two tuples are the same, it will attempt comparing
     the second set of values, and so on. This is why the internal _queue stores
     items as (priority, index, item): to first pick the lowest priority, then
-    the most recent index.
+    the oldest index.
+
+    Changing the priority of an item uses lazy deletion: the old entry
+    is marked as removed and left in the heap, and a new entry is pushed.
+    Removed entries are skipped when popping.
+    Items must be hashable.
 
     """
 
+    _REMOVED = object()
+
     def __init__(self):
         self._queue = []
+        self._entries = {}
         self._index = 0
 
     def __contains__(self, key):
-        for i in self._queue:
-            if i[-1] == key:
-                return True
-        return False
+        return key in self._entries
 
     def __len__(self):
-        return len(self._queue)
+        return len(self._entries)
 
     def __getitem__(self, key):
         return self._queue[key]
 
     def push(self, item, priority):
-        heapq.heappush(self._queue, [priority, self._index, item])
+        """Add an item, replacing its priority if already queued."""
+        old = self._entries.get(item)
+        if old is not None:
+            old[-1] = self._REMOVED
+        entry = [priority, self._index, item]
+        self._entries[item] = entry
+        heapq.heappush(self._queue, entry)
         self._index += 1
 
     def pop(self):
         """Return the smallest item."""
-        return heapq.heappop(self._queue)[-1]
+        while self._queue:
+            item = heapq.heappop(self._queue)[-1]
+            if item is not self._REMOVED:
+                del self._entries[item]
+                return item
+        raise IndexError('pop from an empty priority queue')
+
+    def peek_priority(self):
+        """Return the priority of the smallest item without removing it."""
+        # Discard removed entries sitting on top of the heap
+        while self._queue and self._queue[0][-1] is self._REMOVED:
+            heapq.heappop(self._queue)
+        if not self._queue:
+            raise IndexError('peek from an empty priority queue')
+        return self._queue[0][0]
+
+    def remove(self, item):
+        """Remove an item if it is queued."""
+        entry = self._entries.pop(item, None)
+        if entry is not None:
+            entry[-1] = self._REMOVED
 
     def empty(self):
         """Return True if the queue is empty."""
-        return len(self._queue) == 0
+        return not self._entries
 
     def getPriority(self, item):
         """Return the priority of an item."""
-        for i in self._queue:
-            if i[-1] == item:
-                return i[0]
-        else:
-            print(self._queue)
-            raise ValueError(f'{item!r} is not in queue')
+        try:
+            return self._entries[item][0]
+        except KeyError:
+            raise ValueError(f'{item!r} is not in queue') from None
 
     def setPriority(self, item, priority):
         """Change the priority of an item."""
-        for i in self._queue:
-            if i[-1] == item:
-                i[0] = priority
-                break
+        if item in self._entries:
+            self.push(item, priority)
+
+
+def chebyshev_distance(a, b):
+    """Return the number of 8-way steps between two coordinates.
+
+    This is the exact step count on a fully connected GridMap,
+    making it an admissible heuristic when every step costs the same.
+
+    """
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+
+def octile_distance(a, b, diagonal_cost=math.sqrt(2)):
+    """Return the octile distance between two coordinates.
+
+    NOTE: GridMap nodes cost the same no matter which direction they are
+        entered from, so this overestimates diagonal paths unless the
+        costs of diagonal steps are weighted by `diagonal_cost`.
+        Use `chebyshev_distance` for maps with uniform costs.
+
+    """
+    dy, dx = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dy, dx) + (diagonal_cost - 1) * min(dy, dx)
+
+
+def _path_from_predecessors(predecessors, key):
+    """Follow a predecessor table back to the start and return the path."""
+    path = [key]
+    while key in predecessors:
+        key = predecessors[key]
+        path.append(key)
+    path.reverse()
+    return path
+
+
+def _best_first_search(graph, source, target, heuristic,
+                       get_cost, stats, verbose):
+    """Search a NavMesh using uniform cost search or A*.
+
+    If `heuristic` is None, uniform cost search is used.
+
+    """
+    # Verbose printing
+    printV = lambda *args, **kwargs: print(*args, **kwargs) \
+                                     if verbose else None
+
+    # Make sure both keys exist in the graph
+    source = graph.get_node(source).key
+    target = graph.get_node(target).key
+    nodes = graph.nodes
+
+    if heuristic is None:
+        estimate = lambda key: 0
+    else:
+        scale = graph.min_cost()
+        estimate = lambda key: heuristic(key, target) * scale
+
+    costs = {source: nodes[source].cost}
+    predecessors = {}
+    explored = set()
+    frontier = PriorityQueue()
+    # Start search with source node
+    frontier.push(source, 0)
+
+    while not frontier.empty():
+        # Pick the shortest path to analyze
+        key = frontier.pop()
+        cost = costs[key]
+
+        if key == target:
+            if stats is not None:
+                stats['expanded'] = len(explored)
+            if get_cost:
+                return cost
+            return _path_from_predecessors(predecessors, key)
+        # Take note of node as explored as to not search through it again
+        explored.add(key)
+
+        for n in graph.neighbor_keys(key):
+            printV(n)
+            # Paths can lead to squares that are not Cells
+            if n in explored or n not in nodes:
+                continue
+            # Push neighbours with cumulative costs, or replace their
+            # stored cost if a lower cost has been discovered
+            n_cost = cost + nodes[n].cost
+            if n_cost < costs.get(n, n_cost + 1):
+                printV(key, cost, n, n_cost)
+                costs[n] = n_cost
+                predecessors[n] = key
+                frontier.push(n, n_cost + estimate(n))
+
+    # If frontier is empty, no path could be found
+    if stats is not None:
+        stats['expanded'] = len(explored)
+    return False
+
+
+def _unreachable(gridmap, graph, source, target, stats):
+    """Return True if the target is in another connected component
+    than the source, so no search is needed."""
+    # Make sure both keys exist in the graph
+    graph.get_node(source)
+    graph.get_node(target)
+    if gridmap.get_components().connected(source, target):
+        return False
+    if stats is not None:
+        stats['expanded'] = 0
+    return True
 
 
 def uniform_cost_search(gridmap, source, target,
-                        get_cost=False, verbose=False):
+                        get_cost=False, verbose=False, stats=None):
     """An optimization of Dijkstra's algorithm.
 
     https://algorithmicthoughts.wordpress.com/2012/12/15/
         artificial-intelligence-uniform-cost-searchucs/
-    
+
+    The costs and predecessors of each node are kept in dictionaries
+    local to the search, so the graph is never copied or mutated.
+
     Args:
         gridmap (GridMap): The map to pathfind.
         source (Tuple[int, int]): The coordinate of the source node.
         target (Tuple[int, int]): The coordinate of the target node.
         get_cost (bool): If True, return the cost instead of a path.
+            The cost includes the cost of the source node.
         verbose (bool): If True, print the steps taken by the algorithm.
             Note: This is not yet properly developed.
+        stats (Optional[dict]): If given, the number of nodes expanded
+            by the search is stored in the "expanded" key.
 
     Returns:
-        List[str]: A list of coordinates as strings ('0, 0')
+        List[Tuple[int, int]]: A list of coordinates.
+        int: The cost of the path when `get_cost` is True.
+        bool: False if no path could be found.
 
     """
-    graph = NavMesh.from_gridmap(gridmap)
+    graph = gridmap.get_navmesh()
+    if _unreachable(gridmap, graph, source, target, stats):
+        return False
+
+    return _best_first_search(graph, source, target, None,
+                              get_cost, stats, verbose)
+
+
+def astar_search(gridmap, source, target,
+                 get_cost=False, verbose=False, stats=None,
+                 heuristic=chebyshev_distance):
+    """Find the shortest path using A*.
+
+    Takes the same arguments as `uniform_cost_search`, but only expands
+    nodes in the direction of the target.
+
+    Args:
+        heuristic (Callable[[Tuple[int, int], Tuple[int, int]], float]):
+            A function estimating the number of steps between two
+            coordinates. It is scaled by the cheapest node cost and must
+            never overestimate, otherwise the path may not be the shortest.
+
+    """
+    graph = gridmap.get_navmesh()
+    if _unreachable(gridmap, graph, source, target, stats):
+        return False
+
+    return _best_first_search(graph, source, target, heuristic,
+                              get_cost, stats, verbose)
+
+
+def bidirectional_search(gridmap, source, target,
+                         get_cost=False, verbose=False, stats=None,
+                         heuristic=chebyshev_distance):
+    """Find the shortest path by searching from both ends at once.
+
+    Takes the same arguments as `astar_search`. The forward search runs
+    from the source and the backward search runs from the target over
+    the reversed graph; the shortest path found where they meet is
+    returned once neither frontier can improve on it.
+    If `heuristic` is None, this is a bidirectional Dijkstra search.
+
+    """
+    graph = gridmap.get_navmesh()
+    if _unreachable(gridmap, graph, source, target, stats):
+        return False
 
     # Verbose printing
     printV = lambda *args, **kwargs: print(*args, **kwargs) \
                                      if verbose else None
 
-    # Convert source and target keys into nodes
-    source = graph.get_node(source)
-    target = graph.get_node(target)
-    # Create a copy of the graph for mutating the costs
-    # without touching the original graph
-    graph = graph.copy()
+    source = graph.get_node(source).key
+    target = graph.get_node(target).key
+    nodes = graph.nodes
+    reverse = graph.reverse()
+
+    if heuristic is None:
+        estimate_f = estimate_b = lambda key: 0
+    else:
+        scale = graph.min_cost()
+        estimate_f = lambda key: heuristic(key, target) * scale
+        estimate_b = lambda key: heuristic(source, key) * scale
+
+    # Forward costs include the cost of the node itself while backward
+    # costs include every node after it, so a path through a meeting
+    # node costs exactly costs_f[node] + costs_b[node]
+    costs_f = {source: nodes[source].cost}
+    costs_b = {target: 0}
+    # Forward predecessors point towards the source,
+    # backward predecessors point towards the target
+    predecessors_f = {}
+    predecessors_b = {}
+    explored_f = set()
+    explored_b = set()
+    frontier_f = PriorityQueue()
+    frontier_b = PriorityQueue()
+    frontier_f.push(source, estimate_f(source))
+    frontier_b.push(target, estimate_b(target))
+
+    best_cost = math.inf
+    meeting = source if source == target else None
+    if meeting is not None:
+        best_cost = costs_f[source]
+
+    while not frontier_f.empty() and not frontier_b.empty():
+        # Stop once the cheapest estimate in either frontier
+        # cannot lead to a shorter path
+        if max(frontier_f.peek_priority(),
+               frontier_b.peek_priority()) >= best_cost:
+            break
+
+        if len(frontier_f) <= len(frontier_b):
+            # Expand forwards
+            key = frontier_f.pop()
+            explored_f.add(key)
+            cost = costs_f[key]
+
+            for n in graph.neighbor_keys(key):
+                if n in explored_f or n not in nodes:
+                    continue
+                n_cost = cost + nodes[n].cost
+                if n_cost < costs_f.get(n, n_cost + 1):
+                    printV(key, cost, n, n_cost)
+                    costs_f[n] = n_cost
+                    predecessors_f[n] = key
+                    frontier_f.push(n, n_cost + estimate_f(n))
+                    if n in costs_b and n_cost + costs_b[n] < best_cost:
+                        best_cost = n_cost + costs_b[n]
+                        meeting = n
+        else:
+            # Expand backwards
+            key = frontier_b.pop()
+            explored_b.add(key)
+            n_cost = costs_b[key] + nodes[key].cost
+
+            for n in reverse.neighbor_keys(key):
+                if n in explored_b:
+                    continue
+                if n_cost < costs_b.get(n, n_cost + 1):
+                    printV(key, costs_b[key], n, n_cost)
+                    costs_b[n] = n_cost
+                    predecessors_b[n] = key
+                    frontier_b.push(n, n_cost + estimate_b(n))
+                    if n in costs_f and costs_f[n] + n_cost < best_cost:
+                        best_cost = costs_f[n] + n_cost
+                        meeting = n
+
+    if stats is not None:
+        stats['expanded'] = len(explored_f) + len(explored_b)
+
+    if meeting is None:
+        return False
+    if get_cost:
+        return best_cost
+
+    path = _path_from_predecessors(predecessors_f, meeting)
+    key = meeting
+    while key in predecessors_b:
+        key = predecessors_b[key]
+        path.append(key)
+    return path
+
+
+def _search_group(graph, source, targets, get_cost):
+    """Search every target from one source with a single Dijkstra search.
+
+    Expands nodes in order of cost until every target is reached, then
+    extracts each path from the shared predecessor table.
+
+    """
+    nodes = graph.nodes
+    remaining = set(targets)
+    costs = {source: nodes[source].cost}
+    predecessors = {}
     explored = set()
     frontier = PriorityQueue()
-    # Start search with source node
     frontier.push(source, 0)
 
-    while True:
-        # If frontier is empty, no path could be found
-        if frontier.empty():
+    while remaining and not frontier.empty():
+        key = frontier.pop()
+        cost = costs[key]
+        explored.add(key)
+        remaining.discard(key)
+
+        for n in graph.neighbor_keys(key):
+            if n in explored or n not in nodes:
+                continue
+            n_cost = cost + nodes[n].cost
+            if n_cost < costs.get(n, n_cost + 1):
+                costs[n] = n_cost
+                predecessors[n] = key
+                frontier.push(n, n_cost)
+
+    results = []
+    for target in targets:
+        if target not in explored:
+            results.append(False)
+        elif get_cost:
+            results.append(costs[target])
+        else:
+            results.append(_path_from_predecessors(predecessors, target))
+    return results
+
+
+# The graph searched by each worker of a batch_search process pool,
+# sent once when the worker starts instead of with every group
+_worker_graph = None
+
+
+def _init_search_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _search_group_worker(source, targets, get_cost):
+    return _search_group(_worker_graph, source, targets, get_cost)
+
+
+def batch_search(gridmap, queries, get_cost=False,
+                 workers=None, executor=None):
+    """Find the shortest paths of many (source, target) pairs at once.
+
+    Queries are grouped by their source, and each group is answered
+    with one search from the source, so many targets sharing a source
+    cost little more than the farthest one alone.
+
+    Args:
+        gridmap (GridMap): The map to pathfind.
+        queries (Iterable[Tuple[Tuple[int, int], Tuple[int, int]]]):
+            The (source, target) pairs to find paths for.
+        get_cost (bool): If True, return costs instead of paths.
+        workers (Optional[int]): If given, search the groups on a
+            process pool with this many workers. The navigation graph
+            is sent to each worker once when it starts.
+        executor (Optional[concurrent.futures.Executor]):
+            An existing pool to search on. Takes precedence over workers.
+            The navigation graph is sent along with every group.
+
+    Returns:
+        List[Union[List[Tuple[int, int]], int, bool]]: The result of each
+            query in order, the same as `uniform_cost_search` would return.
+
+    """
+    graph = gridmap.get_navmesh()
+    components = gridmap.get_components()
+    groups = {}
+    query_sources = []
+    for source, target in queries:
+        # Make sure both keys exist in the graph
+        source = graph.get_node(source).key
+        target = graph.get_node(target).key
+        if not components.connected(source, target):
+            # Unreachable targets would make the search exhaust
+            # the whole component, so leave them out
+            query_sources.append(None)
+            continue
+        groups.setdefault(source, []).append(target)
+        query_sources.append(source)
+
+    sources = list(groups)
+    targets = [groups[source] for source in sources]
+    get_costs = [get_cost] * len(sources)
+
+    if executor is not None:
+        results = executor.map(_search_group, [graph] * len(sources),
+                               sources, targets, get_costs)
+    elif workers is not None:
+        chunksize = max(1, len(sources) // (workers * 4))
+
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_search_worker,
+                initargs=(graph,)) as pool:
+            results = list(pool.map(_search_group_worker, sources,
+                                    targets, get_costs,
+                                    chunksize=chunksize))
+    else:
+        results = map(_search_group, [graph] * len(sources),
+                      sources, targets, get_costs)
+
+    # Hand out each group's results back to its queries in order
+    answers = {source: iter(result)
+               for source, result in zip(sources, results)}
+    return [False if source is None else next(answers[source])
+            for source in query_sources]
+
+
+class PathHandle(GridMapListener):
+    """A shortest path kept up to date as its map changes, using D* Lite.
+
+    http://idm-lab.org/bib/abstracts/papers/aaai02b.pdf
+
+    The search runs backwards from the target, so when the agent moves
+    with `move_to` or cells and paths are added to the map, the next call
+    to `path` only repairs the part of the search affected by the change
+    instead of searching again from scratch.
+
+    The handle listens to its map until `close` is called. Changes that
+    do not go through the map's methods, such as changing node costs
+    of the NavMesh directly, must be reported with `update`.
+
+    Args:
+        gridmap (GridMap): The map to pathfind.
+        source (Tuple[int, int]): The coordinate of the agent.
+        target (Tuple[int, int]): The coordinate to move towards.
+        heuristic (Callable[[Tuple[int, int], Tuple[int, int]], float]):
+            A function estimating the number of steps between two
+            coordinates. See `astar_search`.
+
+    Attributes:
+        expanded (int): The number of nodes expanded so far,
+            for measuring how much each repair costs.
+
+    """
+
+    def __init__(self, gridmap, source, target,
+                 heuristic=chebyshev_distance):
+        graph = gridmap.get_navmesh()
+        self.gridmap = gridmap
+        self.source = graph.get_node(source).key
+        self.target = graph.get_node(target).key
+        self.heuristic = heuristic
+        self.expanded = 0
+        self.reset()
+        gridmap.listeners.append(self)
+
+    def close(self):
+        """Stop repairing the path when the map changes."""
+        self.gridmap.listeners.remove(self)
+
+    def reset(self):
+        """Discard the search so the next path is searched from scratch."""
+        self.scale = self.gridmap.get_navmesh().min_cost()
+        self.km = 0
+        self.last = self.source
+        # Costs of the paths from each node to the target
+        self.g = {}
+        self.rhs = {self.target: 0}
+        self.changed = set()
+        self.queue = PriorityQueue()
+        self.queue.push(self.target, self._calculate_key(self.target))
+
+    def _estimate(self, a, b):
+        return self.heuristic(a, b) * self.scale
+
+    def _calculate_key(self, key):
+        m = min(self.g.get(key, math.inf), self.rhs.get(key, math.inf))
+        return (m + self._estimate(self.source, key) + self.km, m)
+
+    def _predecessors(self, key):
+        """Return the nodes with paths leading into a node."""
+        graph = self.gridmap.get_navmesh()
+        y, x = key
+        predecessors = []
+        for _, (vy, vx) in BIT_VECTORS:
+            n = (y + vy, x + vx)
+            if n in graph and key in graph.neighbor_keys(n):
+                predecessors.append(n)
+        return predecessors
+
+    def _update_vertex(self, key):
+        graph = self.gridmap.get_navmesh()
+        nodes = graph.nodes
+        g = self.g
+        if key != self.target:
+            best = math.inf
+            if key in nodes:
+                for n in graph.neighbor_keys(key):
+                    if n in nodes:
+                        best = min(best, nodes[n].cost + g.get(n, math.inf))
+            self.rhs[key] = best
+
+        self.queue.remove(key)
+        if g.get(key, math.inf) != self.rhs.get(key, math.inf):
+            self.queue.push(key, self._calculate_key(key))
+
+    def _compute(self):
+        """Repair the search after changes until the source is settled."""
+        graph = self.gridmap.get_navmesh()
+        if graph.min_cost() < self.scale:
+            # The heuristic could overestimate with the old scale
+            self.reset()
+
+        changed, self.changed = self.changed, set()
+        for key in changed:
+            # The node's own paths or its cost may have changed,
+            # which affects the nodes leading into it
+            self._update_vertex(key)
+            for p in self._predecessors(key):
+                self._update_vertex(p)
+
+        g, rhs, queue, source = self.g, self.rhs, self.queue, self.source
+        while not queue.empty() and (
+                queue.peek_priority() < self._calculate_key(source)
+                or rhs.get(source, math.inf) != g.get(source, math.inf)):
+            k_old = queue.peek_priority()
+            key = queue.pop()
+            k_new = self._calculate_key(key)
+            self.expanded += 1
+
+            if k_old < k_new:
+                queue.push(key, k_new)
+            elif g.get(key, math.inf) > rhs.get(key, math.inf):
+                g[key] = rhs[key]
+                for p in self._predecessors(key):
+                    self._update_vertex(p)
+            else:
+                g[key] = math.inf
+                self._update_vertex(key)
+                for p in self._predecessors(key):
+                    self._update_vertex(p)
+
+    def update(self, *keys):
+        """Report nodes whose paths or costs changed."""
+        self.changed.update(keys)
+
+    def move_to(self, key):
+        """Move the agent to a new coordinate, usually the next step."""
+        self.km += self._estimate(self.last, key)
+        self.last = self.source = key
+
+    def cost(self):
+        """Return the cost of the path, or False if no path exists.
+
+        Like `uniform_cost_search`, this includes the cost of the source.
+
+        """
+        self._compute()
+        nodes = self.gridmap.get_navmesh().nodes
+        cost = self.g.get(self.source, math.inf)
+        if cost == math.inf or self.source not in nodes:
             return False
-        # Pick the shortest path to analyze
-        node = frontier.pop()
+        return nodes[self.source].cost + cost
 
-        if node == target:
-            if get_cost:
-                return node.cost
-            # Find the path
-            path = [node]
-            while 'predecessor' in node.info:
-                node = node.info['predecessor']
-                path.append(node)
-            return [n.key for n in reversed(path)]
-        # Take note of node as explored as to not search through it again
-        explored.add(node)
+    def path(self):
+        """Return the path from the agent to the target,
+        or False if no path exists."""
+        if self.cost() is False:
+            return False
 
-        for n in graph.neighbors(node):
-            printV(n)
-            printV(explored)
-            if n not in explored:
-                printV('not in explored')
-                # Make neighbors part of the frontier if unexplored
-                if n not in frontier:
-                    # Push a new node with cumulative costs
-                    n.cost += node.cost
-                    printV(node.key, node.cost, n.key, n.cost)
-                    frontier.push(n, n.cost)
-                    if not get_cost:
-                        n.info['predecessor'] = node
-            # Neighboring node was already seen, but the stored cost
-            # can be replaced if it has discovered a lower cost
-            elif n in frontier and n.cost < frontier.getPriority(n):
-                frontier.setPriority(n, n.cost)
-                if not get_cost:
-                    n.info['predecessor'] = node
+        graph = self.gridmap.get_navmesh()
+        nodes = graph.nodes
+        g = self.g
+        key = self.source
+        path = [key]
+        while key != self.target:
+            # Step to the neighbour on the cheapest path to the target
+            key = min((n for n in graph.neighbor_keys(key) if n in nodes),
+                      key=lambda n: nodes[n].cost + g.get(n, math.inf))
+            path.append(key)
+        return path
+
+    def next_step(self):
+        """Return the next coordinate on the path, or None if
+        the agent is at the target or no path exists."""
+        path = self.path()
+        if not path or len(path) < 2:
+            return None
+        return path[1]
+
+    def square_changed(self, y, x):
+        self.changed.add((y, x))
+
+
+def _cluster_search(graph, start, bounds, target=None, reverse=False):
+    """Dijkstra's algorithm restricted to a rectangle of the map.
+
+    Args:
+        graph (NavMesh): The graph to search.
+        start (Tuple[int, int]): The key to search from.
+        bounds (Tuple[int, int, int, int]): The y_start, y_stop, x_start
+            and x_stop of the rectangle.
+        target (Optional[Tuple[int, int]]): Stop once this key is reached,
+            searching towards it with A* using `chebyshev_distance`.
+        reverse (bool): Follow paths backwards, giving the cost from
+            each node to `start` instead of from `start` to each node.
+
+    Returns:
+        Tuple[dict, dict, int]: The costs and predecessors of every
+            reached node, and the number of nodes expanded. Costs do not
+            include the cost of the first node of the path.
+
+    """
+    y_start, y_stop, x_start, x_stop = bounds
+    nodes = graph.nodes
+
+    def inside(key):
+        return (key in nodes and y_start <= key[0] < y_stop
+                and x_start <= key[1] < x_stop)
+
+    if reverse:
+        # Find the paths leading into each node of the rectangle
+        incoming = {}
+        for y in range(y_start, y_stop):
+            for x in range(x_start, x_stop):
+                if (y, x) in nodes:
+                    for n in graph.neighbor_keys((y, x)):
+                        if inside(n):
+                            incoming.setdefault(n, []).append((y, x))
+
+    if target is None:
+        estimate = lambda key: 0
+    else:
+        scale = graph.min_cost()
+        estimate = lambda key: chebyshev_distance(key, target) * scale
+
+    costs = {start: 0}
+    predecessors = {}
+    explored = set()
+    frontier = PriorityQueue()
+    frontier.push(start, 0)
+
+    while not frontier.empty():
+        key = frontier.pop()
+        explored.add(key)
+        if key == target:
+            break
+        cost = costs[key]
+
+        if reverse:
+            neighbours = incoming.get(key, ())
+            n_cost = cost + nodes[key].cost
+        else:
+            neighbours = graph.neighbor_keys(key)
+        for n in neighbours:
+            if n in explored or not inside(n):
+                continue
+            if not reverse:
+                n_cost = cost + nodes[n].cost
+            if n_cost < costs.get(n, n_cost + 1):
+                costs[n] = n_cost
+                predecessors[n] = key
+                frontier.push(n, n_cost + estimate(n))
+
+    return costs, predecessors, len(explored)
+
+
+class HierarchicalPlanner(GridMapListener):
+    """Find long paths quickly with hierarchical pathfinding (HPA*).
+
+    https://webdocs.cs.ualberta.ca/~mmueller/ps/hpastar.pdf
+
+    The map is split into square clusters. Each run of paths crossing
+    from one cluster into a neighbouring cluster is reduced to a single
+    entrance, and the costs between the entrances of every cluster are
+    precomputed. A search first finds a route through the entrances,
+    then refines each step of the route with a search inside a single
+    cluster, so only a small part of the map is expanded.
+
+    The paths found are close to, but not always, the shortest.
+
+    The planner listens to its map until `close` is called, and the
+    clusters around any changed square are rebuilt before the next search.
+
+    Args:
+        gridmap (GridMap): The map to pathfind.
+        cluster_size (int): The height and width of each cluster.
+
+    Attributes:
+        entrances (Dict[Tuple[int, int], Dict[Tuple[int, int], list]]):
+            For each cluster, the Cells with paths chosen as entrances
+            into neighbouring clusters, mapped to the Cells they lead to.
+        intra (Dict[Tuple[int, int], Dict[Tuple[int, int], list]]):
+            For each cluster, the costs from each entrance to the other
+            entrances reachable inside the cluster.
+
+    """
+
+    def __init__(self, gridmap, cluster_size=10):
+        self.gridmap = gridmap
+        self.cluster_size = cluster_size
+        self.y_clusters = -(-len(gridmap) // cluster_size)
+        self.x_clusters = -(-len(gridmap[0]) // cluster_size)
+        self.entrances = {}
+        self.intra = {}
+        self.dirty = {(cy, cx) for cy in range(self.y_clusters)
+                      for cx in range(self.x_clusters)}
+        gridmap.listeners.append(self)
+
+    def close(self):
+        """Stop rebuilding clusters when the map changes."""
+        self.gridmap.listeners.remove(self)
+
+    def cluster_of(self, key):
+        """Return the coordinates of the cluster containing a square."""
+        return key[0] // self.cluster_size, key[1] // self.cluster_size
+
+    def _bounds(self, cluster):
+        size = self.cluster_size
+        cy, cx = cluster
+        return (cy * size, min((cy + 1) * size, len(self.gridmap)),
+                cx * size, min((cx + 1) * size, len(self.gridmap[0])))
+
+    def _neighbour_clusters(self, cluster):
+        cy, cx = cluster
+        for y in range(max(cy - 1, 0), min(cy + 2, self.y_clusters)):
+            for x in range(max(cx - 1, 0), min(cx + 2, self.x_clusters)):
+                yield y, x
+
+    def _build_entrances(self, graph, cluster):
+        """Choose the entrances leading out of a cluster."""
+        y_start, y_stop, x_start, x_stop = self._bounds(cluster)
+        nodes = graph.nodes
+
+        # Group every path leaving the cluster by the cluster it enters
+        crossings = {}
+        for y in range(y_start, y_stop):
+            for x in range(x_start, x_stop):
+                if (y, x) not in nodes:
+                    continue
+                for n in graph.neighbor_keys((y, x)):
+                    other = self.cluster_of(n)
+                    if other != cluster and n in nodes:
+                        crossings.setdefault(other, []).append(((y, x), n))
+
+        def linked(a, b):
+            return a == b or (b in graph.neighbor_keys(a)
+                              and a in graph.neighbor_keys(b))
+
+        # Reduce each run of crossings to the one in its middle. Both ends
+        # of the crossings in a run are joined by paths on either side,
+        # so the other crossings can be reached through the chosen one
+        entrances = {}
+        for edges in crossings.values():
+            edges.sort()
+            remaining = edges
+            while remaining:
+                run = [remaining[0]]
+                rest = []
+                for a, b in remaining[1:]:
+                    if any(linked(a, ra) and linked(b, rb)
+                           for ra, rb in run):
+                        run.append((a, b))
+                    else:
+                        rest.append((a, b))
+                a, b = run[len(run) // 2]
+                entrances.setdefault(a, []).append(b)
+                remaining = rest
+        self.entrances[cluster] = entrances
+
+    def _build_intra(self, graph, cluster):
+        """Precompute the costs between the entrances of a cluster."""
+        keys = set(self.entrances.get(cluster, ()))
+        for other in self._neighbour_clusters(cluster):
+            for targets in self.entrances.get(other, {}).values():
+                keys.update(b for b in targets
+                            if self.cluster_of(b) == cluster)
+
+        bounds = self._bounds(cluster)
+        intra = {}
+        for key in keys:
+            costs, _, _ = _cluster_search(graph, key, bounds)
+            intra[key] = [(other, costs[other]) for other in keys
+                          if other != key and other in costs]
+        self.intra[cluster] = intra
+
+    def refresh(self):
+        """Rebuild the clusters around squares that changed."""
+        if not self.dirty:
+            return
+        graph = self.gridmap.get_navmesh()
+
+        # Paths into a changed cluster can change the entrances
+        # of its neighbours, which changes their costs as well
+        rebuild = set()
+        for cluster in self.dirty:
+            rebuild.update(self._neighbour_clusters(cluster))
+        for cluster in rebuild:
+            self._build_entrances(graph, cluster)
+        for cluster in rebuild:
+            self._build_intra(graph, cluster)
+        self.dirty.clear()
+
+    def search(self, source, target, get_cost=False, stats=None):
+        """Find a path between two Cells.
+
+        Takes the same arguments and returns the same values as
+        `uniform_cost_search`.
+
+        """
+        self.refresh()
+        graph = self.gridmap.get_navmesh()
+        nodes = graph.nodes
+        if _unreachable(self.gridmap, graph, source, target, stats):
+            return False
+        source_cluster = self.cluster_of(source)
+        target_cluster = self.cluster_of(target)
+        expanded = 0
+
+        # Connect the source and target to the entrances of their clusters
+        costs, _, n = _cluster_search(
+            graph, source, self._bounds(source_cluster))
+        expanded += n
+        source_edges = [(key, cost) for key, cost in costs.items()
+                        if key in self.intra[source_cluster]
+                        or key == target]
+        costs, _, n = _cluster_search(
+            graph, target, self._bounds(target_cluster), reverse=True)
+        expanded += n
+        target_costs = {key: cost for key, cost in costs.items()
+                        if key in self.intra[target_cluster]}
+
+        def abstract_edges(key):
+            if key == source:
+                yield from source_edges
+            if key in target_costs:
+                yield target, target_costs[key]
+            cluster = self.cluster_of(key)
+            for other, cost in self.intra[cluster].get(key, ()):
+                yield other, cost
+            for other in self.entrances[cluster].get(key, ()):
+                yield other, nodes[other].cost
+
+        # A* through the entrances
+        scale = graph.min_cost()
+        costs = {source: 0}
+        predecessors = {}
+        explored = set()
+        frontier = PriorityQueue()
+        frontier.push(source, 0)
+        while not frontier.empty():
+            key = frontier.pop()
+            if key == target:
+                break
+            explored.add(key)
+            cost = costs[key]
+            for n, edge_cost in abstract_edges(key):
+                if n in explored:
+                    continue
+                n_cost = cost + edge_cost
+                if n_cost < costs.get(n, n_cost + 1):
+                    costs[n] = n_cost
+                    predecessors[n] = key
+                    frontier.push(
+                        n, n_cost + chebyshev_distance(n, target) * scale)
+        expanded += len(explored)
+
+        if target not in costs or key != target:
+            if stats is not None:
+                stats['expanded'] = expanded
+            return False
+        if get_cost:
+            if stats is not None:
+                stats['expanded'] = expanded
+            return nodes[source].cost + costs[target]
+
+        # Refine each step of the route inside its cluster
+        route = _path_from_predecessors(predecessors, target)
+        path = [source]
+        for a, b in zip(route, route[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(b)
+                continue
+            _, local, n = _cluster_search(
+                graph, a, self._bounds(cluster), target=b)
+            expanded += n
+            path.extend(_path_from_predecessors(local, b)[1:])
+
+        if stats is not None:
+            stats['expanded'] = expanded
+        return path
+
+    def square_changed(self, y, x):
+        self.dirty.add(self.cluster_of((y, x)))
+
+
+class CooperativePlanner(GridMapListener):
+    """Plan the moves of many agents together so they never collide.
+
+    Uses windowed hierarchical cooperative A* (WHCA*):
+    https://www.aaai.org/Papers/AIIDE/2005/AIIDE05-020.pdf
+
+    Agents are planned one after another with a space-time A* search
+    that can wait in place, looking `window` turns ahead. Every square
+    an agent occupies at each turn, and every path it takes between
+    turns, is reserved, so agents planned later move around it instead
+    of into it or through it head-on. The distance to each target,
+    found with a backwards search, guides agents past the window.
+
+    Agents keep their plans between turns, and are only planned again
+    once half of their window has been used, their target changes,
+    or the map changes. The order agents are planned in rotates every
+    turn so the same agents do not always give way. Agents that reached
+    their targets stay there, so targets inside narrow corridors can
+    block other agents.
+
+    The planner listens to its map until `close` is called.
+
+    Args:
+        gridmap (GridMap): The map the agents move on.
+        window (int): The number of turns each plan looks ahead.
+
+    Attributes:
+        time (int): The current turn.
+        positions (Dict[Hashable, Tuple[int, int]]):
+            The coordinates of each agent at the current turn.
+        targets (Dict[Hashable, Tuple[int, int]]): The target of each agent.
+
+    """
+
+    def __init__(self, gridmap, window=8):
+        self.gridmap = gridmap
+        self.window = window
+        self.time = 0
+        self.positions = {}
+        self.targets = {}
+        # Each plan is the turn it starts at and the coordinates
+        # of the agent at every turn from then on
+        self.plans = {}
+        # (key, turn) -> agent and (key, next key, turn) -> agent
+        self.reservations = {}
+        # Squares where agents rest after their plan ends:
+        # key -> (agent, first turn)
+        self.resting = {}
+        self.reserved = {}
+        self.distances = {}
+        gridmap.listeners.append(self)
+
+    def close(self):
+        """Stop replanning when the map changes."""
+        self.gridmap.listeners.remove(self)
+
+    def add_agent(self, agent, source, target):
+        """Add an agent standing on a Cell, moving towards a target."""
+        graph = self.gridmap.get_navmesh()
+        source = graph.get_node(source).key
+        self.positions[agent] = source
+        self.targets[agent] = graph.get_node(target).key
+        self.plans.pop(agent, None)
+        self.resting[source] = (agent, self.time)
+        self.reserved[agent] = [('resting', source)]
+
+    def remove_agent(self, agent):
+        """Remove an agent along with its reservations."""
+        self._release(agent)
+        del self.positions[agent]
+        del self.targets[agent]
+        self.plans.pop(agent, None)
+        del self.reserved[agent]
+
+    def set_target(self, agent, target):
+        """Change the target of an agent, planning it again next turn."""
+        self.targets[agent] = self.gridmap.get_navmesh().get_node(target).key
+        self.plans.pop(agent, None)
+
+    def _release(self, agent):
+        for kind, key in self.reserved.get(agent, ()):
+            if kind == 'resting':
+                if self.resting.get(key, (None,))[0] == agent:
+                    del self.resting[key]
+            elif self.reservations.get(key) == agent:
+                del self.reservations[key]
+        self.reserved[agent] = []
+
+    def _distances_to(self, target):
+        """Return the cost from every Cell that can reach a target."""
+        distances = self.distances.get(target)
+        if distances is not None:
+            return distances
+
+        graph = self.gridmap.get_navmesh()
+        nodes = graph.nodes
+        reverse = graph.reverse()
+        distances = {target: 0}
+        frontier = PriorityQueue()
+        frontier.push(target, 0)
+        while not frontier.empty():
+            key = frontier.pop()
+            n_cost = distances[key] + nodes[key].cost
+            for n in reverse.neighbor_keys(key):
+                if n_cost < distances.get(n, n_cost + 1):
+                    distances[n] = n_cost
+                    frontier.push(n, n_cost)
+
+        self.distances[target] = distances
+        return distances
+
+    def _blocked(self, agent, key, next_key, t):
+        """Return True if moving from key to next_key at turn t collides
+        with another agent."""
+        other = self.reservations.get((next_key, t + 1), agent)
+        if other != agent:
+            return True
+        # Agents cannot swap squares by passing through each other
+        if key != next_key and self.reservations.get(
+                (next_key, key, t), agent) != agent:
+            return True
+        other, since = self.resting.get(next_key, (agent, 0))
+        return other != agent and t + 1 >= since
+
+    def _search(self, agent):
+        """Find the agent's moves for the window with space-time A*."""
+        graph = self.gridmap.get_navmesh()
+        nodes = graph.nodes
+        source = self.positions[agent]
+        target = self.targets[agent]
+        distances = self._distances_to(target)
+        end = self.time + self.window
+        if source not in distances:
+            # The target cannot be reached, so wait in place
+            return [source] * (self.window + 1)
+
+        start = (source, self.time)
+        costs = {start: 0}
+        predecessors = {}
+        explored = set()
+        frontier = PriorityQueue()
+        frontier.push(start, distances[source])
+        while not frontier.empty():
+            state = frontier.pop()
+            key, t = state
+            if t == end:
+                path = _path_from_predecessors(predecessors, state)
+                return [key for key, _ in path]
+            explored.add(state)
+            cost = costs[state]
+
+            for n in list(graph.neighbor_keys(key)) + [key]:
+                n_state = (n, t + 1)
+                if n_state in explored or n not in distances \
+                        or self._blocked(agent, key, n, t):
+                    continue
+                if n == key:
+                    # Waiting costs nothing once the target is reached
+                    n_cost = cost + (0 if key == target else nodes[key].cost)
+                else:
+                    n_cost = cost + nodes[n].cost
+                if n_cost < costs.get(n_state, n_cost + 1):
+                    costs[n_state] = n_cost
+                    predecessors[n_state] = state
+                    frontier.push(n_state, n_cost + distances[n])
+
+        # Boxed in by other agents
+        return [source] * (self.window + 1)
+
+    def _reserve(self, agent, path):
+        reserved = self.reserved[agent]
+        for t, key in enumerate(path, self.time):
+            self.reservations[key, t] = agent
+            reserved.append(('turn', (key, t)))
+        for t, (a, b) in enumerate(zip(path, path[1:]), self.time):
+            if a != b:
+                self.reservations[a, b, t] = agent
+                reserved.append(('turn', (a, b, t)))
+        self.resting[path[-1]] = (agent, self.time + len(path) - 1)
+        reserved.append(('resting', path[-1]))
+        self.plans[agent] = (self.time, path)
+
+    def plan(self):
+        """Plan every agent whose plan is missing or running out.
+
+        Returns:
+            List[Hashable]: The agents that were planned.
+
+        """
+        half = self.window // 2
+        replan = []
+        for agent in self.positions:
+            plan = self.plans.get(agent)
+            if plan is None or plan[0] + len(plan[1]) - 1 - self.time < half:
+                replan.append(agent)
+
+        # Plan agents at their targets last
+        if replan:
+            shift = self.time % len(replan)
+            replan = replan[shift:] + replan[:shift]
+            replan.sort(key=lambda a: self.positions[a] == self.targets[a])
+
+        # Agents waiting to be planned block the squares they stand on
+        for agent in replan:
+            self._release(agent)
+            position = self.positions[agent]
+            self.resting[position] = (agent, self.time)
+            self.reserved[agent].append(('resting', position))
+
+        for agent in replan:
+            self._release(agent)
+            self._reserve(agent, self._search(agent))
+        return replan
+
+    def step(self):
+        """Plan agents that need it, then move every agent one turn.
+
+        Returns:
+            Dict[Hashable, Tuple[int, int]]: The new position of each agent.
+
+        """
+        self.plan()
+        self.time += 1
+        for agent, (start, path) in self.plans.items():
+            self.positions[agent] = path[min(self.time - start,
+                                             len(path) - 1)]
+        return dict(self.positions)
+
+    def square_changed(self, y, x):
+        # Paths may be shorter now, so every plan is redone next turn
+        self.distances.clear()
+        self.plans.clear()
+
+
+class FlowField(GridMapListener):
+    """Distances and directions towards the nearest of several sources.
+
+    A breadth-first pass from the sources gives every square that can
+    reach one of them its number of steps to the nearest source and the
+    direction of the next step, so any number of agents can follow
+    the field without searching on their own. Neighbours are the squares
+    a Cell has paths to, as in `NavMesh.from_gridmap`.
+
+    The field listens to its map and is updated incrementally as cells
+    and paths are added. Other changes, such as replacing a Cell,
+    require calling `build` again.
+
+    Args:
+        gridmap (GridMap): The map to build the field on.
+        sources (Iterable[Tuple[int, int]]): The Cells to move towards.
+
+    Attributes:
+        distances (array.array): The steps to the nearest source of each
+            square, indexed by `y * x_size + x`. -1 if unreachable.
+        directions (bytearray): The PATH_* bit pointing to the next step
+            of each square. 0 for sources and unreachable squares.
+
+    """
+
+    UNREACHABLE = -1
+
+    def __init__(self, gridmap, sources):
+        self.gridmap = gridmap
+        self.sources = list(sources)
+        self.y_size = len(gridmap)
+        self.x_size = len(gridmap[0])
+        self.build()
+        gridmap.listeners.append(self)
+
+    def close(self):
+        """Stop updating the field when the map changes."""
+        self.gridmap.listeners.remove(self)
+
+    def _in_bounds(self, y, x):
+        return 0 <= y < self.y_size and 0 <= x < self.x_size
+
+    def build(self):
+        """Calculate the field for the entire map."""
+        size = self.y_size * self.x_size
+        self.distances = array.array('i', [self.UNREACHABLE]) * size
+        self.directions = bytearray(size)
+
+        masks = [self.gridmap.get_mask_row(y) for y in range(self.y_size)]
+        queue = collections.deque()
+        for y, x in self.sources:
+            if masks[y][x] is None:
+                raise ValueError(f'source {y}, {x} is not a Cell')
+            self.distances[y * self.x_size + x] = 0
+            queue.append((y, x))
+
+        self._propagate(queue, lambda y, x: masks[y][x])
+
+    def _propagate(self, queue, get_mask):
+        """Lower the distances of squares leading into the queued squares."""
+        distances = self.distances
+        directions = self.directions
+        x_size = self.x_size
+
+        while queue:
+            y, x = queue.popleft()
+            distance = distances[y * x_size + x] + 1
+            for bit, (vy, vx) in BIT_VECTORS:
+                ny, nx = y + vy, x + vx
+                if not self._in_bounds(ny, nx):
+                    continue
+                reverse = REVERSE_BITS[bit]
+                mask = get_mask(ny, nx)
+                # Check if the neighbour has a path into this square
+                if mask is None or not mask & reverse:
+                    continue
+                index = ny * x_size + nx
+                if distances[index] == self.UNREACHABLE \
+                        or distance < distances[index]:
+                    distances[index] = distance
+                    directions[index] = reverse
+                    queue.append((ny, nx))
+
+    def square_changed(self, y, x):
+        """Update the field after a Cell or path was added at y, x."""
+        if y < 0:
+            y += self.y_size
+        if x < 0:
+            x += self.x_size
+        get_mask = self.gridmap.get_mask
+        mask = get_mask(y, x)
+        if mask is None:
+            return
+
+        # Find the closest neighbour this square has a path to
+        index = y * self.x_size + x
+        distances = self.distances
+        best = distances[index]
+        for bit, (vy, vx) in BIT_VECTORS:
+            ny, nx = y + vy, x + vx
+            if not mask & bit or not self._in_bounds(ny, nx):
+                continue
+            n_distance = distances[ny * self.x_size + nx]
+            if n_distance == self.UNREACHABLE:
+                continue
+            if best == self.UNREACHABLE or n_distance + 1 < best:
+                best = n_distance + 1
+                self.directions[index] = bit
+
+        if best != distances[index]:
+            distances[index] = best
+            self._propagate(collections.deque([(y, x)]), get_mask)
+
+    def distance(self, y, x):
+        """Return the steps to the nearest source, or None if unreachable."""
+        distance = self.distances[y * self.x_size + x]
+        return None if distance == self.UNREACHABLE else distance
+
+    def direction(self, y, x):
+        """Return the cardinal of the next step towards the nearest source.
+
+        Returns None if the square is a source or cannot reach one.
+
+        """
+        bit = self.directions[y * self.x_size + x]
+        return MASK_CARDINALS[bit][0] if bit else None
+
+    def next_step(self, y, x):
+        """Return the next square towards the nearest source, or None."""
+        bit = self.directions[y * self.x_size + x]
+        if not bit:
+            return None
+        vy, vx = MASK_VECTORS[bit][0]
+        return y + vy, x + vx
+
+    def step_away(self, y, x):
+        """Return the neighbouring square furthest from every source.
+
+        Returns None if no neighbour is further than the current square.
+
+        """
+        mask = self.gridmap.get_mask(y, x)
+        best = self.distance(y, x)
+        if mask is None or best is None:
+            return None
+        step = None
+        for vy, vx in MASK_VECTORS[mask]:
+            ny, nx = y + vy, x + vx
+            if not self._in_bounds(ny, nx):
+                continue
+            distance = self.distance(ny, nx)
+            if distance is not None and distance > best:
+                best = distance
+                step = ny, nx
+        return step
+
+    def path(self, y, x):
+        """Return the path from a square to its nearest source.
+
+        Returns False if no source can be reached, like the searches.
+
+        """
+        if self.distance(y, x) is None:
+            return False
+        path = [(y, x)]
+        while (step := self.next_step(*path[-1])) is not None:
+            path.append(step)
+        return path
 
 
 def markers_from_path(path, char):
@@ -0,0 +1,69 @@
+from .chunks import ChunkedWorld
+from .gridmap import PATH_E, PATH_S, PATH_W
+
+
+def test_chunks_are_deterministic():
+    first = ChunkedWorld(1234, chunk_size=8)
+    second = ChunkedWorld(1234, chunk_size=8)
+    coordinates = [(cy, cx) for cy in range(-2, 2) for cx in range(-2, 2)]
+
+    masks = {c: bytes(first.get_chunk(*c).masks) for c in coordinates}
+    for c in reversed(coordinates):
+        assert bytes(second.get_chunk(*c).masks) == masks[c]
+
+    other = ChunkedWorld(4321, chunk_size=8)
+    assert any(bytes(other.get_chunk(*c).masks) != masks[c]
+               for c in coordinates)
+
+
+def test_chunk_borders_are_consistent():
+    world = ChunkedWorld(7, chunk_size=8, doors=3)
+    for y in range(-16, 16):
+        for x in range(-16, 16):
+            for ny, nx in world.get_neighbours(y, x):
+                assert (y, x) in world.get_neighbours(ny, nx)
+
+    # Every border is crossed by at least one path
+    assert any(world.get_mask(y, 7) & PATH_E for y in range(8))
+    assert any(world.get_mask(7, x) & PATH_S for x in range(8))
+
+
+def test_chunks_are_evicted():
+    world = ChunkedWorld(0, chunk_size=4, max_chunks=3)
+    for cx in range(5):
+        world.get_chunk(0, cx)
+    assert list(world.chunks) == [(0, 2), (0, 3), (0, 4)]
+
+    # Chunks holding objects are evicted too, keeping their objects
+    world.get_cell(0, 8).objects['player'] = 'P'
+    for cx in range(5, 8):
+        world.get_chunk(0, cx)
+    assert list(world.chunks) == [(0, 5), (0, 6), (0, 7)]
+    assert world.evicted_objects == {(0, 2): {(0, 0): {'player': 'P'}}}
+    assert world.get_cell(0, 8).objects == {'player': 'P'}
+    assert world.evicted_objects == {}
+
+
+def test_spilled_chunks_keep_changes(tmp_path):
+    with ChunkedWorld(99, chunk_size=4, max_chunks=1,
+                      spill_path=tmp_path / 'spill') as world:
+        original = world.get_mask(1, 1)
+        world.connect_cell(1, 1, 'W')
+        world.connect_cell(3, 3, 'E')
+        changed = world.get_mask(1, 1)
+        assert changed == original | PATH_W
+
+        # Evict past the initial capacity of the spill file
+        for cx in range(1, 40):
+            world.get_chunk(0, cx)
+        assert (0, 0) not in world.chunks
+        assert world.get_mask(1, 1) == changed
+        assert world.get_mask(3, 3) & PATH_E
+        assert world.get_mask(3, 4) & PATH_W
+
+
+def test_render_viewport_across_chunks():
+    world = ChunkedWorld(5, chunk_size=4)
+    lines = list(world.render_viewport(0, 0, 6, 6))
+    assert len(lines) == 6 * 4
+    assert all(len(line) == 6 * 4 for line in lines)
@@ -1,3 +1,5 @@
+import random
+
 from . import gridmap
 
 
@@ -34,3 +36,197 @@ def test_vector_to_cardinal():
     for NS, y_coord in (('N', -1), ('S', 1)):
         for W_E, x_coord in (('W', -1), ('', 0), ('E', 1)):
             assert gridmap.vector_to_cardinal(y_coord, x_coord) == NS + W_E
+
+
+def test_compact_gridmap_matches_gridmap():
+    level = gridmap.GridMap(3, 3)
+    compact = gridmap.CompactGridMap(3, 3)
+
+    for m in (level, compact):
+        m.create_cell(0, 0)
+        m.create_cell(0, 1, paths=['S'])
+        m.create_cell(1, 0, paths=['E', 'SE'])
+        m.create_cell(1, 1)
+        m.create_cell(1, 2)
+        m.create_cell(2, 1)
+        m.connect_cell(0, 0, 'SE')
+        m.connect_cell(1, 1, 'E')
+
+    markers = {(0, 0): 'S'}
+    assert compact.render(99, 99, markers) == level.render(99, 99, markers)
+    assert compact.render_compact(99, 99) == level.render_compact(99, 99)
+    for cell, y, x in level.get_all_squares():
+        other = compact[y][x]
+        if cell is None:
+            assert other is None
+        else:
+            assert sorted(other.paths) == sorted(cell.paths)
+    assert {k: sorted(v) for k, v in compact.get_all_neighbours()} \
+        == {k: sorted(v) for k, v in level.get_all_neighbours()}
+
+
+def test_compact_gridmap_objects():
+    level = gridmap.CompactGridMap(2, 2)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+
+    assert level.cells == {}
+    level[0][0].objects['K'] = True
+    assert list(level.cells) == [(0, 0)]
+
+    level[0][0].move_object_direction('K', 'SE')
+    assert list(level.cells) == [(1, 1)]
+    assert level[1][1].objects == {'K': True}
+
+
+def test_path_mask_tables():
+    for bit, (vy, vx) in gridmap.BIT_VECTORS:
+        cardinal = gridmap.vector_to_cardinal(vy, vx)
+        assert gridmap.cardinal_to_bit(cardinal) == bit
+        assert gridmap.MASK_CARDINALS[bit] == (cardinal,)
+        assert gridmap.REVERSE_BITS[bit] \
+            == gridmap.cardinal_to_bit(gridmap.reverse_cardinal(cardinal))
+
+
+def test_gridmap_renderer_updates_dirty_rows():
+    level = gridmap.GridMap(4, 4)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    level[0][0].objects['K'] = True
+
+    renderer = gridmap.GridMapRenderer(level, object_markers={'K': 'K'})
+    assert renderer.render() == level.render(99, 99, {(0, 0): 'K'})
+    assert renderer.update() == []
+
+    level[0][0].move_object_direction('K', 'SE')
+    level.connect_cell(2, 2, 'S')
+    assert renderer.update() == [0, 1, 2, 3]
+    level.connect_cell(3, 0, 'E')
+    assert renderer.update() == [2, 3]
+
+    assert renderer.render() == level.render(99, 99, {(1, 1): 'K'})
+
+    compact = gridmap.GridMapRenderer(level, compact=True)
+    compact.set_marker(3, 3, 'E')
+    assert compact.render() == level.render_compact(99, 99, {(3, 3): 'E'})
+    renderer.close()
+    compact.close()
+    assert level.listeners == []
+
+
+def test_render_viewport():
+    random.seed(0)
+    level, start, end = gridmap.generate_spelunky_map(8, 8)
+    markers = {start: 'S', end: 'E'}
+
+    full = level.render(99, 99, markers).split('\n')
+    # A 3x3 window centred on 4, 4 covers rows and columns 3-5
+    window = list(level.render_viewport(4, 4, 3, 3, markers))
+    assert window == [line[12:24] for line in full[12:24]]
+
+    # Windows are kept inside the map
+    full = level.render_compact(99, 99, markers).split('\n')
+    window = list(level.render_viewport(0, 7, 2, 20, markers, compact=True))
+    assert window == full[:4]
+
+
+def test_gridmap_serialization(tmp_path):
+    level, (y1, x1), (y2, x2) = gridmap.generate_spelunky_map(
+        6, 7, rng=random.Random(3))
+    level[y1][x1].objects['K'] = 'knight'
+    level[y2][x2].objects['R'] = [1, 2]
+    expected = level.render(999, 999)
+
+    with open(tmp_path / 'level.bin', 'wb') as f:
+        level.to_binary(f)
+    with open(tmp_path / 'level.json', 'w') as f:
+        level.to_json(f)
+
+    for cls in (gridmap.GridMap, gridmap.CompactGridMap):
+        from_binary = cls.from_binary(tmp_path / 'level.bin')
+        with open(tmp_path / 'level.json') as f:
+            from_json = cls.from_json(f)
+        for loaded in (from_binary, from_json):
+            assert loaded.render(999, 999) == expected
+            assert loaded[y1][x1].objects == {'K': 'knight'}
+            assert loaded[y2][x2].objects == {'R': [1, 2]}
+
+    # Both formats round-trip through each other
+    compact = gridmap.CompactGridMap.from_binary(tmp_path / 'level.bin')
+    with open(tmp_path / 'compact.json', 'w') as f:
+        compact.to_json(f)
+    with open(tmp_path / 'compact.bin', 'wb') as f:
+        compact.to_binary(f)
+    assert (tmp_path / 'compact.json').read_text() \
+        == (tmp_path / 'level.json').read_text()
+    assert (tmp_path / 'compact.bin').read_bytes() \
+        == (tmp_path / 'level.bin').read_bytes()
+
+    # Memory mapped maps can still be modified
+    compact.create_cell(y2, x2, paths=['N'])
+    assert compact.get_mask(y2, x2) & gridmap.PATH_N
+    assert compact.get_mask(y2 - 1, x2) & gridmap.PATH_S
+
+
+def test_object_index():
+    level = gridmap.CompactGridMap(20, 20)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    level.place_object(0, 0, 'K', 'knight')
+    level.place_object(10, 10, 'R', 3)
+
+    index = gridmap.ObjectIndex(level, bucket_size=4)
+    level.place_object(12, 9, 'I', 'imp')
+    assert index.locate('K') == (0, 0)
+    assert index.locate('I') == (12, 9)
+    assert index.of_type(str) == {'K', 'I'}
+    assert index.within(11, 11, 1) == [('R', 10, 10)]
+    assert index.within(11, 11, 2) == [('R', 10, 10), ('I', 12, 9)]
+
+    level[0][0].move_object_direction('K', 'SE')
+    assert index.locate('K') == (1, 1)
+    level[1][1].move_object('K', 19, 19, copy=True)
+    assert index.locations['K'] == {(1, 1), (19, 19)}
+    assert index.within(18, 18, 1) == [('K', 19, 19)]
+    level[19][19].move_object('K', 15, 15)
+    assert index.locations['K'] == {(1, 1), (15, 15)}
+    assert index.within(18, 18, 1) == []
+    # Emptied buckets are dropped
+    assert (4, 4) not in index.buckets
+
+    assert level.remove_object(10, 10, 'R') == 3
+    assert 'R' not in index
+    assert index.of_type(int) == set()
+
+    # Replacing a Cell drops its objects
+    level.create_cell(12, 9)
+    assert index.locate('I') is None
+    assert index.of_type(str) == {'K'}
+
+    index.close()
+    assert level.listeners == []
+
+
+def test_connected_components():
+    level = gridmap.GridMap(4, 4)
+    for y, x in ((0, 0), (0, 1), (1, 1), (3, 3), (3, 2)):
+        level.create_cell(y, x)
+    level.connect_cell(0, 0, 'E')
+    level.connect_cell(3, 3, 'W')
+
+    components = level.get_components()
+    assert components.connected((0, 0), (0, 1))
+    assert not components.connected((0, 0), (1, 1))
+    assert not components.connected((0, 0), (2, 2))
+    assert components.component(2, 2) is None
+    assert sorted(map(sorted, components.regions())) \
+        == [[(0, 0), (0, 1)], [(1, 1)], [(3, 2), (3, 3)]]
+
+    # New cells and paths are patched in
+    level.create_cell(2, 2, paths=['NW', 'SE'])
+    level.connect_cell(0, 1, 'S')
+    assert components.connected((0, 0), (3, 3))
+    assert len(components.regions()) == 1
+
+    rebuilt = gridmap.ConnectedComponents(level)
+    assert components.regions() == rebuilt.regions()
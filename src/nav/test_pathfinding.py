@@ -1,5 +1,10 @@
 from .gridmap import GridMap
-from .pathfinding import uniform_cost_search
+from .pathfinding import (
+    CooperativePlanner, FlowField, HierarchicalPlanner, NavMesh, Node,
+    PathHandle, PriorityQueue, astar_search, batch_search,
+    bidirectional_search, chebyshev_distance, octile_distance,
+    uniform_cost_search
+)
 
 
 def test_uniform_cost_search():
@@ -39,3 +44,309 @@ def test_uniform_cost_search():
     )
 
     assert path == [(0, 0), (1, 1), (1, 0), (2, 1)]
+
+
+def test_uniform_cost_search_unreachable():
+    level = GridMap(1, 3)
+
+    level.create_cell(0, 0, paths=['E'])
+    level.create_cell(0, 1)
+    level.create_cell(0, 2)
+
+    assert uniform_cost_search(level, (0, 0), (0, 1), get_cost=True) == 2
+    assert uniform_cost_search(level, (0, 0), (0, 2)) is False
+
+
+def test_navmesh_lookup():
+    graph = NavMesh(
+        (Node('A', 1), ['B']),
+        (Node('B', 2), ['A'])
+    )
+
+    assert graph.get_node('B').cost == 2
+    assert graph['A'] == ['B']
+    assert graph.neighbors(Node('A', 1)) == [Node('B', 2)]
+    assert 'A' in graph and Node('B', 0) in graph
+
+    # Replacing a node with an equal key keeps both lookups in sync
+    graph[Node('A', 5)] = []
+    assert len(graph) == 2
+    assert graph.get_node('A').cost == 5
+
+
+def test_priority_queue_update():
+    queue = PriorityQueue()
+    queue.push('A', 3)
+    queue.push('B', 2)
+    queue.push('C', 1)
+
+    queue.setPriority('A', 0)
+
+    assert queue.getPriority('A') == 0
+    assert len(queue) == 3
+    assert [queue.pop() for _ in range(3)] == ['A', 'C', 'B']
+    assert queue.empty()
+
+
+def test_astar_and_bidirectional_search():
+    level = GridMap(3, 3)
+
+    level.create_cell(0, 0)
+    level.create_cell(0, 1, paths=['S'])
+    level.create_cell(1, 0, paths=['E', 'SE'])
+    level.create_cell(1, 1)
+    level.create_cell(1, 2)
+    level.create_cell(2, 0)
+    level.create_cell(2, 1)
+
+    level.connect_cell(0, 0, 'SE')
+    level.connect_cell(1, 1, [1, -1])
+
+    for search in (astar_search, bidirectional_search):
+        path = search(gridmap=level, source=(0, 0), target=(2, 1))
+        assert path == [(0, 0), (1, 1), (1, 0), (2, 1)]
+        assert search(level, (0, 0), (2, 1), get_cost=True) == 4
+        assert search(level, (0, 0), (1, 2)) is False
+        assert search(level, (1, 1), (1, 1)) == [(1, 1)]
+
+
+def test_heuristic_search_expands_less():
+    level = GridMap(30, 30)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    for _, y, x in level.get_all_squares():
+        if x + 1 < 30:
+            level.connect_cell(y, x, 'E')
+        if y + 1 < 30:
+            level.connect_cell(y, x, 'S')
+            if x + 1 < 30:
+                level.connect_cell(y, x, 'SE')
+
+    expanded = {}
+    for search in (uniform_cost_search, astar_search, bidirectional_search):
+        stats = {}
+        cost = search(level, (0, 0), (15, 29), get_cost=True, stats=stats)
+        assert cost == 30
+        expanded[search] = stats['expanded']
+
+    assert expanded[astar_search] < expanded[uniform_cost_search]
+    assert expanded[bidirectional_search] < expanded[uniform_cost_search]
+
+
+def test_distance_heuristics():
+    assert chebyshev_distance((0, 0), (3, -5)) == 5
+    assert octile_distance((0, 0), (3, 5), diagonal_cost=2) == 8
+
+
+def test_cached_navmesh_is_patched():
+    level = GridMap(3, 3)
+    level.create_cell(0, 0)
+    level.create_cell(0, 1, paths=['W'])
+
+    navmesh = level.get_navmesh()
+    assert level.get_navmesh() is navmesh
+
+    level.create_cell(1, 1, paths=['N', 'NW'])
+    level.create_cell(2, 2)
+    level.connect_cell(1, 1, 'SE')
+
+    # The cached graph was patched instead of rebuilt
+    assert level.get_navmesh() is navmesh
+    rebuilt = NavMesh.from_gridmap(level)
+    assert {n.key: sorted(k) for n, k in navmesh.items()} \
+        == {n.key: sorted(k) for n, k in rebuilt.items()}
+    assert uniform_cost_search(level, (0, 0), (2, 2)) \
+        == [(0, 0), (1, 1), (2, 2)]
+
+    level.invalidate_navmesh()
+    assert level.get_navmesh() is not navmesh
+
+
+def test_flow_field():
+    level = GridMap(3, 3)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    level.connect_cell(0, 0, 'E')
+    level.connect_cell(0, 1, 'E')
+    level.connect_cell(0, 2, 'S')
+
+    field = FlowField(level, [(0, 0)])
+    assert field.distance(1, 2) == 3
+    assert field.direction(1, 2) == 'N'
+    assert field.path(1, 2) == [(1, 2), (0, 2), (0, 1), (0, 0)]
+    assert field.distance(2, 2) is None and field.path(2, 2) is False
+    assert field.step_away(0, 1) == (0, 2)
+
+    # Adding paths updates the field without rebuilding it
+    level.connect_cell(1, 2, 'SW')
+    level.connect_cell(0, 0, 'SE')
+    level.connect_cell(1, 1, 'E')
+    assert field.distance(1, 1) == 1
+    assert field.distance(1, 2) == 2
+    assert field.path(2, 1) == [(2, 1), (1, 2), (1, 1), (0, 0)]
+    field.close()
+
+
+def test_batch_search():
+    level = GridMap(8, 8)
+    for _, y, x in level.get_all_squares():
+        if (y, x) != (7, 7):
+            level.create_cell(y, x)
+    for y in range(7):
+        for x in range(7):
+            level.connect_cell(y, x, 'E')
+            level.connect_cell(y, x, 'S')
+    level.create_cell(7, 7)
+
+    queries = [((0, 0), (6, 6)), ((3, 3), (0, 0)), ((0, 0), (0, 5)),
+               ((0, 0), (7, 7)), ((3, 3), (3, 3))]
+    expected = [uniform_cost_search(level, s, t, get_cost=True)
+                for s, t in queries]
+    assert batch_search(level, queries, get_cost=True) == expected
+
+    paths = batch_search(level, queries)
+    for (source, target), path, cost in zip(queries, paths, expected):
+        if cost is False:
+            assert path is False
+        else:
+            assert path[0] == source and path[-1] == target
+            assert len(path) == cost
+
+    assert batch_search(level, queries, get_cost=True, workers=2) \
+        == expected
+
+
+def test_path_handle_repairs_path():
+    # A 20x20 room split by a wall with a single gap at the bottom
+    level = GridMap(20, 20)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    for y in range(20):
+        for x in range(20):
+            if y < 19:
+                level.connect_cell(y, x, 'S')
+            if x < 19 and (x != 9 or y == 19):
+                level.connect_cell(y, x, 'E')
+
+    handle = PathHandle(level, (0, 0), (0, 19))
+    assert handle.cost() == uniform_cost_search(
+        level, (0, 0), (0, 19), get_cost=True) == 58
+    path = handle.path()
+    assert path[0] == (0, 0) and path[-1] == (0, 19)
+    initial = handle.expanded
+
+    # Opening a gap near the top only repairs part of the search
+    level.connect_cell(1, 9, 'E')
+    assert handle.cost() == uniform_cost_search(
+        level, (0, 0), (0, 19), get_cost=True) == 22
+    assert handle.expanded - initial < initial
+
+    handle.move_to(handle.next_step())
+    assert handle.cost() == 21
+    assert handle.path()[0] == handle.source
+
+    handle.close()
+    assert level.listeners == []
+
+
+def test_hierarchical_planner():
+    # Two halves joined by a gap on the right
+    level = GridMap(60, 60)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    for y in range(60):
+        for x in range(60):
+            if x < 59:
+                level.connect_cell(y, x, 'E')
+            if y < 59 and (y != 29 or x == 59):
+                level.connect_cell(y, x, 'S')
+
+    planner = HierarchicalPlanner(level, cluster_size=10)
+    for source, target in (((0, 0), (59, 59)), ((5, 30), (50, 30)),
+                           ((3, 4), (6, 8))):
+        cost = uniform_cost_search(level, source, target, get_cost=True)
+        path = planner.search(source, target)
+        assert path[0] == source and path[-1] == target
+        assert cost <= len(path) <= cost * 1.2
+        for a, b in zip(path, path[1:]):
+            assert b in level.get_neighbours(*a)
+
+    flat, hierarchical = {}, {}
+    uniform_cost_search(level, (0, 0), (59, 59), stats=flat)
+    planner.search((0, 0), (59, 59), stats=hierarchical)
+    assert hierarchical['expanded'] * 3 < flat['expanded']
+
+    # Changed clusters are rebuilt before the next search
+    assert planner.search((0, 0), (59, 0), get_cost=True) == 178
+    level.connect_cell(29, 0, 'S')
+    assert 60 <= planner.search((0, 0), (59, 0), get_cost=True) < 178
+
+    planner.close()
+    assert level.listeners == []
+
+
+def test_unreachable_targets_are_rejected():
+    level = GridMap(10, 10)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    for y in range(10):
+        for x in range(9):
+            level.connect_cell(y, x, 'E')
+
+    for search in (uniform_cost_search, astar_search, bidirectional_search):
+        stats = {}
+        assert search(level, (0, 0), (5, 5), stats=stats) is False
+        assert stats['expanded'] == 0
+        assert search(level, (5, 0), (5, 5), get_cost=True) == 6
+    assert batch_search(level, [((0, 0), (5, 5)), ((0, 0), (0, 9))],
+                        get_cost=True) == [False, 10]
+
+
+def test_cooperative_planner():
+    # A corridor with a passing place
+    level = GridMap(2, 7)
+    for x in range(7):
+        level.create_cell(0, x)
+    level.create_cell(1, 4)
+    for x in range(6):
+        level.connect_cell(0, x, 'E')
+    level.connect_cell(0, 4, 'S')
+
+    planner = CooperativePlanner(level, window=8)
+    planner.add_agent('A', (0, 0), (0, 6))
+    planner.add_agent('B', (0, 6), (0, 0))
+    previous = dict(planner.positions)
+    for _ in range(12):
+        positions = planner.step()
+        assert positions['A'] != positions['B']
+        # Agents never pass through each other
+        assert (positions['A'], positions['B']) \
+            != (previous['B'], previous['A'])
+        previous = positions
+    assert positions == {'A': (0, 6), 'B': (0, 0)}
+
+    level = GridMap(20, 20)
+    for _, y, x in level.get_all_squares():
+        level.create_cell(y, x)
+    for y in range(20):
+        for x in range(20):
+            if x < 19:
+                level.connect_cell(y, x, 'E')
+            if y < 19:
+                level.connect_cell(y, x, 'S')
+
+    # Agents crossing an open room along rows and columns
+    planner = CooperativePlanner(level, window=6)
+    targets = {}
+    for i in range(10):
+        targets['row', i] = (i * 2 + 1, 19)
+        planner.add_agent(('row', i), (i * 2 + 1, 0), targets['row', i])
+        targets['column', i] = (19, i * 2)
+        planner.add_agent(('column', i), (0, i * 2), targets['column', i])
+    for _ in range(40):
+        positions = planner.step()
+        assert len(set(positions.values())) == 20
+    assert positions == targets
+
+    planner.close()
+    assert level.listeners == []
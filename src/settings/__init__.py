@@ -11,6 +11,7 @@ get_setting      (config_name, key): Get a specific setting.
 load_config      (config_name, as_object): Load a config file.
 save_config      (config_name, settings, overwrite): Save the config file.
 setup_configs    (config_names): Initialize/verify multiple config files.
+shared_config    (config_name): Get the shared, reloaded config snapshot.
 update_config    (config_name, settings): Update the config file.
 verify_config    (config_name): Initialize/verify one config file.
 write_setting    (config_name, key, value): Write a new setting.
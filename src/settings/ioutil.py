@@ -2,6 +2,8 @@ import collections.abc
 import json
 import os
 import pathlib
+import threading
+import time
 
 from src import logs
 
@@ -52,7 +54,7 @@ DEFAULTS = {
     'interface': DEFAULT_INTERFACE
 }
 
-_cache = {}
+_shared = {}
 
 logger = logs.get_logger()
 
@@ -70,6 +72,200 @@ class Configuration:
         return self.__dict__
 
 
+class ConfigSnapshot(collections.abc.Mapping):
+    """An immutable snapshot of the settings in a config file.
+
+    Settings can be read both as attributes and as items.
+
+    Attributes:
+        name (str): The name of the config file.
+        mtime (Optional[int]): The modification time of the file
+            in nanoseconds when it was read.
+
+    """
+
+    __slots__ = ('_settings', 'name', 'mtime')
+
+    def __init__(self, name, settings, mtime=None):
+        object.__setattr__(self, '_settings', dict(settings))
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'mtime', mtime)
+
+    def __getattr__(self, key):
+        try:
+            return self._settings[key]
+        except KeyError:
+            raise AttributeError(
+                f'{self.name!r} config has no setting {key!r}') from None
+
+    def __setattr__(self, key, value):
+        raise AttributeError('config snapshots cannot be changed; '
+                             'use update_config or write_setting')
+
+    def __delattr__(self, key):
+        raise AttributeError('config snapshots cannot be changed')
+
+    def __getitem__(self, key):
+        return self._settings[key]
+
+    def __iter__(self):
+        return iter(self._settings)
+
+    def __len__(self):
+        return len(self._settings)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name!r}, {self._settings!r})'
+
+    def to_dict(self):
+        """Return a mutable copy of the settings."""
+        return self._settings.copy()
+
+
+class SharedConfig:
+    """The snapshot of a config file shared by every module using it.
+
+    The file's modification time is checked at most once every
+    `CHECK_INTERVAL` seconds, and when it changes, the file is read into
+    a new snapshot which replaces the old one in a single assignment.
+    Subscribers are then called with the new snapshot, so they can
+    compute values derived from the settings once per change.
+
+    Settings can be read directly as attributes of this object,
+    which always returns them from the current snapshot.
+
+    Use `shared_config` to get the instance for a config file.
+
+    Args:
+        config_name (str): The name of the config file.
+
+    """
+
+    CHECK_INTERVAL = 1
+
+    def __init__(self, config_name):
+        self._location = _make_config_location(config_name)
+        self.name = config_name
+        self._lock = threading.RLock()
+        self._snapshot = None
+        self._checked = 0
+        self._subscribers = []
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
+        return getattr(self.snapshot, key)
+
+    @property
+    def snapshot(self):
+        """ConfigSnapshot: The current snapshot, reloaded if the file
+        has changed since it was last checked."""
+        now = time.monotonic()
+        if self._snapshot is None \
+                or now - self._checked >= self.CHECK_INTERVAL:
+            self._checked = now
+            self.reload()
+        return self._snapshot
+
+    def _mtime(self):
+        try:
+            return os.stat(self._location).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def reload(self, force=False):
+        """Read the file again if it has changed.
+
+        If the file cannot be parsed, the current snapshot is kept.
+
+        Args:
+            force (bool): Read the file even if it has not changed.
+
+        Returns:
+            ConfigSnapshot: The current snapshot.
+
+        """
+        with self._lock:
+            mtime = self._mtime()
+            old = self._snapshot
+            if old is not None and not force and mtime == old.mtime:
+                return old
+
+            if old is None:
+                if mtime is None:
+                    verify_config(self.name)
+                    mtime = self._mtime()
+                with open(self._location) as f:
+                    settings = json.load(f)
+            else:
+                try:
+                    with open(self._location) as f:
+                        settings = json.load(f)
+                except (OSError, json.decoder.JSONDecodeError) as e:
+                    logger.warning(f'Failed to reload {self._location}: '
+                                   f'{e}; keeping the current settings')
+                    return old
+
+            logger.debug(f'Loaded {self.name} config')
+            snapshot = ConfigSnapshot(
+                self.name, _check_types(self.name, settings), mtime)
+            self._snapshot = snapshot
+
+            for callback in self._subscribers:
+                callback(snapshot)
+
+        return snapshot
+
+    def subscribe(self, callback):
+        """Call a function with the current snapshot and with every
+        new snapshot after the file changes.
+
+        If the file has not been loaded yet, the function is first
+        called when it is, so subscribing at import time does not
+        read or create the file. Can be used as a decorator.
+
+        Args:
+            callback (Callable[[ConfigSnapshot], None])
+
+        Returns:
+            Callable[[ConfigSnapshot], None]: The callback.
+
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._snapshot is not None:
+                callback(self._snapshot)
+        return callback
+
+    def unsubscribe(self, callback):
+        """Stop calling a function subscribed with `subscribe`."""
+        with self._lock:
+            self._subscribers.remove(callback)
+
+
+def _check_types(config_name, settings):
+    """Replace settings whose types do not match their default values."""
+    settings = dict(settings)
+    for key, default in DEFAULTS[config_name].items():
+        if key not in settings:
+            settings[key] = default
+            continue
+        value = settings[key]
+        if isinstance(default, bool) or not isinstance(default, (int, float)):
+            valid = isinstance(value, type(default))
+        else:
+            # Any real number can be used for a number setting
+            valid = isinstance(value, (int, float)) \
+                and not isinstance(value, bool)
+        if not valid:
+            logger.warning(
+                f'{key} in {config_name} config should be of type '
+                f'{type(default).__name__} but was {value!r}; '
+                'using the default')
+            settings[key] = default
+    return settings
+
+
 def _backup_config(config_name):
     location = _make_config_location(config_name)
     location_backup = location + '.backup'
@@ -99,34 +295,24 @@ def _make_config_location(config_name):
 def get_setting(config_name: str, key: str):
     """Get a specific value from a configuration."""
     logger.debug(f'Getting {key} from {config_name} config')
-    settings = load_config(config_name, as_object=False)
-    return settings[key]
+    return shared_config(config_name).snapshot[key]
 
 
 def load_config(config_name: str, *, as_object=True, auto_setup=True):
-    """Load a configuration."""
-    logger.debug(f'Loading {config_name} config')
+    """Load a mutable copy of a configuration.
 
-    # Check if there's a cached result
-    cache_result = _cache.get(config_name)
-    if cache_result is not None:
-        # Return a shallow copy of the cache
-        if as_object:
-            return Configuration.from_dict(cache_result.copy())
-        return cache_result.copy()
+    Modules reading settings should use `shared_config` instead,
+    which is shared and kept up to date with the file.
 
-    location = _make_config_location(config_name)
+    """
+    logger.debug(f'Loading {config_name} config')
 
-    if not pathlib.Path(location).exists() and auto_setup:
-        verify_config(config_name)
-        # Else, let `open()` raise the FileNotFoundError
+    location = _make_config_location(config_name)
 
-    with open(location) as f:
-        config = json.load(f)
+    if not auto_setup and not pathlib.Path(location).exists():
+        raise FileNotFoundError(f'{location} does not exist')
 
-    if cache_result is None:
-        # Add to cache
-        _cache[config_name] = config.copy()
+    config = shared_config(config_name).snapshot.to_dict()
 
     if as_object:
         config = Configuration.from_dict(config)
@@ -134,6 +320,19 @@ def load_config(config_name: str, *, as_object=True, auto_setup=True):
     return config
 
 
+def shared_config(config_name: str):
+    """Return the shared, automatically reloaded snapshot of a config.
+
+    Returns:
+        SharedConfig
+
+    """
+    shared = _shared.get(config_name)
+    if shared is None:
+        shared = _shared.setdefault(config_name, SharedConfig(config_name))
+    return shared
+
+
 def save_config(config_name: str, settings: dict, overwrite=True):
     """Save a complete set of settings into a config file."""
 
@@ -161,16 +360,17 @@ def save_config(config_name: str, settings: dict, overwrite=True):
         os.mkdir('./config')
         dump_json(location, settings)
     else:
-        # Remove cached result for config
-        if config_name in _cache:
-            del _cache[config_name]
+        # Update the shared snapshot without waiting for the next check
+        shared = _shared.get(config_name)
+        if shared is not None and shared._snapshot is not None:
+            shared.reload(force=True)
 
 
 def update_config(config_name: str, settings: dict):
     """Update a config file with new settings."""
     logger.debug(f'Updating {config_name} config')
 
-    config = load_config(config_name)
+    config = load_config(config_name, as_object=False)
     config.update(settings)
     save_config(config_name, config)
 
@@ -221,7 +421,7 @@ def verify_config(config_name):
 def write_setting(config_name: str, key: str, value):
     """Write a new value to a given setting in the config file."""
     logger.debug(f'Writing {value!r} to {key} in {config_name}')
-    config = load_config(config_name)
+    config = load_config(config_name, as_object=False)
     config[key] = value
     save_config(config_name, config)
 
@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+from .ioutil import DEFAULT_INTERFACE, SharedConfig
+
+
+def write_config(path, settings, mtime_ns):
+    """Write a config file with a given modification time."""
+    if not isinstance(settings, str):
+        settings = json.dumps(settings)
+    path.write_text(settings)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return SharedConfig('interface')
+
+
+def test_shared_config_reloads_on_change(config, tmp_path):
+    snapshots = []
+    config.subscribe(snapshots.append)
+
+    # The default config is created on the first read
+    assert config.AUTOCOMPLETE_KEY == DEFAULT_INTERFACE['AUTOCOMPLETE_KEY']
+    path = tmp_path / 'config' / 'interface.json'
+    assert path.exists()
+    assert len(snapshots) == 1
+
+    first = config.snapshot
+    assert config.reload() is first
+    with pytest.raises(AttributeError):
+        first.AUTOCOMPLETE_KEY = 'enter'
+
+    mtime = path.stat().st_mtime_ns
+    write_config(path, dict(DEFAULT_INTERFACE, AUTOCOMPLETE_KEY='enter'),
+                 mtime + 10 ** 9)
+    second = config.reload()
+    assert second is not first
+    assert config.AUTOCOMPLETE_KEY == 'enter'
+    assert first.AUTOCOMPLETE_KEY == DEFAULT_INTERFACE['AUTOCOMPLETE_KEY']
+    assert snapshots == [first, second]
+
+
+def test_shared_config_checks_are_throttled(config, tmp_path):
+    config.CHECK_INTERVAL = 3600
+    first = config.snapshot
+    path = tmp_path / 'config' / 'interface.json'
+    write_config(path, dict(DEFAULT_INTERFACE, AUTOCOMPLETE_KEY='enter'),
+                 path.stat().st_mtime_ns + 10 ** 9)
+    assert config.snapshot is first
+
+    config.CHECK_INTERVAL = 0
+    assert config.snapshot.AUTOCOMPLETE_KEY == 'enter'
+
+
+def test_shared_config_keeps_snapshot_on_parse_error(config, tmp_path):
+    first = config.snapshot
+    path = tmp_path / 'config' / 'interface.json'
+    write_config(path, '{"AUTOCOMPLETE_KEY": ', path.stat().st_mtime_ns + 1)
+    assert config.reload() is first
+    assert config.reload(force=True) is first
+
+    # Settings of the wrong type are replaced with their defaults
+    write_config(path, {'AUTOCOMPLETE_KEY': 5},
+                 path.stat().st_mtime_ns + 1)
+    snapshot = config.reload()
+    assert snapshot is not first
+    assert snapshot.AUTOCOMPLETE_KEY == DEFAULT_INTERFACE['AUTOCOMPLETE_KEY']
+    assert snapshot.MOVES_REQUIRE_EXACT_SEARCH \
+        == DEFAULT_INTERFACE['MOVES_REQUIRE_EXACT_SEARCH']
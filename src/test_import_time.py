@@ -0,0 +1,66 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Import time budgets in microseconds; generous enough
+# for slow machines, but far below setting up the whole engine
+BUDGETS = {
+    'import src.engine': 50_000,
+    'from src.engine import Bound': 50_000,
+    'from src.engine import json_handler': 150_000,
+}
+# Modules that importing the engine for a single class must not load
+HEAVY_MODULES = ('asyncio', 'colorama', 'logging', 'readline',
+                 'src.engine.battle_env', 'src.engine.interface')
+
+
+def run_importtime(statement, cwd):
+    """Run a statement in a new interpreter with `-X importtime`.
+
+    Returns:
+        Tuple[int, List[str]]: The total import time of the `src`
+            modules in microseconds, and the modules loaded
+            by the end of the statement.
+
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'{statement}\nimport sys\nprint(*sys.modules, sep="\\n")'],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Only count top-level imports, which include their children;
+        # modules loaded by importlib.import_module are not listed
+        # themselves, but what they import is
+        if name.startswith(' src.'):
+            total += int(cumulative)
+    return total, result.stdout.split()
+
+
+@pytest.mark.parametrize('statement', list(BUDGETS))
+def test_import_time_budget(statement, tmp_path):
+    total, _ = run_importtime(statement, tmp_path)
+    assert total < BUDGETS[statement], f'{statement} took {total:,}us'
+
+
+@pytest.mark.parametrize('statement', [
+    'import src.engine', 'from src.engine import Bound'])
+def test_import_is_lazy(statement, tmp_path):
+    _, modules = run_importtime(statement, tmp_path)
+    for name in HEAVY_MODULES:
+        assert name not in modules
+
+    # No log or config files are written either
+    assert not list(tmp_path.iterdir())
+
@@ -1,6 +1,43 @@
+import gzip
+import logging
+
 import logs
 
 
-def test_logging():
+def test_logging(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     logger = logs.get_logger()
     logger.debug('pytest log')
+    logs.stop_listener()
+
+
+def test_records_are_written_by_listener(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = logs.get_logger()
+    logger.info('pytest listener log')
+    logs.stop_listener()
+
+    with open(tmp_path / logs.LOG_FILE) as f:
+        assert 'pytest listener log' in f.read()
+
+
+def test_logs_are_rotated_and_compressed(tmp_path):
+    filename = tmp_path / 'test.log'
+    filename.write_text('previous run\n')
+
+    handler = logs.RotatingLogHandler(
+        str(filename), max_bytes=200, backup_count=2, compress=True)
+    logger = logging.getLogger('test_logs_rotation')
+    logger.addHandler(handler)
+    try:
+        for i in range(10):
+            logger.warning('record %d %s', i, 'x' * 40)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'test.log', 'test.log.1.gz', 'test.log.2.gz']
+    with gzip.open(tmp_path / 'test.log.2.gz', 'rt') as f:
+        assert 'record' in f.read()
+    assert 'record 9' in filename.read_text()
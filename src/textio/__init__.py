@@ -1,5 +1,7 @@
+from .ansi import *
 from .colorio import *
 from .inputting import *
+from .output import *
 from .printing import *
 from .typewriter import *
 
@@ -21,4 +23,7 @@ __copyright__ = """
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-colorio_setup()
+# Colorama is initialized and the screen cleared on the first write,
+# so importing textio does not touch the terminal
+update_colorama_reset()
+stdout_writer.setup = colorio_setup
@@ -0,0 +1,283 @@
+"""Provides an encoder that minimises the ANSI style codes in text."""
+import re
+
+__all__ = [
+    'minimize_ansi',
+    'strip_ansi'
+]
+
+# Control sequences; only SGR sequences (ending in "m") change the style
+_CSI = re.compile(r'\x1b\[([0-9;:?]*)([@-~])')
+
+_ATTRIBUTES = ('intensity', 'italic', 'underline', 'blink',
+               'reverse', 'hidden', 'strike', 'fg', 'bg')
+# The parameter that sets each attribute back to the terminal's default
+_DEFAULTS = {
+    'intensity': '22',
+    'italic': '23',
+    'underline': '24',
+    'blink': '25',
+    'reverse': '27',
+    'hidden': '28',
+    'strike': '29',
+    'fg': '39',
+    'bg': '49'
+}
+_TOGGLES = {
+    '3': 'italic', '23': 'italic',
+    '4': 'underline', '24': 'underline',
+    '5': 'blink', '6': 'blink', '25': 'blink',
+    '7': 'reverse', '27': 'reverse',
+    '8': 'hidden', '28': 'hidden',
+    '9': 'strike', '29': 'strike'
+}
+_UNKNOWN = dict.fromkeys(_ATTRIBUTES)
+
+# The xterm palette of the 16 basic colors
+_BASIC_RGB = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255)
+)
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+
+def _index_to_rgb(n):
+    """Return the RGB value of a color in the 256 color palette."""
+    if n < 16:
+        return _BASIC_RGB[n]
+    if n < 232:
+        n -= 16
+        return (_CUBE_LEVELS[n // 36], _CUBE_LEVELS[n // 6 % 6],
+                _CUBE_LEVELS[n % 6])
+    level = 8 + (n - 232) * 10
+    return level, level, level
+
+
+def _nearest(rgb, candidates):
+    """Return the index of the candidate color closest to `rgb`."""
+    r, g, b = rgb
+    return min(
+        range(len(candidates)),
+        key=lambda i: ((candidates[i][0] - r) ** 2
+                       + (candidates[i][1] - g) ** 2
+                       + (candidates[i][2] - b) ** 2)
+    )
+
+
+_PALETTE_256 = tuple(_index_to_rgb(n) for n in range(256))
+
+
+def _cap_color(base, rgb=None, index=None, colors=None):
+    """Return the parameter setting a color within a color limit.
+
+    Args:
+        base (int): 30 for foreground colors or 40 for background colors.
+        rgb (Optional[Tuple[int, int, int]]): A 24-bit color.
+        index (Optional[int]): A color from the 256 color palette.
+        colors (Optional[int]): The limit of 16 or 256 colors,
+            or None for no limit.
+
+    """
+    if rgb is not None:
+        if colors is None:
+            return '{};2;{};{};{}'.format(base + 8, *rgb)
+        index = _nearest(rgb, _PALETTE_256 if colors == 256
+                         else _BASIC_RGB)
+    elif colors == 16 and index >= 16:
+        index = _nearest(_PALETTE_256[index], _BASIC_RGB)
+
+    if colors == 16 or colors == 256 and index < 16:
+        # Use the shorter basic color codes
+        if index < 8:
+            return str(base + index)
+        return str(base + 60 + index - 8)
+    return f'{base + 8};5;{index}'
+
+
+def _apply(state, params, colors):
+    """Apply the parameters of an SGR sequence onto a style.
+
+    Returns:
+        Optional[dict]: The new style, or None if a parameter
+            is not understood.
+
+    """
+    state = state.copy()
+    params = params.split(';')
+    i = 0
+    while i < len(params):
+        p = params[i]
+        i += 1
+        if p in ('', '0'):
+            state.update(_DEFAULTS)
+        elif p in ('1', '2'):
+            # Bold and dim add up; a leading "+" marks them as added
+            # onto an unknown intensity
+            intensity = state['intensity']
+            if intensity is None:
+                state['intensity'] = '+' + p
+            elif intensity in ('22', p):
+                state['intensity'] = p
+            elif intensity.lstrip('+') != p:
+                prefix = '+' if intensity.startswith('+') else ''
+                state['intensity'] = prefix + '1;2'
+        elif p == '22':
+            state['intensity'] = p
+        elif p in _TOGGLES:
+            state[_TOGGLES[p]] = p
+        elif not p.isdigit():
+            return None
+        else:
+            n = int(p)
+            if 30 <= n <= 37 or 90 <= n <= 97 or n == 39:
+                state['fg'] = p
+            elif 40 <= n <= 47 or 100 <= n <= 107 or n == 49:
+                state['bg'] = p
+            elif n in (38, 48):
+                try:
+                    mode = params[i]
+                    if mode == '5':
+                        value = _cap_color(
+                            n - 8, index=int(params[i + 1]) % 256,
+                            colors=colors)
+                        i += 2
+                    elif mode == '2':
+                        rgb = tuple(int(c) % 256
+                                    for c in params[i + 1:i + 4])
+                        if len(rgb) != 3:
+                            return None
+                        value = _cap_color(n - 8, rgb=rgb, colors=colors)
+                        i += 4
+                    else:
+                        return None
+                except (IndexError, ValueError):
+                    return None
+                state['fg' if n == 38 else 'bg'] = value
+            else:
+                return None
+    return state
+
+
+def _transition(current, target):
+    """Return the shortest SGR sequence changing one style into another."""
+    changed = [a for a in _ATTRIBUTES
+               if target[a] is not None and target[a] != current[a]]
+    if not changed:
+        return ''
+
+    explicit = []
+    for a in changed:
+        value = target[a]
+        if a == 'intensity':
+            if value.startswith('+'):
+                value = value[1:]
+            elif current[a] != '22' and value != '22':
+                # Bold and dim can only be turned off together
+                value = '22;' + value
+        explicit.append(value)
+    params = ';'.join(explicit)
+
+    if None not in target.values() \
+            and not target['intensity'].startswith('+'):
+        reset = ';'.join(['0'] + [target[a] for a in _ATTRIBUTES
+                                  if target[a] != _DEFAULTS[a]])
+        if len(reset) < len(params):
+            params = reset
+
+    return f'\x1b[{params}m'
+
+
+def _shortest(current, target, original, colors):
+    """Return the shorter of the merged SGR sequence changing `current`
+    into `target` and the original sequences it replaces.
+
+    The original sequences can only be kept when colors are not capped.
+
+    """
+    merged = _transition(current, target)
+    if colors is None and len(original) <= len(merged):
+        return original
+    return merged
+
+
+def minimize_ansi(text, colors=None):
+    """Remove redundant ANSI style codes from a string.
+
+    Consecutive SGR sequences are merged into one that only changes
+    the attributes which differ from the style already in effect,
+    and style changes that are overwritten before any text is shown
+    are dropped. Any style still pending at the end is written,
+    so the terminal is left in the same style as with the original text.
+
+    Nothing is assumed about the style in effect before the string,
+    so text written around it by other means is displayed the same.
+
+    Args:
+        text (str): The text to minimise.
+        colors (Optional[int]): Cap 256 and 24-bit colors to the
+            16 basic colors or the 256 color palette.
+            If None, colors are left as is.
+
+    Returns:
+        str
+
+    """
+    if '\x1b' not in text:
+        return text
+
+    parts = []
+    current = _UNKNOWN
+    pending = None
+    # Where the sequences merged into `pending` start and end
+    run_start = run_end = 0
+    pos = 0
+    for match in _CSI.finditer(text):
+        start = match.start()
+        if start > pos or match.group(2) != 'm':
+            # Text or another control sequence; bring the style up to date
+            if pending is not None:
+                parts.append(_shortest(current, pending,
+                                       text[run_start:run_end], colors))
+                current, pending = pending, None
+            parts.append(text[pos:start])
+
+        params, final = match.groups()
+        state = None
+        if final == 'm':
+            state = _apply(current if pending is None else pending,
+                           params, colors)
+        if state is not None:
+            if pending is None:
+                run_start = start
+            pending = state
+            run_end = match.end()
+        else:
+            if pending is not None:
+                parts.append(_shortest(current, pending,
+                                       text[run_start:run_end], colors))
+                current, pending = pending, None
+            parts.append(match.group())
+            if final == 'm':
+                # The style can no longer be tracked
+                current = _UNKNOWN
+        pos = match.end()
+
+    if pos < len(text) and pending is not None:
+        parts.append(_shortest(current, pending,
+                               text[run_start:run_end], colors))
+        pending = None
+    parts.append(text[pos:])
+    if pending is not None:
+        parts.append(_shortest(current, pending,
+                               text[run_start:run_end], colors))
+
+    return ''.join(parts)
+
+
+def strip_ansi(text):
+    """Remove every ANSI control sequence from a string."""
+    if '\x1b' not in text:
+        return text
+    return _CSI.sub('', text)
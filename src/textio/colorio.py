@@ -1,8 +1,10 @@
 import _string
+import functools
 import string
 import sys
 
 from src import logs
+from .printing import stdout_writer
 
 DEFAULT_TEXT_COLOR: str = '{Snorma}{Fcyan}{Bblack}'
 # Color of default text (see ColoramaCodes class for colors)
@@ -11,6 +13,9 @@ DEFAULT_TEXT_COLOR: str = '{Snorma}{Fcyan}{Bblack}'
 
 logger = logs.get_logger()
 
+# Set once colorama is initialized; see `colorio_setup`
+_setup_done = False
+
 # Try importing colorama
 if 'idlelib.run' in sys.modules:
     # Disable colorama when in IDLE's shell
@@ -410,11 +415,110 @@ class EvalFormatter(string.Formatter):
     def get_field(self, field_name, args, kwargs):
         first, _ = _string.formatter_field_name_split(field_name)
 
-        obj = eval(field_name, kwargs)
+        obj = eval(compile_field(field_name), kwargs)
 
         return obj, first
 
 
+@functools.lru_cache(maxsize=1024)
+def compile_field(field_name):
+    """Compile the expression of a format field into a code object."""
+    return compile(field_name, '<format_color>', 'eval')
+
+
+def _compile_fields(s, auto_arg_index=None):
+    """Split a format string into (literal, code, conversion, format_spec)
+    tuples, compiling the expression of each field.
+
+    Format specs containing nested fields are compiled as well.
+    Empty fields are numbered automatically like string.Formatter.
+
+    """
+    if auto_arg_index is None:
+        # A list so nested format specs share the same numbering
+        auto_arg_index = [0]
+    parts = []
+    for literal, field_name, format_spec, conversion \
+            in _string.formatter_parser(s):
+        code = None
+        if field_name is not None:
+            if field_name == '':
+                if auto_arg_index[0] is False:
+                    raise ValueError('cannot switch from manual field '
+                                     'specification to automatic field '
+                                     'numbering')
+                field_name = str(auto_arg_index[0])
+                auto_arg_index[0] += 1
+            elif field_name.isdigit():
+                if auto_arg_index[0]:
+                    raise ValueError('cannot switch from manual field '
+                                     'specification to automatic field '
+                                     'numbering')
+                auto_arg_index[0] = False
+            code = compile_field(field_name)
+            if '{' in format_spec:
+                format_spec = _compile_fields(format_spec, auto_arg_index)
+        parts.append((literal, code, conversion, format_spec))
+    return tuple(parts)
+
+
+def _convert_field(obj, conversion):
+    """Same as string.Formatter.convert_field."""
+    if conversion is None:
+        return obj
+    elif conversion == 's':
+        return str(obj)
+    elif conversion == 'r':
+        return repr(obj)
+    elif conversion == 'a':
+        return ascii(obj)
+    raise ValueError(
+        f'Unknown conversion specifier {conversion!s}')
+
+
+def _render_fields(parts, namespace):
+    """Evaluate the fields of a compiled format string and join
+    them with its literal text."""
+    result = []
+    for literal, code, conversion, format_spec in parts:
+        if literal:
+            result.append(literal)
+        if code is None:
+            continue
+        obj = _convert_field(eval(code, namespace), conversion)
+        if not isinstance(format_spec, str):
+            format_spec = _render_fields(format_spec, namespace)
+        result.append(format(obj, format_spec))
+    return ''.join(result)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_color(
+        s: str, prefixBraces=1, escape_dollar=True, no_color=False):
+    """Substitute the color codes of a string and compile its fields.
+
+    The result is cached for each string and color mode, so formatting
+    the same string again only evaluates its fields.
+    See `format_color` for the arguments.
+
+    Returns:
+        Tuple[Tuple[str, Optional[CodeType], Optional[str],
+                    Union[str, tuple]], ...]:
+            The literal text, compiled field expression, conversion and
+            format spec of each field, in order.
+
+    """
+    if escape_dollar:
+        s = s.replace('$', '$$')
+    if prefixBraces == 1:
+        s = s.replace('{', '${')
+    codes = ColoramaCodesDisabled if no_color else ColoramaCodes
+    s = string.Template(s).safe_substitute(codes.codes)
+    if prefixBraces == 1:
+        s = s.replace('${', '{')
+    return _compile_fields(s)
+
+
 def format_color(
         s: str, *, namespace=None,
         prefixBraces=1, escape_dollar=True,
@@ -449,19 +553,14 @@ def format_color(
             Remove all code placeholders instead of substituting
             their corresponding codes.
 
+    Color codes are substituted and fields are compiled once per string
+    by `compile_color`; the fields are then evaluated like `EvalFormatter`.
+
     """
-    if namespace is None:
-        namespace = {}
-    if escape_dollar:
-        s = s.replace('$', '$$')
-    if prefixBraces == 1:
-        s = s.replace('{', '${')
-    codes = ColoramaCodesDisabled if no_color else ColoramaCodes
-    s = string.Template(s).safe_substitute(codes.codes)
-    if prefixBraces == 1:
-        s = s.replace('${', '{')
-    s = EvalFormatter().format(s, **namespace)
-    return s
+    parts = compile_color(s, prefixBraces, escape_dollar, no_color)
+    # Copy the namespace since eval() adds __builtins__ to it
+    namespace = {} if namespace is None else dict(namespace)
+    return _render_fields(parts, namespace)
 
 
 def input_color(*values, end=None, **kwargs):
@@ -507,13 +606,13 @@ def print_color(
     else:
         msg = format_color(sep.join([str(v) for v in values]), **kwargs)
 
-    # Need to make `file` not be included because passing in sys.stdout
-    # will bypass colorama's wrapper
-    print_kwargs = {'end': end, 'flush': flush}
-    if file is not None:
-        print_kwargs['file'] = file
+    # Default to the shared writer instead of sys.stdout so the text
+    # joins any open frame; it also resolves colorama's wrapper
+    # at the time of writing
+    if file is None:
+        file = stdout_writer
 
-    print(msg, **print_kwargs)
+    print(msg, end=end, file=file, flush=flush)
 
 
 def update_colorama_reset(new_reset=None, auto_reset=False):
@@ -542,14 +641,28 @@ def update_colorama_reset(new_reset=None, auto_reset=False):
         ColoramaCodes.RA = new_reset
         ColoramaCodes.codes['RESET_ALL'] = new_reset
         ColoramaCodes.codes['RA'] = new_reset
+        # Strings compiled with the old reset code are outdated
+        compile_color.cache_clear()
         if auto_reset:
             print(new_reset, end='')
 
 
 def colorio_setup():
-    """Initialize colorama if available."""
+    """Initialize colorama if available and clear the screen.
+
+    This is called automatically before the first write
+    to `stdout_writer`, so importing this package does not
+    touch the terminal. Calling it again does nothing.
+
+    """
+    global _setup_done
+    if _setup_done:
+        return
+    _setup_done = True
+    stdout_writer.setup = None
     if cr:
         cr.init()
         update_colorama_reset()
-        # Clear screen
-        print_color(ColoramaCodes.RESET_ALL + '\x1b[2J', end='')
+        # Clear screen; written directly so it comes before
+        # any text waiting in the writer
+        sys.stdout.write(ColoramaCodes.RESET_ALL + '\x1b[2J')
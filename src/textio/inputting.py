@@ -14,7 +14,7 @@ def input_boolean(
         true=('yes', 'y'), false=('no', 'n'),
         show_option_count=-1,
         apply_methods=(str.strip, str.casefold),
-        print_func=None):
+        print_func=None, input_func=None):
     """Prompt the user for a boolean answer.
 
     When prompting, input is lowered and stripped regardless of `input_func`.
@@ -49,6 +49,8 @@ def input_boolean(
             result of input before being validated.
         print_func: The function to use to display prompts.
             Defaults to print().
+        input_func: The function to use to read answers.
+            Defaults to input().
 
     """
     def parse(ans):
@@ -89,10 +91,11 @@ def input_boolean(
             repeat_prompt = format_color(repeat_prompt)
 
     # Get input
-    ans = util.input_methodize(prompt, apply_methods, print_func)
+    ans = util.input_methodize(prompt, apply_methods, print_func, input_func)
 
     while (meaning := parse(ans)) is None:
-        ans = util.input_methodize(repeat_prompt, apply_methods, print_func)
+        ans = util.input_methodize(repeat_prompt, apply_methods, print_func,
+                                   input_func)
 
     return meaning
 
@@ -100,7 +103,7 @@ def input_boolean(
 def input_choice(
         prompt, choices, max_answers=None, repeat_prompt=None,
         apply_methods=(str.strip, str.casefold),
-        print_func=None):
+        print_func=None, input_func=None):
     """Get a choice from the user.
 
     Args:
@@ -125,6 +128,10 @@ def input_choice(
             This is helpful for passing partial versions
             of a custom print function.
             If None, uses the default print function of `input_methodize`.
+        input_func (Optional[Function]):
+            The function used for reading the input, such as
+            the `input` method of an output sink.
+            If None, uses input().
 
     Returns:
         str: The user input matching one of the choices.
@@ -135,7 +142,8 @@ def input_choice(
         # Reuse prompt message
         repeat_prompt = prompt
 
-    input_ = util.input_methodize(prompt, apply_methods, print_func)
+    input_ = util.input_methodize(prompt, apply_methods, print_func,
+                                  input_func)
 
     while input_ not in choices:
         if isinstance(max_answers, int):
@@ -148,7 +156,8 @@ def input_choice(
         else:
             new_prompt = repeat_prompt
 
-        input_ = util.input_methodize(new_prompt, apply_methods, print_func)
+        input_ = util.input_methodize(new_prompt, apply_methods, print_func,
+                                      input_func)
 
     return input_
 
@@ -157,7 +166,7 @@ def input_loop_if_equals(
         prompt='', repeat_prompt=None,
         loop_if_equals=None, break_string=None,
         apply_methods=(str.strip, str.casefold),
-        print_func=None):
+        print_func=None, input_func=None):
     """Prompt the user for a string and loop if it matches a set of strings.
 
     Example:
@@ -187,6 +196,10 @@ def input_loop_if_equals(
             This is helpful for passing partial versions
             of a custom print function.
             If None, uses the default print function of `input_methodize`.
+        input_func (Optional[Function]):
+            The function used for reading the input, such as
+            the `input` method of an output sink.
+            If None, uses input().
 
     Returns:
         str: The user input not matching `loop_if_equals` or `break_string`.
@@ -203,10 +216,11 @@ def input_loop_if_equals(
     if repeat_prompt is None:
         repeat_prompt = prompt
 
-    ans = util.input_methodize(prompt, apply_methods, print_func)
+    ans = util.input_methodize(prompt, apply_methods, print_func, input_func)
 
     while parse(ans) is True:
-        ans = util.input_methodize(repeat_prompt, apply_methods, print_func)
+        ans = util.input_methodize(repeat_prompt, apply_methods, print_func,
+                                   input_func)
 
     return ans
 
@@ -218,7 +232,7 @@ def input_number(
         integer_only=False, integer_only_prompt=None,
         max_answers=None,
         apply_methods=(str.strip,),
-        print_func=None):
+        print_func=None, input_func=None):
     """Get a number from the user.
 
     Args:
@@ -253,6 +267,10 @@ def input_number(
             This is helpful for passing partial versions
             of a custom print function.
             If None, uses the default print function of `input_methodize`.
+        input_func (Optional[Function]):
+            The function used for reading the input, such as
+            the `input` method of an output sink.
+            If None, uses input().
 
     Returns:
         int: The user-given integer.
@@ -264,7 +282,7 @@ def input_number(
 
     """
     def get_num(prompt):
-        n = util.input_methodize(prompt, apply_methods, print_func)
+        n = util.input_methodize(prompt, apply_methods, print_func, input_func)
         try:
             return int(n) if float(n).is_integer() else float(n)
         except ValueError:
@@ -0,0 +1,320 @@
+"""Provides output sinks that the engine writes its text through.
+
+The engine never prints directly; it writes to the current sink
+returned by `get_output`. The default sink prints to the terminal,
+but a different sink can be set to capture the text, emit it as
+structured events, or discard it entirely for headless simulations.
+
+"""
+import contextlib
+import io
+import json
+import sys
+import time
+
+from . import typewriter
+from .ansi import strip_ansi
+from .colorio import ColoramaCodes, format_color
+from .printing import FrameWriter, stdout_writer
+
+__all__ = [
+    'CaptureSink',
+    'JSONSink',
+    'NullSink',
+    'OutputSink',
+    'PlainSink',
+    'TerminalSink',
+    'get_output',
+    'redirect_output',
+    'set_output'
+]
+
+
+class OutputSink:
+    """The base class of output sinks.
+
+    Subclasses implement `write`, which receives the finished text
+    along with the kind of text it is, such as 'message' or 'chart'.
+
+    Attributes:
+        formats (bool): If False, the sink discards all text, so callers
+            may skip building namespaces and formatting messages.
+        color (bool): If False, color codes are removed instead of
+            substituted.
+
+    """
+
+    formats = True
+    color = True
+
+    def write(self, text, kind='text'):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def frame(self):
+        """Return a context manager that collects the text written
+        inside it into a single write. See `FrameWriter.frame`.
+
+        The base implementation does not buffer.
+
+        """
+        return contextlib.nullcontext(self)
+
+    def unbuffered(self):
+        """Return a context manager that flushes the current frame
+        and writes straight through inside it, such as for prompts."""
+        return contextlib.nullcontext(self)
+
+    def print(self, *values, sep=' ', end='\n', kind='text', flush=False):
+        """Write values in the same way as print()."""
+        self.write(sep.join([str(v) for v in values]) + end, kind)
+        if flush:
+            self.flush()
+
+    def print_color(
+            self, *values, do_not_format=False, sep=' ', end=None,
+            kind='message', flush=False, **kwargs):
+        """Write values with color code substitutions.
+
+        See `print_color` for the arguments.
+
+        Args:
+            kind (str): The kind of text being written.
+
+        """
+        if end is None:
+            end = ColoramaCodes.RESET_ALL + '\n' if self.color else '\n'
+
+        msg = sep.join([str(v) for v in values])
+        if not do_not_format:
+            msg = format_color(msg, no_color=not self.color, **kwargs)
+        if not self.color:
+            # Remove codes that were formatted in advance, such as
+            # in the prompts of `input_boolean`
+            msg = strip_ansi(msg)
+
+        self.write(msg + end, kind)
+        if flush:
+            self.flush()
+
+    def input(self, prompt='', kind='prompt'):
+        """Write a prompt and return a line read from standard input
+        in the same way as input(). Text waiting to be written is
+        flushed first.
+
+        Args:
+            prompt (str): The prompt to write.
+            kind (str): The kind of text being written.
+
+        Returns:
+            str
+
+        """
+        if prompt:
+            self.write(prompt, kind)
+        self.flush()
+        return input()
+
+    def input_color(self, *values, end=None, **kwargs):
+        """Write a prompt with color code substitutions and return
+        the line that was typed. See `input_color`."""
+        self.print_color(*values, end='', kind='prompt', **kwargs)
+        answer = self.input()
+        if end is None:
+            end = ColoramaCodes.RESET_ALL if self.color else ''
+        if end:
+            self.write(end, 'prompt')
+        return answer
+
+    def print_typewriter(self, value, *args, sep='\n', end='\n',
+                         kind='message', **kwargs):
+        """Write values in typewriter fashion.
+
+        See `print_typewriter` for the arguments. The base implementation
+        ignores the delays and writes the text at once.
+
+        """
+        self.print(value, *args, sep=sep, end=end, kind=kind)
+
+    def pause(self, sleep=None, printNewline=0):
+        """Pause the output. See `src.engine.util.pause`.
+
+        The base implementation only writes the requested newline
+        without blocking.
+
+        """
+        if sleep is not None and printNewline:
+            self.write('\n')
+
+
+class TerminalSink(OutputSink):
+    """Print text with ANSI color codes to a stream.
+
+    Text is written through a `FrameWriter`, so the text of a frame
+    is emitted in one write. Pauses flush the current frame first.
+
+    Args:
+        file (Optional[io.TextIOBase]): The stream to write to.
+            If None, writes to whatever sys.stdout is at the time
+            so colorama's wrapper is used, sharing its frames with
+            `print_color`.
+
+    """
+
+    def __init__(self, file=None):
+        self.file = file
+        self.writer = stdout_writer if file is None else FrameWriter(file)
+
+    def write(self, text, kind='text'):
+        self.writer.write(text)
+
+    def flush(self):
+        self.writer.flush()
+
+    def frame(self):
+        return self.writer.frame()
+
+    def unbuffered(self):
+        return self.writer.unbuffered()
+
+    def print_typewriter(self, value, *args, sep='\n', end='\n',
+                         kind='message', **kwargs):
+        if not self.color:
+            # Remove codes that were formatted in advance
+            value = strip_ansi(str(value))
+            args = [strip_ansi(str(arg)) for arg in args]
+        if self.file is not None:
+            return super().print_typewriter(
+                value, *args, sep=sep, end=end, kind=kind)
+        with self.unbuffered():
+            typewriter.print_typewriter(
+                value, *args, sep=sep, end=end, **kwargs)
+
+    def pause(self, sleep=None, printNewline=0):
+        if sleep is None:
+            self.flush()
+            input()
+        else:
+            if printNewline == 1:
+                self.write('\n')
+            self.flush()
+            time.sleep(sleep)
+            if printNewline == 2:
+                self.write('\n')
+
+
+class PlainSink(TerminalSink):
+    """Print text to a stream without color codes."""
+
+    color = False
+
+
+class CaptureSink(OutputSink):
+    """Collect text in memory without color codes.
+
+    Pauses never block, so captured battles run at full speed.
+
+    Args:
+        color (bool): Keep the color codes in the captured text.
+
+    """
+
+    def __init__(self, color=False):
+        self.color = color
+        self.buffer = io.StringIO()
+
+    def write(self, text, kind='text'):
+        self.buffer.write(text)
+
+    def getvalue(self):
+        """Return all the text written so far."""
+        return self.buffer.getvalue()
+
+
+class JSONSink(OutputSink):
+    """Write each piece of text as a JSON object on its own line.
+
+    Every event has the form `{"kind": kind, "text": text}`, and
+    pauses are written as `{"kind": "pause", "sleep": sleep}`.
+    Color codes are removed from the text.
+
+    Args:
+        file (Optional[io.TextIOBase]): The stream to write to.
+            If None, writes to sys.stdout.
+
+    """
+
+    color = False
+
+    def __init__(self, file=None):
+        self.file = file
+
+    def _emit(self, event):
+        file = sys.stdout if self.file is None else self.file
+        file.write(json.dumps(event) + '\n')
+
+    def write(self, text, kind='text'):
+        self._emit({'kind': kind, 'text': text})
+
+    def flush(self):
+        (sys.stdout if self.file is None else self.file).flush()
+
+    def pause(self, sleep=None, printNewline=0):
+        self._emit({'kind': 'pause', 'sleep': sleep})
+
+
+class NullSink(OutputSink):
+    """Discard all text without formatting it."""
+
+    formats = False
+    color = False
+
+    def write(self, text, kind='text'):
+        pass
+
+    def print(self, *values, **kwargs):
+        pass
+
+    def print_color(self, *values, **kwargs):
+        pass
+
+    def print_typewriter(self, value, *args, **kwargs):
+        pass
+
+    def pause(self, sleep=None, printNewline=0):
+        pass
+
+
+_output = TerminalSink()
+
+
+def get_output():
+    """Return the current output sink."""
+    return _output
+
+
+def set_output(sink):
+    """Set the current output sink and return the previous one."""
+    global _output
+    previous, _output = _output, sink
+    return previous
+
+
+@contextlib.contextmanager
+def redirect_output(sink):
+    """Temporarily set the current output sink.
+
+    Example:
+        >>> with redirect_output(CaptureSink()) as sink:
+        ...     get_output().print('Hello')
+        >>> sink.getvalue()
+        'Hello\\n'
+
+    """
+    previous = set_output(sink)
+    try:
+        yield sink
+    finally:
+        set_output(previous)
@@ -1,11 +1,106 @@
+import contextlib
+import sys
 import time
 
+from .ansi import minimize_ansi
+
 __all__ = [
+    'FrameWriter',
     'print_sleep',
-    'print_sleep_multiline'
+    'print_sleep_multiline',
+    'stdout_writer'
 ]
 
 
+class FrameWriter:
+    """A stream that can collect text into frames written all at once.
+
+    Outside of a frame, text is written straight to the underlying stream.
+    Inside a frame, text is buffered until the outermost frame exits
+    or the writer is flushed, and is then emitted with a single write.
+    This avoids a separate write (and colorama conversion) for every
+    print call, which is slow over SSH and in Windows consoles.
+
+    Args:
+        file (Optional[io.TextIOBase]): The stream to write to.
+            If None, writes to whatever sys.stdout is at the time
+            so colorama's wrapper is used.
+        encoder (Optional[Callable[[str], str]]): A function applied
+            to the text of each write to the stream, such as
+            `minimize_ansi`.
+        setup (Optional[Callable[[], None]]): A function called once
+            before the first write to the stream, such as to initialize
+            colorama only when something is actually printed.
+
+    """
+
+    def __init__(self, file=None, encoder=None, setup=None):
+        self.file = file
+        self.encoder = encoder
+        self.setup = setup
+        self.parts = []
+        self.depth = 0
+
+    @property
+    def stream(self):
+        return sys.stdout if self.file is None else self.file
+
+    def _write(self, text):
+        if self.setup is not None:
+            setup, self.setup = self.setup, None
+            setup()
+        if self.encoder is not None:
+            text = self.encoder(text)
+        self.stream.write(text)
+
+    def write(self, text):
+        if self.depth:
+            self.parts.append(text)
+        else:
+            self._write(text)
+        return len(text)
+
+    def flush(self):
+        """Write any buffered text and flush the underlying stream."""
+        if self.parts:
+            text = ''.join(self.parts)
+            self.parts.clear()
+            self._write(text)
+        self.stream.flush()
+
+    @contextlib.contextmanager
+    def frame(self):
+        """Buffer everything written until the block exits.
+
+        Frames can be nested; only the outermost frame writes its text.
+
+        """
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.flush()
+
+    @contextlib.contextmanager
+    def unbuffered(self):
+        """Flush the current frame and write straight through until
+        the block exits, such as while prompting for input."""
+        self.flush()
+        depth, self.depth = self.depth, 0
+        try:
+            yield self
+        finally:
+            self.depth = depth
+
+
+# The writer shared by everything printing to standard output.
+# To cap the colors used, replace its encoder, for example with
+# functools.partial(minimize_ansi, colors=16)
+stdout_writer = FrameWriter(encoder=minimize_ansi)
+
+
 def print_sleep(*value, sleep=0, sleep_after=True, **kwargs):
     """Call the print function, sleeping before/after.
 
@@ -0,0 +1,108 @@
+import random
+import re
+
+import pytest
+
+from .ansi import minimize_ansi, strip_ansi
+
+CSI = re.compile(r'\x1b\[([0-9;]*)([@-~])')
+DEFAULT = {'intensity': frozenset(), 'italic': False, 'underline': False,
+           'reverse': False, 'fg': None, 'bg': None}
+# A style set before the string, which must not be assumed away
+STYLED = dict(DEFAULT, intensity=frozenset('1'), underline=True, fg='31')
+
+
+def display(text, style):
+    """Return each character of the text with the style it is shown in,
+    along with any other control sequences and the final style."""
+    style = dict(style)
+    shown = []
+    pos = 0
+
+    def apply(params):
+        params = params.split(';')
+        while params:
+            p = params.pop(0)
+            if p in ('', '0'):
+                style.update(DEFAULT)
+            elif p in ('1', '2'):
+                style['intensity'] |= {p}
+            elif p == '22':
+                style['intensity'] = frozenset()
+            elif p in ('3', '23', '4', '24', '7', '27'):
+                name = {'3': 'italic', '4': 'underline',
+                        '7': 'reverse'}[p[-1]]
+                style[name] = len(p) == 1
+            elif p in ('38', '48'):
+                name = 'fg' if p == '38' else 'bg'
+                style[name] = f'{p};5;{params[1]}'
+                del params[:2]
+            elif p in ('39', '49'):
+                style['fg' if p == '39' else 'bg'] = None
+            elif p[0] in '39':
+                style['fg'] = p
+            else:
+                style['bg'] = p
+
+    for match in CSI.finditer(text):
+        shown.extend((char, tuple(style.items()))
+                     for char in text[pos:match.start()])
+        if match.group(2) == 'm':
+            apply(match.group(1))
+        else:
+            shown.append((match.group(), None))
+        pos = match.end()
+    shown.extend((char, tuple(style.items())) for char in text[pos:])
+    return shown, style
+
+
+def assert_same_display(text):
+    minimized = minimize_ansi(text)
+    for style in (DEFAULT, STYLED):
+        assert display(minimized, style) == display(text, style), text
+    assert len(minimized) <= len(text)
+    return minimized
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('plain', 'plain'),
+    ('\x1b[0m\x1b[0m', '\x1b[0m'),
+    ('\x1b[0m\x1b[22m\x1b[36m\x1b[40mHello\x1b[0m\x1b[22m\x1b[36m\x1b[40m'
+     '\n\x1b[0m\x1b[22m\x1b[36m\x1b[40m\x1b[91mWorld',
+     '\x1b[0;36;40mHello\n\x1b[91mWorld'),
+    # Bold and dim can both be on, and 22 turns off both
+    ('\x1b[1m\x1b[2mx\x1b[22mY', '\x1b[1;2mx\x1b[22mY'),
+    ('\x1b[1;2m\x1b[22m\x1b[1mA', '\x1b[22;1mA'),
+    # Only a reset turns off bold before dim is turned on
+    ('\x1b[1mA\x1b[0m\x1b[2mB', '\x1b[1mA\x1b[0;2mB'),
+    ('\x1b[31m\x1b[0mA', '\x1b[0mA'),
+])
+def test_minimize_ansi(text, expected):
+    assert assert_same_display(text) == expected
+
+
+def test_minimize_ansi_keeps_display():
+    codes = ['0', '', '1', '2', '22', '3', '23', '4', '24', '7', '27',
+             '31', '36', '39', '40', '49', '91', '104', '38;5;196', '48;5;17']
+    rng = random.Random(0)
+    for _ in range(2000):
+        parts = []
+        for _ in range(rng.randrange(1, 20)):
+            if rng.random() < 0.5:
+                params = [rng.choice(codes)
+                          for _ in range(rng.randrange(1, 3))]
+                parts.append(f"\x1b[{';'.join(params)}m")
+            elif rng.random() < 0.1:
+                parts.append('\x1b[2J')
+            else:
+                parts.append(rng.choice(['a', 'bc', ' ', '\n']))
+        assert_same_display(''.join(parts))
+
+
+def test_minimize_ansi_caps_colors():
+    assert minimize_ansi('\x1b[38;2;255;0;0mR\x1b[48;5;200mX',
+                         colors=16) == '\x1b[91mR\x1b[105mX'
+
+
+def test_strip_ansi():
+    assert strip_ansi('\x1b[1;31mHit\x1b[0m for 5') == 'Hit for 5'
@@ -0,0 +1,63 @@
+import string
+
+import pytest
+
+from .colorio import (
+    ColoramaCodes, ColoramaCodesDisabled, EvalFormatter, format_color
+)
+
+
+def old_format_color(s, *, namespace=None, prefixBraces=1,
+                     escape_dollar=True, no_color=False):
+    """format_color as it was before templates were compiled."""
+    if namespace is None:
+        namespace = {}
+    if escape_dollar:
+        s = s.replace('$', '$$')
+    if prefixBraces == 1:
+        s = s.replace('{', '${')
+    codes = ColoramaCodesDisabled if no_color else ColoramaCodes
+    s = string.Template(s).safe_substitute(codes.codes)
+    if prefixBraces == 1:
+        s = s.replace('${', '{')
+    return EvalFormatter().format(s, **namespace)
+
+
+NAMESPACE = {'hp': 42, 'name': 'Ogre', 'width': 8, 'stats': {'mp': 7}}
+
+
+@pytest.mark.parametrize('s, kwargs', [
+    ('plain text', {}),
+    ('{Fgreen}HP: {hp}{RA}', {}),
+    ('{FLred}{name!r:^12}{Sreset} costs $5', {}),
+    ('{hp:>{width}} | {name:{width}.2}', {}),
+    ("{stats['mp'] * 2:+d} {hp // 5}", {}),
+    ('{} and {}', {}),
+    ('{Fcyan}{Bblack}color{RA}', {'no_color': True}),
+    ('${Fred}{hp} $$', {'prefixBraces': 0, 'escape_dollar': False}),
+    ('{{escaped}} {name}', {}),
+])
+def test_format_color_matches_old_formatter(s, kwargs):
+    expected = old_format_color(s, namespace=NAMESPACE, **kwargs)
+    # Format twice so the cached template is used as well
+    for _ in range(2):
+        assert format_color(s, namespace=NAMESPACE, **kwargs) == expected
+
+
+@pytest.mark.parametrize('s, error', [
+    ('{0} {}', ValueError),
+    ('{unknown}', NameError),
+    ('{hp!x}', ValueError),
+    ('{hp:q}', ValueError),
+])
+def test_format_color_raises_like_old_formatter(s, error):
+    with pytest.raises(error):
+        old_format_color(s, namespace=NAMESPACE)
+    with pytest.raises(error):
+        format_color(s, namespace=NAMESPACE)
+
+
+def test_format_color_does_not_change_namespace():
+    namespace = dict(NAMESPACE)
+    format_color('{hp}', namespace=namespace)
+    assert namespace == NAMESPACE
@@ -0,0 +1,83 @@
+import io
+import json
+
+from . import output
+from .colorio import ColoramaCodes
+from .output import (
+    CaptureSink, JSONSink, NullSink, PlainSink, TerminalSink,
+    get_output, redirect_output
+)
+
+
+def test_capture_sink():
+    sink = CaptureSink()
+    sink.print('Turn', 1)
+    sink.print_color('{Fgreen}{name} wins{RA}', namespace={'name': 'A'})
+    # Codes formatted in advance are removed as well
+    sink.print_color(f'{ColoramaCodes.Fred}Quit?', end='')
+    sink.print_typewriter('Fast', 'text')
+    sink.pause(2, printNewline=1)
+    assert sink.getvalue() == 'Turn 1\nA wins\nQuit?Fast\ntext\n\n'
+
+    colored = CaptureSink(color=True)
+    colored.print_color('{Fgreen}A wins')
+    assert colored.getvalue() == (
+        f'{ColoramaCodes.Fgreen}A wins{ColoramaCodes.RESET_ALL}\n')
+
+
+def test_terminal_sinks():
+    stream = io.StringIO()
+    sink = TerminalSink(stream)
+    sink.print_color('{Fred}Hit')
+    assert stream.getvalue() == (
+        f'{ColoramaCodes.Fred}Hit{ColoramaCodes.RESET_ALL}\n')
+
+    stream = io.StringIO()
+    sink = PlainSink(stream)
+    sink.print_color('{Fred}Hit')
+    assert stream.getvalue() == 'Hit\n'
+    sink.print_typewriter(f'{ColoramaCodes.Fred}Hit', 'again')
+    assert stream.getvalue() == 'Hit\nHit\nagain\n'
+
+
+def test_plain_sink_typewriter_strips_codes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(output.typewriter, 'print_typewriter',
+                        lambda *args, **kwargs: calls.append(args))
+    # Without a file, the text is typed out on standard output
+    PlainSink().print_typewriter(
+        f'{ColoramaCodes.Fred}Hit', f'{ColoramaCodes.Fgreen}Heal')
+    TerminalSink().print_typewriter(f'{ColoramaCodes.Fred}Hit')
+    assert calls == [('Hit', 'Heal'), (f'{ColoramaCodes.Fred}Hit',)]
+
+
+def test_json_sink():
+    stream = io.StringIO()
+    sink = JSONSink(stream)
+    sink.print_color('{Fred}Hit', kind='chart')
+    sink.print('Done')
+    sink.pause(0.5)
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert events == [
+        {'kind': 'chart', 'text': 'Hit\n'},
+        {'kind': 'text', 'text': 'Done\n'},
+        {'kind': 'pause', 'sleep': 0.5},
+    ]
+
+
+def test_null_sink():
+    sink = NullSink()
+    assert not sink.formats
+    # Nothing is formatted, so bad fields are never evaluated
+    sink.print_color('{undefined_name}')
+    sink.print_typewriter('text')
+    sink.pause(10)
+
+
+def test_redirect_output():
+    previous = get_output()
+    with redirect_output(CaptureSink()) as sink:
+        assert get_output() is sink
+        get_output().print('Hello')
+    assert get_output() is previous
+    assert sink.getvalue() == 'Hello\n'
@@ -0,0 +1,60 @@
+import io
+
+from .printing import FrameWriter
+
+
+class RecordingStream(io.StringIO):
+    """A stream recording every write made to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+        return super().write(text)
+
+
+def test_frame_is_written_once():
+    stream = RecordingStream()
+    writer = FrameWriter(stream)
+    with writer.frame():
+        writer.write('Turn 1\n')
+        # Nested frames are written with the outermost frame
+        with writer.frame():
+            writer.write('A attacks\n')
+        writer.write('B defends\n')
+        assert stream.writes == []
+    assert stream.writes == ['Turn 1\nA attacks\nB defends\n']
+
+    # Outside of a frame, text is written straight through
+    writer.write('Done\n')
+    assert stream.writes[-1] == 'Done\n'
+
+
+def test_unbuffered_flushes_frame():
+    stream = RecordingStream()
+    writer = FrameWriter(stream)
+    with writer.frame():
+        writer.write('Chart\n')
+        with writer.unbuffered():
+            assert stream.writes == ['Chart\n']
+            writer.write('Move? ')
+            assert stream.writes == ['Chart\n', 'Move? ']
+        writer.write('Result\n')
+        assert len(stream.writes) == 2
+    assert stream.writes[-1] == 'Result\n'
+
+
+def test_encoder_and_setup():
+    stream = RecordingStream()
+    calls = []
+    writer = FrameWriter(stream, encoder=str.upper,
+                         setup=lambda: calls.append('setup'))
+    assert calls == []
+    with writer.frame():
+        writer.write('a')
+        writer.write('b')
+    writer.write('c')
+    assert calls == ['setup']
+    assert stream.writes == ['AB', 'C']
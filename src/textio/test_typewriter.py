@@ -0,0 +1,57 @@
+import asyncio
+import io
+
+import pytest
+
+from .typewriter import (
+    render_schedule, render_schedule_async, typewriter_schedule
+)
+
+
+@pytest.mark.parametrize('args, kwargs, expected', [
+    # One character at a time
+    (('ab',), {'sleep_char': 0.25},
+     [(0, 'a'), (0.25, 'b'), (0.5, '\n')]),
+    # Speed divides every delay
+    (('ab',), {'sleep_char': 0.25, 'speed': 2},
+     [(0, 'a'), (0.125, 'b'), (0.25, '\n')]),
+    # Characters due within the same tick are written together
+    (('ab',), {'sleep_char': 0.25, 'tick': 0.5},
+     [(0, 'ab'), (0.5, '\n')]),
+    # The line delay replaces the delay of the last character
+    (('a.\nb',), {'sleep_char': 0.25, 'sleep_char_specifics': {'.': 1},
+                  'sleep_line': 2},
+     [(0, 'a'), (0.25, '.'), (2.25, '\nb'), (4.25, '\n\n')]),
+    (('a\nb',), {'sleep_line': 1, 'sleep_line_after': False},
+     [(1, 'a\n'), (2, 'b\n\n')]),
+    (('a', 'b'), {'sep': ' ', 'end': '', 'sleep_char': 1, 'tick': 10},
+     [(0, 'a b')]),
+])
+def test_typewriter_schedule(args, kwargs, expected):
+    kwargs.setdefault('speed', 1)
+    kwargs.setdefault('tick', 0.001)
+    assert typewriter_schedule(*args, **kwargs) == expected
+
+
+def test_render_schedule():
+    schedule = typewriter_schedule(
+        'Hello\nthere', sleep_char=0.001, speed=1, tick=0.001)
+    stream = io.StringIO()
+    render_schedule(schedule, file=stream, skippable=False)
+    assert stream.getvalue() == 'Hello\nthere\n\n'
+
+
+def test_render_schedule_async_skip():
+    schedule = [(0, 'a'), (60, 'b'), (120, 'c')]
+    stream = io.StringIO()
+
+    async def main():
+        skip = asyncio.Event()
+        task = asyncio.ensure_future(
+            render_schedule_async(schedule, file=stream, skip=skip))
+        await asyncio.sleep(0.01)
+        skip.set()
+        await asyncio.wait_for(task, 5)
+
+    asyncio.run(main())
+    assert stream.getvalue() == 'abc'
@@ -1,8 +1,23 @@
 """Provides functions for typewriter I/O."""
 import functools
+import os
+import sys
 import time
 
 from . import inputting
+from .printing import stdout_writer
+
+# Conditional import
+try:
+    import msvcrt
+except ModuleNotFoundError:
+    msvcrt = None
+    try:
+        import select
+        import termios
+        import tty
+    except ModuleNotFoundError:
+        termios = None
 
 __all__ = [
     'input_boolean_typewriter',
@@ -10,12 +25,21 @@ __all__ = [
     'input_loop_if_equals_typewriter',
     'input_number_typewriter',
     'print_typewriter',
+    'print_typewriter_async',
+    'render_schedule',
+    'render_schedule_async',
+    'typewriter_schedule',
     'TYPEWRITER_SPEED',
+    'TYPEWRITER_TICK',
     'SLEEP_CHAR_DELAY_NORMAL',
     'SLEEP_CHAR_DELAY_SPECIFICS'
 ]
 
-TYPEWRITER_SPEED = 1
+# Divides every typewriter delay; set DUETURN_TYPEWRITER_SPEED=inf
+# to print everything instantly, such as when running tests
+TYPEWRITER_SPEED = float(os.environ.get('DUETURN_TYPEWRITER_SPEED', 1))
+# Characters due within the same tick are written together
+TYPEWRITER_TICK = 1 / 60
 SLEEP_CHAR_DELAY_NORMAL = 0.01
 SLEEP_CHAR_DELAY_SPECIFICS = {
     '.': 0.2,
@@ -45,9 +69,12 @@ def input_boolean_typewriter(
         as that should only affect the prompt messages.
 
     `end` is set to '' by default but can be overwritten.
+    `skippable` is set to False by default so key presses
+    go to the answer instead of skipping the prompt.
 
     """
     kwargs.setdefault('end', '')
+    kwargs.setdefault('skippable', False)
     print_func = functools.partial(
         print_typewriter,
         *args,
@@ -79,9 +106,12 @@ def input_loop_if_equals_typewriter(
         as that should only affect the prompt messages.
 
     `end` is set to '' by default but can be overwritten.
+    `skippable` is set to False by default so key presses
+    go to the answer instead of skipping the prompt.
 
     """
     kwargs.setdefault('end', '')
+    kwargs.setdefault('skippable', False)
     print_func = functools.partial(
         print_typewriter,
         *args,
@@ -109,9 +139,12 @@ def input_choice_typewriter(
         as that should only affect the prompt messages.
 
     `end` is set to '' by default but can be overwritten.
+    `skippable` is set to False by default so key presses
+    go to the answer instead of skipping the prompt.
 
     """
     kwargs.setdefault('end', '')
+    kwargs.setdefault('skippable', False)
     print_func = functools.partial(
         print_typewriter,
         *args,
@@ -142,9 +175,12 @@ def input_number_typewriter(
         as that should only affect the prompt messages.
 
     `end` is set to '' by default but can be overwritten.
+    `skippable` is set to False by default so key presses
+    go to the answer instead of skipping the prompt.
 
     """
     kwargs.setdefault('end', '')
+    kwargs.setdefault('skippable', False)
     print_func = functools.partial(
         print_typewriter,
         *args,
@@ -161,14 +197,218 @@ def input_number_typewriter(
     )
 
 
+class _KeyWatcher:
+    """Detect key presses on an interactive standard input.
+
+    While active on a POSIX terminal, the terminal is put in cbreak mode
+    so a key press is seen without waiting for a newline. Only the key
+    that skips is consumed; anything typed after it is left for
+    the next prompt.
+
+    Args:
+        enabled (bool): If False, `wait` only sleeps.
+
+    """
+
+    def __init__(self, enabled=True):
+        try:
+            interactive = sys.stdin is not None and sys.stdin.isatty()
+        except ValueError:
+            # Standard input was closed
+            interactive = False
+        self.enabled = enabled and interactive \
+            and (msvcrt is not None or termios is not None)
+        self.attributes = None
+
+    def __enter__(self):
+        if self.enabled and msvcrt is None:
+            fd = sys.stdin.fileno()
+            self.attributes = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.attributes is not None:
+            termios.tcsetattr(
+                sys.stdin.fileno(), termios.TCSADRAIN, self.attributes)
+            self.attributes = None
+
+    def wait(self, timeout):
+        """Sleep for `timeout` seconds or until a key is pressed.
+
+        Returns:
+            bool: True if a key was pressed.
+
+        """
+        if not self.enabled:
+            time.sleep(timeout)
+            return False
+
+        if msvcrt is not None:
+            deadline = time.perf_counter() + timeout
+            while True:
+                if msvcrt.kbhit():
+                    msvcrt.getwch()
+                    return True
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(remaining, TYPEWRITER_TICK))
+
+        fd = sys.stdin.fileno()
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if ready:
+            os.read(fd, 1)
+            return True
+        return False
+
+
+def typewriter_schedule(
+        value, *args, sep='\n', end='\n',
+        sleep_char=0, sleep_char_specifics=(),
+        sleep_line=0, sleep_line_after=True,
+        speed=None, tick=None):
+    """Compute when each part of a typewriter message is written.
+
+    The timing is the same as writing one character at a time and
+    sleeping after each one, except that characters due within the same
+    tick are grouped into a single run.
+
+    See `print_typewriter` for the arguments.
+
+    Args:
+        speed (Optional[float]): Divides every delay.
+            If None, defaults to TYPEWRITER_SPEED.
+        tick (Optional[float]): The length of a tick in seconds.
+            If None, defaults to TYPEWRITER_TICK.
+
+    Returns:
+        List[Tuple[float, str]]: The time in seconds from the start
+            at which each run of text is written, in order.
+
+    """
+    if speed is None:
+        speed = TYPEWRITER_SPEED
+    if tick is None:
+        tick = TYPEWRITER_TICK
+    sleep_char /= speed
+    sleep_line /= speed
+    specifics = {char: delay / speed
+                 for char, delay in dict(sleep_char_specifics).items()}
+    lines = sep.join([value] + [str(a) for a in args]).split('\n')
+
+    schedule = []
+    now = 0
+    run_start = None
+
+    def emit(text):
+        nonlocal run_start
+        if run_start is not None and now - run_start < tick:
+            schedule[-1][1].append(text)
+        else:
+            run_start = now
+            schedule.append((now, [text]))
+
+    for line in lines:
+        if not sleep_line_after:
+            now += sleep_line
+
+        last_sleep = 0  # Used to compensate for sleep_line_after
+        for char in line:
+            emit(char)
+            last_sleep = specifics.get(char, sleep_char)
+            now += last_sleep
+
+        if sleep_line_after:
+            # Compensate for the sleep in the last character written
+            now += max(0, sleep_line - last_sleep)
+
+        # If the values only has one line, no newlines were given
+        # and therefore should not print a newline
+        if len(lines) > 1:
+            emit('\n')
+
+    emit(end)
+    return [(when, ''.join(parts)) for when, parts in schedule]
+
+
+def render_schedule(schedule, file=None, skippable=True):
+    """Write a schedule made by `typewriter_schedule`.
+
+    Args:
+        schedule (List[Tuple[float, str]]): The schedule to write.
+        file (Optional[io.TextIOBase]): The stream to write to.
+            If None, writes to standard output.
+        skippable (bool): If True and standard input is a terminal,
+            pressing a key writes the rest of the schedule at once.
+
+    """
+    stream = stdout_writer if file is None else file
+    start = time.perf_counter()
+    with _KeyWatcher(skippable) as keys:
+        for i, (when, text) in enumerate(schedule):
+            delay = start + when - time.perf_counter()
+            if delay > 0 and keys.wait(delay):
+                # Fast-forward
+                stream.write(''.join(t for _, t in schedule[i:]))
+                break
+            stream.write(text)
+            stream.flush()
+    stream.flush()
+
+
+async def render_schedule_async(schedule, file=None, skip=None):
+    """Write a schedule made by `typewriter_schedule` without blocking
+    the event loop.
+
+    Args:
+        schedule (List[Tuple[float, str]]): The schedule to write.
+        file (Optional[io.TextIOBase]): The stream to write to.
+            If None, writes to standard output.
+        skip (Optional[asyncio.Event]): When set, the rest of
+            the schedule is written at once.
+
+    """
+    # Only needed by async callers, which have already imported it
+    import asyncio
+
+    stream = stdout_writer if file is None else file
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i, (when, text) in enumerate(schedule):
+        delay = start + when - loop.time()
+        skipped = skip is not None and skip.is_set()
+        if delay > 0 and not skipped:
+            if skip is None:
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(skip.wait(), delay)
+                    skipped = True
+                except asyncio.TimeoutError:
+                    pass
+        if skipped:
+            # Fast-forward
+            stream.write(''.join(t for _, t in schedule[i:]))
+            break
+        stream.write(text)
+        stream.flush()
+    stream.flush()
+
+
 def print_typewriter(
         value, *args, sep='\n', end='\n',
         sleep_char=0, sleep_char_specifics=(),
-        sleep_line=0, sleep_line_after=True):
+        sleep_line=0, sleep_line_after=True,
+        speed=None, skippable=True):
     """Print a string in typewriter fashion.
 
     `sep` default has been changed to '\n', allowing comma separated lines.
 
+    The timing is computed ahead of time by `typewriter_schedule` and
+    characters due within the same tick are written together.
+    Pressing a key skips to the end of the message.
+
     Args:
         sleep_char (Union[int, float]):
             The delay between each character printed, excluding newlines.
@@ -179,41 +419,43 @@ def print_typewriter(
             The delay between each line.
         sleep_line_after (bool):
             If True, sleep after each line instead of before.
+        speed (Optional[float]): Divides every delay.
+            If None, defaults to TYPEWRITER_SPEED.
+        skippable (bool): Allow skipping to the end with a key press.
 
     """
-    sleep_char /= TYPEWRITER_SPEED
-    sleep_line /= TYPEWRITER_SPEED
-    values = sep.join([value] + [str(a) for a in args]).split('\n')
-
-    for line in values:
-        if not sleep_line_after:
-            time.sleep(sleep_line)
+    render_schedule(
+        typewriter_schedule(
+            value, *args, sep=sep, end=end,
+            sleep_char=sleep_char,
+            sleep_char_specifics=sleep_char_specifics,
+            sleep_line=sleep_line, sleep_line_after=sleep_line_after,
+            speed=speed),
+        skippable=skippable
+    )
 
-        # Print each character
-        last_sleep = 0  # Used to compensate for sleep_line_after
-        for char in line:
-            # Also forcibly flush the stream to print instantly,
-            # otherwise the output will be buffered (noticable in terminal)
-            print(char, end='', flush=True)
-            if char in sleep_char_specifics:
-                last_sleep = sleep_char_specifics[char] / TYPEWRITER_SPEED
-                time.sleep(last_sleep)
-            else:
-                last_sleep = sleep_char
-                time.sleep(last_sleep)
 
-        if sleep_line_after:
-            # Compensate for the sleep in the last character printed
-            x = sleep_line - last_sleep
-            if x > 0:
-                time.sleep(x)
+async def print_typewriter_async(
+        value, *args, sep='\n', end='\n',
+        sleep_char=0, sleep_char_specifics=(),
+        sleep_line=0, sleep_line_after=True,
+        speed=None, skip=None):
+    """An asyncio version of `print_typewriter`.
 
-        # If the values only has one line, no newlines were given
-        # and therefore should not print a newline
-        if len(values) > 1:
-            print(end='\n')
+    Args:
+        skip (Optional[asyncio.Event]): When set, the rest of
+            the message is printed at once.
 
-    print(end=end)
+    """
+    await render_schedule_async(
+        typewriter_schedule(
+            value, *args, sep=sep, end=end,
+            sleep_char=sleep_char,
+            sleep_char_specifics=sleep_char_specifics,
+            sleep_line=sleep_line, sleep_line_after=sleep_line_after,
+            speed=speed),
+        skip=skip
+    )
 
 
 def main():
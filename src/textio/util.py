@@ -5,13 +5,15 @@ print_without_newline = functools.partial(print, end='')
 
 def input_methodize(
         prompt, apply_methods=(),
-        print_func=None):
+        print_func=None, input_func=None):
     """Apply given methods into input()."""
     if print_func is None:
         print_func = print_without_newline
+    if input_func is None:
+        input_func = input
 
     print_func(prompt)
-    input_ = input()
+    input_ = input_func()
 
     for method in apply_methods:
         input_ = method(input_)